@@ -68,7 +68,12 @@ function add-client-service() {
   add-line $compose_file '      - SERVER_PORT=5000'
   add-line $compose_file '      - DATA_PATH=/data'
   add-line $compose_file '      - RESULTS_PATH=/results'
-  add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
+  add-line $compose_file '      - MIN_BATCH_BYTES=${MIN_BATCH_BYTES}'
+  add-line $compose_file '      - MAX_BATCH_BYTES=${MAX_BATCH_BYTES}'
+  add-line $compose_file '      - RESULTS_WRITER_THREAD=${RESULTS_WRITER_THREAD}'
+  add-line $compose_file '      - SOCKET_BUFFER_SIZE=${SOCKET_BUFFER_SIZE}'
+  add-line $compose_file '      - FILE_READ_BUFFER_SIZE=${FILE_READ_BUFFER_SIZE}'
+  add-line $compose_file '      - MULTI_STREAM_UPLOAD=${MULTI_STREAM_UPLOAD}'
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    volumes:'
@@ -110,6 +115,8 @@ function add-server-service() {
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
   add-line $compose_file '      - SERVER_PORT=5000'
   add-line $compose_file '      - SERVER_LISTEN_BACKLOG=${SERVER_LISTEN_BACKLOG}'
+  add-line $compose_file "      - SERVER_MODE=$SERVER_MODE"
+  add-line $compose_file '      - SOCKET_BUFFER_SIZE=${SOCKET_BUFFER_SIZE}'
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file '      - MENU_ITEMS_CLN_AMOUNT=1'
   add-line $compose_file '      - STORES_CLN_AMOUNT=1'
@@ -398,6 +405,9 @@ function add-year-month-created-at-mapper() {
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTION_ITEMS_BY_YEAR_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_REDUCERS_AMOUNT"
+  add-line $compose_file "      - COMBINER_ENABLED=$COMBINER_ENABLED"
+  add-line $compose_file "      - COMBINER_MAX_KEYS=$COMBINER_MAX_KEYS"
+  add-line $compose_file "      - COMBINER_MAX_AGE_SECONDS=$COMBINER_MAX_AGE_SECONDS"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -419,6 +429,9 @@ function add-year-half-created-at-mapper() {
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_HOUR_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q3_REDUCERS_AMOUNT"
+  add-line $compose_file "      - COMBINER_ENABLED=$COMBINER_ENABLED"
+  add-line $compose_file "      - COMBINER_MAX_KEYS=$COMBINER_MAX_KEYS"
+  add-line $compose_file "      - COMBINER_MAX_AGE_SECONDS=$COMBINER_MAX_AGE_SECONDS"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -442,35 +455,13 @@ function add-mappers() {
 
 # ============================== PRIVATE - REDUCERS ============================== #
 
-function add-selling-qty-reducer() {
-  local compose_file=$1
-  local current_id=$2
-  add-line $compose_file "  sellings_qty_by_item_id_and_year_month_created_at_reducer_$current_id:"
-  add-line $compose_file "    container_name: sellings_qty_by_item_id_and_year_month_created_at_reducer_$current_id"
-  add-line $compose_file '    image: sellings_qty_by_item_id_and_year_month_created_at_reducer:latest'
-  add-line $compose_file '    entrypoint: python3 -m controllers.reducers.sellings_qty_by_item_id_and_year_month_created_at_reducer.main'
-  add-line $compose_file '    environment:'
-  add-line $compose_file '      - PYTHONUNBUFFERED=${PYTHONUNBUFFERED}'
-  add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
-  add-line $compose_file "      - CONTROLLER_ID=$current_id"
-  add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
-  add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$YEAR_MONTH_CREATED_AT_TRANSACTION_ITEMS_MAPPERS_AMOUNT"
-  add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
-  add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
-  add-line $compose_file '    networks:'
-  add-line $compose_file '      - custom_net'
-  add-line $compose_file '    depends_on:'
-  add-line $compose_file '      rabbitmq-message-middleware:'
-  add-line $compose_file '        condition: service_healthy'
-}
-
-function add-profit-sum-reducer() {
+function add-selling-qty-and-profit-sum-reducer() {
   local compose_file=$1
   local current_id=$2
-  add-line $compose_file "  profit_sum_by_item_id_and_year_month_created_at_reducer_$current_id:"
-  add-line $compose_file "    container_name: profit_sum_by_item_id_and_year_month_created_at_reducer_$current_id"
-  add-line $compose_file '    image: profit_sum_by_item_id_and_year_month_created_at_reducer:latest'
-  add-line $compose_file '    entrypoint: python3 -m controllers.reducers.profit_sum_by_item_id_and_year_month_created_at_reducer.main'
+  add-line $compose_file "  sellings_qty_and_profit_sum_by_item_id_and_year_month_created_at_reducer_$current_id:"
+  add-line $compose_file "    container_name: sellings_qty_and_profit_sum_by_item_id_and_year_month_created_at_reducer_$current_id"
+  add-line $compose_file '    image: sellings_qty_and_profit_sum_by_item_id_and_year_month_created_at_reducer:latest'
+  add-line $compose_file '    entrypoint: python3 -m controllers.reducers.sellings_qty_and_profit_sum_by_item_id_and_year_month_created_at_reducer.main'
   add-line $compose_file '    environment:'
   add-line $compose_file '      - PYTHONUNBUFFERED=${PYTHONUNBUFFERED}'
   add-line $compose_file '      - LOGGING_LEVEL=${LOGGING_LEVEL}'
@@ -479,6 +470,7 @@ function add-profit-sum-reducer() {
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$YEAR_MONTH_CREATED_AT_TRANSACTION_ITEMS_MAPPERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
+  add-line $compose_file "      - STATE_SPILL_THRESHOLD=$STATE_SPILL_THRESHOLD"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -501,6 +493,7 @@ function add-tpv-by-store-reducer() {
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$YEAR_HALF_CREATED_AT_TRANSACTIONS_MAPPERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q3_JOINERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
+  add-line $compose_file "      - STATE_SPILL_THRESHOLD=$STATE_SPILL_THRESHOLD"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -521,8 +514,10 @@ function add-user-purchase-by-store-reducer() {
   add-line $compose_file "      - CONTROLLER_ID=$current_id"
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file "      - PREV_CONTROLLERS_AMOUNT=$FILTER_TRANSACTIONS_BY_YEAR_AMOUNT"
+  add-line $compose_file "      - BLOOM_FILTER_PREV_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_USERS_JOINERS_AMOUNT"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4_SORTERS_AMOUNT"
   add-line $compose_file '      - BATCH_MAX_SIZE=${BATCH_MAX_SIZE}'
+  add-line $compose_file "      - STATE_SPILL_THRESHOLD=$STATE_SPILL_THRESHOLD"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -534,12 +529,7 @@ function add-reducers() {
   local compose_file=$1
 
   for ((i=0;i<$Q2_REDUCERS_AMOUNT;i++)); do
-    add-selling-qty-reducer $compose_file $i
-    add-empty-line $compose_file
-  done
-
-  for ((i=0;i<$Q2_REDUCERS_AMOUNT;i++)); do
-    add-profit-sum-reducer $compose_file $i
+    add-selling-qty-and-profit-sum-reducer $compose_file $i
     add-empty-line $compose_file
   done
 
@@ -660,6 +650,7 @@ function add-menu-with-items-q21-joiner(){
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1'
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
+  add-line $compose_file "      - STREAM_DATA_BUFFER_MAX_BYTES=$STREAM_DATA_BUFFER_MAX_BYTES"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q21_OB_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -682,6 +673,7 @@ function add-menu-with-items-q22-joiner(){
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1'
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q2_SORTERS_AMOUNT"
+  add-line $compose_file "      - STREAM_DATA_BUFFER_MAX_BYTES=$STREAM_DATA_BUFFER_MAX_BYTES"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q22_OB_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -705,6 +697,7 @@ function add-transactions-with-stores-q3x-joiner(){
   add-line $compose_file "      - OUTPUT_BUILDERS_AMOUNT=$Q3X_OB_AMOUNT"
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1' 
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q3_REDUCERS_AMOUNT"
+  add-line $compose_file "      - STREAM_DATA_BUFFER_MAX_BYTES=$STREAM_DATA_BUFFER_MAX_BYTES"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q3X_OB_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -727,6 +720,7 @@ function add-transactions-with-stores-q4x-joiner(){
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file '      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=1' 
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_USERS_JOINERS_AMOUNT"
+  add-line $compose_file "      - STREAM_DATA_BUFFER_MAX_BYTES=$STREAM_DATA_BUFFER_MAX_BYTES"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4X_OB_AMOUNT"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
@@ -749,7 +743,10 @@ function add-transactions-with-users-q4x-joiner(){
   add-line $compose_file '      - RABBITMQ_HOST=rabbitmq-message-middleware'
   add-line $compose_file "      - BASE_DATA_PREV_CONTROLLERS_AMOUNT=$USERS_CLN_AMOUNT"
   add-line $compose_file "      - STREAM_DATA_PREV_CONTROLLERS_AMOUNT=$Q4_REDUCERS_AMOUNT"
+  add-line $compose_file "      - STREAM_DATA_BUFFER_MAX_BYTES=$STREAM_DATA_BUFFER_MAX_BYTES"
   add-line $compose_file "      - NEXT_CONTROLLERS_AMOUNT=$Q4_TRANSACTIONS_WITH_STORES_JOINERS_AMOUNT"
+  add-line $compose_file "      - BLOOM_FILTER_NEXT_CONTROLLERS_AMOUNT=$Q4_REDUCERS_AMOUNT"
+  add-line $compose_file "      - BLOOM_FILTER_FALSE_POSITIVE_RATE=$BLOOM_FILTER_FALSE_POSITIVE_RATE"
   add-line $compose_file '    networks:'
   add-line $compose_file '      - custom_net'
   add-line $compose_file '    depends_on:'
@@ -0,0 +1,129 @@
+from shared import constants
+
+# the target grows by this amount after every uncongested batch
+ADDITIVE_INCREASE_BYTES = 16 * constants.KiB
+# the target is multiplied by this factor after every congested batch
+MULTIPLICATIVE_DECREASE_FACTOR = 0.5
+# a batch is congested when its send time per byte exceeds the average
+# by this factor, e.g. because the server stopped draining the socket
+CONGESTION_LATENCY_FACTOR = 2.0
+# a batch is never congested if its send took less than this, because
+# sendall only copied it into the socket buffer without blocking
+CONGESTION_MIN_SEND_SECONDS = 0.005
+# weight of the last batch in the average send time per byte
+LATENCY_SMOOTHING_FACTOR = 0.2
+
+
+class AdaptiveBatchSizer:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, min_batch_bytes: int, max_batch_bytes: int) -> None:
+        if min_batch_bytes <= 0 or min_batch_bytes > max_batch_bytes:
+            raise ValueError(
+                f"Invalid batch bytes range: {min_batch_bytes} - {max_batch_bytes}"
+            )
+
+        self._min_batch_bytes = min_batch_bytes
+        self._max_batch_bytes = max_batch_bytes
+        self._target_batch_bytes = min_batch_bytes
+
+        self._average_seconds_per_byte = 0.0
+        self._latency_samples_amount = 0
+
+        self._batches_amount = 0
+        self._congested_batches_amount = 0
+        self._total_batch_bytes = 0
+        self._total_batch_rows = 0
+        self._smallest_batch_bytes = 0
+        self._biggest_batch_bytes = 0
+        self._batches_amount_by_target_kib: dict[int, int] = {}
+
+    # ============================== PRIVATE - ADAPT ============================== #
+
+    def _is_congested(self, send_seconds: float, seconds_per_byte: float) -> bool:
+        if self._latency_samples_amount == 0:
+            return False
+        if send_seconds < CONGESTION_MIN_SEND_SECONDS:
+            return False
+        return seconds_per_byte > (
+            self._average_seconds_per_byte * CONGESTION_LATENCY_FACTOR
+        )
+
+    def _update_average_seconds_per_byte(self, seconds_per_byte: float) -> None:
+        self._latency_samples_amount += 1
+        if self._latency_samples_amount == 1:
+            self._average_seconds_per_byte = seconds_per_byte
+            return
+        self._average_seconds_per_byte += LATENCY_SMOOTHING_FACTOR * (
+            seconds_per_byte - self._average_seconds_per_byte
+        )
+
+    def _adapt_target_batch_bytes(
+        self, send_seconds: float, seconds_per_byte: float
+    ) -> None:
+        if self._is_congested(send_seconds, seconds_per_byte):
+            self._congested_batches_amount += 1
+            self._target_batch_bytes = max(
+                self._min_batch_bytes,
+                int(self._target_batch_bytes * MULTIPLICATIVE_DECREASE_FACTOR),
+            )
+        else:
+            self._target_batch_bytes = min(
+                self._max_batch_bytes,
+                self._target_batch_bytes + ADDITIVE_INCREASE_BYTES,
+            )
+
+    # ============================== PRIVATE - STATS ============================== #
+
+    def _record_batch_stats(self, batch_bytes: int, batch_rows: int) -> None:
+        self._batches_amount += 1
+        self._total_batch_bytes += batch_bytes
+        self._total_batch_rows += batch_rows
+
+        if self._batches_amount == 1 or batch_bytes < self._smallest_batch_bytes:
+            self._smallest_batch_bytes = batch_bytes
+        self._biggest_batch_bytes = max(self._biggest_batch_bytes, batch_bytes)
+
+        target_kib = self._target_batch_bytes // constants.KiB
+        self._batches_amount_by_target_kib[target_kib] = (
+            self._batches_amount_by_target_kib.get(target_kib, 0) + 1
+        )
+
+    # ============================== PUBLIC ============================== #
+
+    def target_batch_bytes(self) -> int:
+        return self._target_batch_bytes
+
+    def record_sent_batch(
+        self, batch_bytes: int, batch_rows: int, send_seconds: float
+    ) -> None:
+        self._record_batch_stats(batch_bytes, batch_rows)
+        if batch_bytes == 0:
+            return
+
+        seconds_per_byte = send_seconds / batch_bytes
+        self._adapt_target_batch_bytes(send_seconds, seconds_per_byte)
+        self._update_average_seconds_per_byte(seconds_per_byte)
+
+    def as_log_fields(self) -> str:
+        if self._batches_amount == 0:
+            return "batches: 0"
+
+        targets_distribution = ", ".join(
+            [
+                f"{target_kib}KiB: {batches_amount}"
+                for target_kib, batches_amount in sorted(
+                    self._batches_amount_by_target_kib.items()
+                )
+            ]
+        )
+        return (
+            f"batches: {self._batches_amount}"
+            f" | congested_batches: {self._congested_batches_amount}"
+            f" | avg_batch_bytes: {self._total_batch_bytes // self._batches_amount}"
+            f" | min_batch_bytes: {self._smallest_batch_bytes}"
+            f" | max_batch_bytes: {self._biggest_batch_bytes}"
+            f" | avg_batch_rows: {self._total_batch_rows // self._batches_amount}"
+            f" | batches_by_target: {{{targets_distribution}}}"
+        )
@@ -1,11 +1,21 @@
 import logging
 import signal
 import socket
+import time
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
-from shared import communication_protocol, constants, shell_cmd
+from client.adaptive_batch_sizer import AdaptiveBatchSizer
+from client.query_result_sink import QueryResultSink
+from client.upload_stream import UploadStream
+from shared import (
+    communication_protocol,
+    constants,
+    framed_socket,
+    shell_cmd,
+    socket_io,
+)
 
 
 class Client:
@@ -19,7 +29,12 @@ class Client:
         server_port: int,
         data_path: str,
         results_path: str,
-        batch_max_size: int,
+        min_batch_bytes: int,
+        max_batch_bytes: int,
+        results_writer_thread: bool,
+        socket_buffer_size: int,
+        file_read_buffer_size: int,
+        multi_stream_upload: bool,
     ):
         self._client_id = client_id
         self._session_id = "<not_set>"
@@ -33,14 +48,33 @@ class Client:
         self._output_path.mkdir(parents=True, exist_ok=True)
         shell_cmd.shell_silent(f"rm -f {self._output_path}/*")
 
-        self._batch_max_size = batch_max_size
+        self._results_writer_thread = results_writer_thread
+        self._query_result_sink: Optional[QueryResultSink] = None
 
+        self._min_batch_bytes = min_batch_bytes
+        self._max_batch_bytes = max_batch_bytes
+        self._file_read_buffer_size = file_read_buffer_size
+
+        self._socket_buffer_size = socket_buffer_size
         self._client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # [IMPORTANT] the buffer sizes must be set before connecting
+        socket_io.tune_socket_buffers(self._client_socket, socket_buffer_size)
+        self._socket_reader = socket_io.SocketReader(socket_buffer_size)
 
         self._set_client_as_not_running()
         signal.signal(signal.SIGTERM, self._sigterm_signal_handler)
 
-        self._temp_buffer = b""
+        self._framed_transport = False
+        self._frame_receiver = framed_socket.FramedMessageReceiver(
+            socket_reader=self._socket_reader
+        )
+
+        self._columnar_batches = False
+        self._columns_by_data_type: dict[str, list[str]] = {}
+
+        self._multi_stream_upload_requested = multi_stream_upload
+        self._multi_stream_upload = False
+        self._upload_streams: list[UploadStream] = []
 
     # ============================== PRIVATE - LOGGING ============================== #
 
@@ -74,6 +108,10 @@ class Client:
         self._client_socket.close()
         self._log_debug(f"action: sigterm_client_socket_close | result: success")
 
+        for upload_stream in self._upload_streams:
+            upload_stream.stop()
+        self._log_debug(f"action: sigterm_upload_streams_stop | result: success")
+
         self._log_info(f"action: sigterm_signal_handler | result: success")
 
     # ============================== PRIVATE - SEND/RECEIVE MESSAGES ============================== #
@@ -81,45 +119,29 @@ class Client:
     def _socket_send_message(self, socket: socket.socket, message: str) -> None:
         self._log_debug(f"action: send_message | result: in_progress | msg: {message}")
 
-        socket.sendall(message.encode("utf-8"))
+        encoded_message = message.encode("utf-8")
+        if self._framed_transport:
+            encoded_message = framed_socket.encode_framed_message(encoded_message)
+        socket.sendall(encoded_message)
+        self._socket_reader.stats().record_send(len(encoded_message))
 
         self._log_debug(f"action: send_message | result: success |  msg: {message}")
 
+    def _socket_receive_framed_message(self, socket: socket.socket) -> str:
+        payload_view = self._frame_receiver.receive_message(socket)
+        message = str(payload_view, "utf-8")
+        self._log_debug(f"action: receive_message | result: success | msg: {message}")
+        return message
+
     def _socket_receive_message(self, socket: socket.socket) -> str:
         self._log_debug(f"action: receive_message | result: in_progress")
 
-        buffsize = constants.KiB
-        bytes_received = self._temp_buffer
-        self._temp_buffer = b""
+        if self._framed_transport:
+            return self._socket_receive_framed_message(socket)
 
-        all_data_received = False
-        while not all_data_received:
-            chunk = socket.recv(buffsize)
-            if len(chunk) == 0:
-                logging.error(
-                    f"action: receive_message | result: fail | error: unexpected disconnection",
-                )
-                raise OSError("Unexpected disconnection of the server")
-
-            self._log_debug(
-                f"action: receive_chunk | result: success | chunk size: {len(chunk)}"
-            )
-            if chunk.endswith(communication_protocol.MSG_END_DELIMITER.encode("utf-8")):
-                all_data_received = True
-
-            if communication_protocol.MSG_END_DELIMITER.encode("utf-8") in chunk:
-                index = chunk.rindex(
-                    communication_protocol.MSG_END_DELIMITER.encode("utf-8")
-                )
-                bytes_received += chunk[
-                    : index + len(communication_protocol.MSG_END_DELIMITER)
-                ]
-                self._temp_buffer = chunk[
-                    index + len(communication_protocol.MSG_END_DELIMITER) :
-                ]
-                all_data_received = True
-            else:
-                bytes_received += chunk
+        bytes_received = self._socket_reader.read_until_last_delimiter(
+            socket, communication_protocol.MSG_END_DELIMITER.encode("utf-8")
+        )
 
         message = bytes_received.decode("utf-8")
         self._log_debug(f"action: receive_message | result: success | msg: {message}")
@@ -127,26 +149,50 @@ class Client:
 
     # ============================== PRIVATE - READ CSV ============================== #
 
+    def _columns_to_send(
+        self, message_type: str, column_names: list[str]
+    ) -> list[tuple[int, str]]:
+        columns = list(enumerate(column_names))
+        columns_to_send = self._columns_by_data_type.get(message_type)
+        if columns_to_send is None:
+            return columns
+
+        missing_columns = set(columns_to_send) - set(column_names)
+        if len(missing_columns) != 0:
+            raise ValueError(
+                f"Data file error: {message_type} columns {sorted(missing_columns)} not found"
+            )
+        return [
+            (field_index, column_name)
+            for field_index, column_name in columns
+            if column_name in columns_to_send
+        ]
+
     def _parse_row_from_line(
-        self, column_names: list[str], line: str
+        self, columns: list[tuple[int, str]], line: str
     ) -> dict[str, str]:
         row: dict[str, str] = {}
 
         fields = line.split(",")
-        for i, column_name in enumerate(column_names):
-            row[column_name] = fields[i]
+        for field_index, column_name in columns:
+            row[column_name] = fields[field_index]
 
         return row
 
     def _read_next_batch_from_file(
-        self, file: TextIOWrapper, column_names: list[str]
+        self,
+        file: TextIOWrapper,
+        columns: list[tuple[int, str]],
+        target_batch_bytes: int,
     ) -> list[dict[str, str]]:
         batch: list[dict[str, str]] = []
 
-        batch_size = 0
+        # [IMPORTANT] in a columnar batch each row is its sent fields plus
+        # one separator per field, so this estimates the encoded batch
+        batch_bytes = 0
         eof_reached = False
 
-        while not eof_reached and batch_size < self._batch_max_size:
+        while not eof_reached and batch_bytes < target_batch_bytes:
             row = {}
 
             line = file.readline().strip()
@@ -154,9 +200,9 @@ class Client:
                 eof_reached = True
                 continue
 
-            row = self._parse_row_from_line(column_names, line)
+            row = self._parse_row_from_line(columns, line)
             batch.append(row)
-            batch_size += 1
+            batch_bytes += sum(map(len, row.values())) + len(row)
 
         return batch
 
@@ -177,22 +223,58 @@ class Client:
 
     # ============================== PRIVATE - SEND/RECV HANDSHAKE ============================== #
 
+    def _requested_features(self) -> list[str]:
+        requested_features = [
+            communication_protocol.COLUMNAR_BATCH_FEATURE,
+            communication_protocol.FRAMED_TRANSPORT_FEATURE,
+            communication_protocol.COLUMN_PUSHDOWN_FEATURE,
+        ]
+        if self._multi_stream_upload_requested:
+            requested_features.append(
+                communication_protocol.MULTI_STREAM_UPLOAD_FEATURE
+            )
+        return requested_features
+
+    def _enable_accepted_features(self, accepted_features: list[str]) -> None:
+        self._columnar_batches = (
+            communication_protocol.COLUMNAR_BATCH_FEATURE in accepted_features
+        )
+        self._framed_transport = (
+            communication_protocol.FRAMED_TRANSPORT_FEATURE in accepted_features
+        )
+        self._multi_stream_upload = (
+            communication_protocol.MULTI_STREAM_UPLOAD_FEATURE in accepted_features
+        )
+        self._columns_by_data_type = (
+            communication_protocol.decode_column_pushdown_feature(accepted_features)
+        )
+        self._log_info(
+            f"action: enable_accepted_features | result: success | features: {accepted_features}"
+        )
+
     def _send_handshake_message(self) -> None:
+        handshake_payload = communication_protocol.encode_handshake_payload(
+            communication_protocol.ALL_QUERIES, self._requested_features()
+        )
         handshake_message = communication_protocol.encode_handshake_message(
-            str(self._client_id), communication_protocol.ALL_QUERIES
+            str(self._client_id), handshake_payload
         )
         self._socket_send_message(self._client_socket, handshake_message)
         self._log_info(f"action: send_handshake | result: success")
 
     def _receive_handshake_ack_message(self) -> None:
         received_message = self._socket_receive_message(self._client_socket)
-        self._session_id, client_id = communication_protocol.decode_handshake_message(
+        self._session_id, payload = communication_protocol.decode_handshake_message(
             received_message
         )
+        client_id, accepted_features = communication_protocol.decode_handshake_payload(
+            payload
+        )
         if client_id != str(self._client_id):
             raise ValueError(
                 f"Handshake ACK message error: expected client_id {self._client_id}, received {client_id}"
             )
+        self._enable_accepted_features(accepted_features)
 
         self._log_info(f"action: receive_handshake_ack | result: success")
 
@@ -201,27 +283,45 @@ class Client:
     def _send_data_from_file_using_batchs(
         self,
         folder_name: str,
+        message_type: str,
         file: TextIOWrapper,
         encoding_callback: Callable,
+        send_message: Callable[[str], None],
+        batch_sizer: AdaptiveBatchSizer,
     ) -> None:
         column_names_line = file.readline().strip()
         column_names = column_names_line.split(",")
+        columns = self._columns_to_send(message_type, column_names)
 
-        batch = self._read_next_batch_from_file(file, column_names)
+        batch = self._read_next_batch_from_file(
+            file, columns, batch_sizer.target_batch_bytes()
+        )
         while len(batch) != 0 and self._is_running():
             self._log_debug(f"action: {folder_name}_batch | result: in_progress")
-            message = encoding_callback(self._session_id, batch)
-            self._socket_send_message(self._client_socket, message)
+            message = encoding_callback(
+                self._session_id, batch, self._columnar_batches
+            )
+            send_started_at = time.monotonic()
+            send_message(message)
+            batch_sizer.record_sent_batch(
+                len(message), len(batch), time.monotonic() - send_started_at
+            )
             self._log_debug(f"action: {folder_name}_batch | result: success")
 
-            batch = self._read_next_batch_from_file(file, column_names)
+            batch = self._read_next_batch_from_file(
+                file, columns, batch_sizer.target_batch_bytes()
+            )
 
     def _send_data_from_all_files_using_batchs(
         self,
         folder_name: str,
         message_type: str,
         encoding_callback: Callable,
+        send_message: Callable[[str], None],
     ) -> None:
+        # [IMPORTANT] the batch size adapts to the send latency of each data
+        # type, which may be streamed from its own thread
+        batch_sizer = AdaptiveBatchSizer(self._min_batch_bytes, self._max_batch_bytes)
         for file_path in self._folder_path(folder_name).iterdir():
             if not file_path.name.lower().endswith(".csv"):
                 logging.warning(
@@ -229,12 +329,17 @@ class Client:
                 )
                 continue
             self._assert_is_file(file_path)
-            csv_file = open(file_path, "r", encoding="utf-8", buffering=constants.KiB)
+            csv_file = open(
+                file_path, "r", encoding="utf-8", buffering=self._file_read_buffer_size
+            )
             try:
                 self._send_data_from_file_using_batchs(
                     folder_name,
+                    message_type,
                     csv_file,
                     encoding_callback,
+                    send_message,
+                    batch_sizer,
                 )
             finally:
                 csv_file.close()
@@ -245,51 +350,101 @@ class Client:
         eof_message = communication_protocol.encode_eof_message(
             self._session_id, message_type
         )
-        self._socket_send_message(self._client_socket, eof_message)
+        send_message(eof_message)
         self._log_info(f"action: {folder_name}_all_files_sent | result: success")
+        self._log_info(
+            f"action: {folder_name}_batch_sizes | result: success | {batch_sizer.as_log_fields()}"
+        )
 
-    def _send_all_menu_items(self) -> None:
+    def _send_all_menu_items(self, send_message: Callable[[str], None]) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.MIT_FOLDER_NAME,
             communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE,
             communication_protocol.encode_menu_items_batch_message,
+            send_message,
         )
 
-    def _send_all_stores(self) -> None:
+    def _send_all_stores(self, send_message: Callable[[str], None]) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.STR_FOLDER_NAME,
             communication_protocol.STORES_BATCH_MSG_TYPE,
             communication_protocol.encode_stores_batch_message,
+            send_message,
         )
 
-    def _send_all_transaction_items(self) -> None:
+    def _send_all_transaction_items(self, send_message: Callable[[str], None]) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.TIT_FOLDER_NAME,
             communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE,
             communication_protocol.encode_transaction_items_batch_message,
+            send_message,
         )
 
-    def _send_all_transactions(self) -> None:
+    def _send_all_transactions(self, send_message: Callable[[str], None]) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.TRN_FOLDER_NAME,
             communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
             communication_protocol.encode_transactions_batch_message,
+            send_message,
         )
 
-    def _send_all_users(self) -> None:
+    def _send_all_users(self, send_message: Callable[[str], None]) -> None:
         self._send_data_from_all_files_using_batchs(
             constants.USR_FOLDER_NAME,
             communication_protocol.USERS_BATCH_MSG_TYPE,
             communication_protocol.encode_users_batch_message,
+            send_message,
+        )
+
+    def _send_message_to_server(self, message: str) -> None:
+        self._socket_send_message(self._client_socket, message)
+
+    def _start_upload_stream(
+        self, name: str, upload_callback: Callable[[Callable[[str], None]], None]
+    ) -> None:
+        upload_stream = UploadStream(
+            name,
+            self._server_host,
+            self._server_port,
+            self._socket_buffer_size,
+            self._client_id,
+            self._session_id,
+            self._framed_transport,
+            upload_callback,
+        )
+        self._upload_streams.append(upload_stream)
+        upload_stream.start()
+
+    def _send_fact_data_using_upload_streams(self) -> None:
+        # [IMPORTANT] both fact tables are independent from each other, so
+        # each one is streamed through its own connection joined to the session
+        self._start_upload_stream(
+            constants.TRN_FOLDER_NAME, self._send_all_transactions
         )
+        self._start_upload_stream(
+            constants.TIT_FOLDER_NAME, self._send_all_transaction_items
+        )
+
+        try:
+            for upload_stream in self._upload_streams:
+                upload_stream.join()
+        except Exception as e:
+            for upload_stream in self._upload_streams:
+                upload_stream.stop()
+            raise e
+        finally:
+            self._upload_streams = []
 
     def _send_all_data(self) -> None:
         # WARNING: do not modify order
-        self._send_all_menu_items()
-        self._send_all_stores()
-        self._send_all_users()
-        self._send_all_transactions()
-        self._send_all_transaction_items()
+        self._send_all_menu_items(self._send_message_to_server)
+        self._send_all_stores(self._send_message_to_server)
+        self._send_all_users(self._send_message_to_server)
+        if self._multi_stream_upload:
+            self._send_fact_data_using_upload_streams()
+        else:
+            self._send_all_transactions(self._send_message_to_server)
+            self._send_all_transaction_items(self._send_message_to_server)
         self._log_info(f"action: all_data_sent | result: success")
 
     # ============================== PRIVATE - SEND DATA ============================== #
@@ -298,16 +453,12 @@ class Client:
         self._log_debug(
             f"action: {message_type}_receive_query_result | result: success"
         )
-        file_name = (
-            f"client_{self._client_id}__{self._session_id}__{message_type}_result.txt"
+        self._opened_query_result_sink().write_rows(
+            message_type, communication_protocol.decode_batch_message(message)
+        )
+        self._log_debug(
+            f"action: {message_type}_save_query_result | result: success",
         )
-        for item_batch in communication_protocol.decode_batch_message(message):
-            shell_cmd.shell_silent(
-                f"echo '{",".join(item_batch.values())}' >> {self._output_path / file_name}"
-            )
-            self._log_debug(
-                f"action: {message_type}_save_query_result | result: success | file: {file_name}",
-            )
 
     def _handle_query_result_eof_message(
         self, message: str, all_eof_received: dict
@@ -317,6 +468,7 @@ class Client:
             raise ValueError(f"Unknown EOF message type {data_type}")
 
         all_eof_received[data_type] = True
+        self._opened_query_result_sink().close_query(data_type)
         self._log_info(
             f"action: eof_{data_type}_receive_query_result | result: success"
         )
@@ -352,6 +504,11 @@ class Client:
         *args: Any,
         **kwargs: Any,
     ) -> None:
+        if self._framed_transport:
+            if self._is_running():
+                callback(received_message, *args, **kwargs)
+            return
+
         messages = received_message.split(communication_protocol.MSG_END_DELIMITER)
         for message in messages:
             if not self._is_running():
@@ -383,15 +540,43 @@ class Client:
 
         self._log_info(f"action: all_query_results_received | result: success")
 
+    # ============================== PRIVATE - QUERY RESULT SINK ============================== #
+
+    def _open_query_result_sink(self) -> None:
+        self._query_result_sink = QueryResultSink(
+            output_path=self._output_path,
+            file_name_prefix=f"client_{self._client_id}__{self._session_id}__",
+            buffer_size=constants.MiB,
+            with_writer_thread=self._results_writer_thread,
+        )
+        self._log_debug(f"action: query_result_sink_open | result: success")
+
+    def _opened_query_result_sink(self) -> QueryResultSink:
+        if self._query_result_sink is None:
+            raise ValueError("Query result received before opening the sink")
+        return self._query_result_sink
+
+    def _close_query_result_sink(self) -> None:
+        if self._query_result_sink is None:
+            return
+
+        self._query_result_sink.close()
+        self._query_result_sink = None
+        self._log_debug(f"action: query_result_sink_close | result: success")
+
     # ============================== PRIVATE - HANDLE SERVER CONNECTION ============================== #
 
     def _handle_server_connection(self) -> None:
         self._send_handshake_message()
         self._receive_handshake_ack_message()
 
-        self._send_all_data()
+        self._open_query_result_sink()
+        try:
+            self._send_all_data()
 
-        self._receive_all_query_results_from_server()
+            self._receive_all_query_results_from_server()
+        finally:
+            self._close_query_result_sink()
 
     # ============================== PUBLIC ============================== #
 
@@ -410,5 +595,8 @@ class Client:
         finally:
             server_socket.close()
             self._log_debug("action: server_socket_close | result: success")
+            self._log_info(
+                f"action: socket_io_stats | result: success | {self._socket_reader.stats().as_log_fields()}"
+            )
 
         self._log_info(f"action: client_shutdown | result: success")
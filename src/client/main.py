@@ -13,7 +13,12 @@ def main():
             "SERVER_PORT",
             "DATA_PATH",
             "RESULTS_PATH",
-            "BATCH_MAX_SIZE",
+            "MIN_BATCH_BYTES",
+            "MAX_BATCH_BYTES",
+            "RESULTS_WRITER_THREAD",
+            "SOCKET_BUFFER_SIZE",
+            "FILE_READ_BUFFER_SIZE",
+            "MULTI_STREAM_UPLOAD",
         ]
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
@@ -25,7 +30,13 @@ def main():
         server_port=int(config_params["SERVER_PORT"]),
         data_path=config_params["DATA_PATH"],
         results_path=config_params["RESULTS_PATH"],
-        batch_max_size=int(config_params["BATCH_MAX_SIZE"]),
+        min_batch_bytes=int(config_params["MIN_BATCH_BYTES"]),
+        max_batch_bytes=int(config_params["MAX_BATCH_BYTES"]),
+        results_writer_thread=config_params["RESULTS_WRITER_THREAD"].lower()
+        == "true",
+        socket_buffer_size=int(config_params["SOCKET_BUFFER_SIZE"]),
+        file_read_buffer_size=int(config_params["FILE_READ_BUFFER_SIZE"]),
+        multi_stream_upload=config_params["MULTI_STREAM_UPLOAD"].lower() == "true",
     )
     client.run()
 
@@ -0,0 +1,123 @@
+import logging
+import queue
+import threading
+from io import TextIOWrapper
+from pathlib import Path
+from typing import Any, Optional
+
+_WRITE_ROWS = "write_rows"
+_CLOSE_QUERY = "close_query"
+_STOP = "stop"
+
+
+class QueryResultSink:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        output_path: Path,
+        file_name_prefix: str,
+        buffer_size: int,
+        with_writer_thread: bool,
+    ) -> None:
+        self._output_path = output_path
+        self._file_name_prefix = file_name_prefix
+        self._buffer_size = buffer_size
+
+        self._files_by_query: dict[str, TextIOWrapper] = {}
+
+        self._writer_thread: Optional[threading.Thread] = None
+        self._pending_operations: queue.Queue = queue.Queue()
+        self._writer_exception: Optional[Exception] = None
+        if with_writer_thread:
+            self._writer_thread = threading.Thread(
+                target=self._run_writer, name="query_result_writer"
+            )
+            self._writer_thread.start()
+
+    # ============================== PRIVATE - FILES ============================== #
+
+    def _file_for(self, query: str) -> TextIOWrapper:
+        file = self._files_by_query.get(query)
+        if file is None:
+            file_path = self._output_path / f"{self._file_name_prefix}{query}_result.txt"
+            file = open(file_path, "w", encoding="utf-8", buffering=self._buffer_size)
+            self._files_by_query[query] = file
+            logging.debug(
+                f"action: open_query_result_file | result: success | file: {file_path}"
+            )
+        return file
+
+    def _write_rows(self, query: str, rows: list[dict[str, str]]) -> None:
+        if len(rows) == 0:
+            return
+
+        lines = [",".join(row.values()) for row in rows]
+        lines.append("")
+        self._file_for(query).write("\n".join(lines))
+
+    def _close_query(self, query: str) -> None:
+        file = self._files_by_query.pop(query, None)
+        if file is not None:
+            file.close()
+            logging.debug(
+                f"action: close_query_result_file | result: success | query: {query}"
+            )
+
+    def _close_all_queries(self) -> None:
+        for query in list(self._files_by_query.keys()):
+            self._close_query(query)
+
+    # ============================== PRIVATE - WRITER THREAD ============================== #
+
+    def _run_writer(self) -> None:
+        try:
+            while True:
+                operation, query, rows = self._pending_operations.get()
+                if operation == _STOP:
+                    break
+                self._apply(operation, query, rows)
+        except Exception as e:
+            self._writer_exception = e
+            logging.error(
+                f"action: query_result_writer | result: fail | error: {e}",
+            )
+        finally:
+            self._close_all_queries()
+
+    def _apply(self, operation: str, query: str, rows: Any) -> None:
+        if operation == _WRITE_ROWS:
+            self._write_rows(query, rows)
+        elif operation == _CLOSE_QUERY:
+            self._close_query(query)
+
+    def _raise_writer_exception_if_any(self) -> None:
+        if self._writer_exception is not None:
+            raise self._writer_exception
+
+    def _submit(self, operation: str, query: str, rows: Any = None) -> None:
+        if self._writer_thread is None:
+            self._apply(operation, query, rows)
+            return
+
+        self._raise_writer_exception_if_any()
+        self._pending_operations.put((operation, query, rows))
+
+    # ============================== PUBLIC ============================== #
+
+    def write_rows(self, query: str, rows: list[dict[str, str]]) -> None:
+        self._submit(_WRITE_ROWS, query, rows)
+
+    def close_query(self, query: str) -> None:
+        self._submit(_CLOSE_QUERY, query)
+
+    def close(self) -> None:
+        if self._writer_thread is None:
+            self._close_all_queries()
+            return
+
+        self._pending_operations.put((_STOP, "", None))
+        self._writer_thread.join()
+        logging.debug("action: query_result_writer_join | result: success")
+        self._raise_writer_exception_if_any()
@@ -0,0 +1,119 @@
+import logging
+import socket
+import threading
+from typing import Callable, Optional
+
+from shared import communication_protocol, framed_socket, socket_io
+
+
+class UploadStream:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        name: str,
+        server_host: str,
+        server_port: int,
+        socket_buffer_size: int,
+        client_id: int,
+        session_id: str,
+        framed_transport: bool,
+        upload_callback: Callable[[Callable[[str], None]], None],
+    ) -> None:
+        self._name = name
+
+        self._server_host = server_host
+        self._server_port = server_port
+
+        self._client_id = client_id
+        self._session_id = session_id
+        self._framed_transport = framed_transport
+
+        self._upload_callback = upload_callback
+
+        self._stream_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        socket_io.tune_socket_buffers(self._stream_socket, socket_buffer_size)
+        self._socket_reader = socket_io.SocketReader(socket_buffer_size)
+
+        self._uploader_thread = threading.Thread(
+            target=self._run_uploader, name=f"{name}_upload_stream"
+        )
+        self._uploader_exception: Optional[Exception] = None
+
+    # ============================== PRIVATE - LOGGING ============================== #
+
+    def _log_debug(self, text: str) -> None:
+        logging.debug(f"{text} | stream: {self._name}")
+
+    def _log_info(self, text: str) -> None:
+        logging.info(f"{text} | stream: {self._name}")
+
+    def _log_error(self, text: str) -> None:
+        logging.error(f"{text} | stream: {self._name}")
+
+    # ============================== PRIVATE - SEND/RECEIVE MESSAGES ============================== #
+
+    def _socket_send_message(self, message: str) -> None:
+        encoded_message = message.encode("utf-8")
+        if self._framed_transport:
+            encoded_message = framed_socket.encode_framed_message(encoded_message)
+        self._stream_socket.sendall(encoded_message)
+        self._socket_reader.stats().record_send(len(encoded_message))
+
+    # ============================== PRIVATE - JOIN SESSION ============================== #
+
+    def _join_session(self) -> None:
+        # [IMPORTANT] the join message and its ACK always travel delimited,
+        # the negotiated transport is only used from the next message onwards
+        join_message = communication_protocol.encode_join_message(
+            self._session_id, str(self._client_id)
+        )
+        self._stream_socket.sendall(join_message.encode("utf-8"))
+
+        received_message = self._socket_reader.read_until_last_delimiter(
+            self._stream_socket,
+            communication_protocol.MSG_END_DELIMITER.encode("utf-8"),
+        )
+        session_id, client_id = communication_protocol.decode_join_message(
+            str(received_message, "utf-8")
+        )
+        if session_id != self._session_id or client_id != str(self._client_id):
+            raise ValueError(
+                f"Join ACK message error: expected session_id {self._session_id}, received {session_id}"
+            )
+        self._log_info(f"action: join_session | result: success")
+
+    # ============================== PRIVATE - UPLOADER THREAD ============================== #
+
+    def _run_uploader(self) -> None:
+        try:
+            self._stream_socket.connect((self._server_host, self._server_port))
+            self._join_session()
+            self._upload_callback(self._socket_send_message)
+        except Exception as e:
+            self._log_error(f"action: upload_stream | result: fail | error: {e}")
+            self._uploader_exception = e
+        finally:
+            self._stream_socket.close()
+            self._log_debug(f"action: stream_socket_close | result: success")
+            self._log_info(
+                f"action: socket_io_stats | result: success | {self._socket_reader.stats().as_log_fields()}"
+            )
+
+    # ============================== PUBLIC ============================== #
+
+    def start(self) -> None:
+        self._uploader_thread.start()
+
+    def join(self) -> None:
+        self._uploader_thread.join()
+        if self._uploader_exception is not None:
+            raise self._uploader_exception
+
+    def stop(self) -> None:
+        # [IMPORTANT] unblocks a pending send, the thread then fails and ends
+        try:
+            self._stream_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
@@ -5,6 +5,7 @@ from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
 )
+from shared import communication_protocol, constants
 
 
 class StoresCleaner(Cleaner):
@@ -25,14 +26,16 @@ class StoresCleaner(Cleaner):
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _columns_to_keep(self) -> list[str]:
-        return [
-            "store_id",
-            "store_name",
-        ]
+        return constants.STR_CLEANED_COLUMNS
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        message = communication_protocol.encode_batch_message(
+            message_type, session_id, batch
+        )
         mom_producer = self._mom_producers[self._current_producer_id]
         mom_producer.send(message)
 
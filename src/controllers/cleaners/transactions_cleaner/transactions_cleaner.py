@@ -3,6 +3,7 @@ from typing import Any
 from controllers.cleaners.shared.cleaner import Cleaner
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+from shared import communication_protocol, constants
 
 
 class TransactionsCleaner(Cleaner):
@@ -19,17 +20,16 @@ class TransactionsCleaner(Cleaner):
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _columns_to_keep(self) -> list[str]:
-        return [
-            "created_at",
-            "store_id",
-            "final_amount",
-            "transaction_id",
-            "user_id",
-        ]
+        return constants.TRN_CLEANED_COLUMNS
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        message = communication_protocol.encode_batch_message(
+            message_type, session_id, batch
+        )
         mom_cleaned_data_producer = self._mom_producers[self._current_producer_id]
         mom_cleaned_data_producer.send(message)
 
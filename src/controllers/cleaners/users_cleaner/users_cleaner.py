@@ -1,10 +1,11 @@
-import logging
 from typing import Any
 
 from controllers.cleaners.shared.cleaner import Cleaner
+from controllers.shared import shard_router
+from controllers.shared.shard_router import ShardRouter
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
-from shared import communication_protocol
+from shared import communication_protocol, constants
 
 
 class UsersCleaner(Cleaner):
@@ -18,39 +19,32 @@ class UsersCleaner(Cleaner):
         queue_name = f"{queue_name_prefix}-{producer_id}"
         return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
 
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
+        # [IMPORTANT] this must consider the next controller's grouping key
+        self._shard_router = ShardRouter(
+            sharding_key="user_id",
+            shards_amount=len(self._mom_producers),
+            shard_hash=shard_router.numeric_shard_hash,
+            empty_key_policy=shard_router.EMPTY_KEY_SKIPPED,
+        )
+
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _columns_to_keep(self) -> list[str]:
-        return [
-            "user_id",
-            "birthdate",
-        ]
+        return constants.USR_CLEANED_COLUMNS
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "user_id"
-
-        message_type = communication_protocol.get_message_type(message)
-        session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                logging.warning(
-                    f"action: invalid_{sharding_key} | {sharding_key}: {batch_item[sharding_key]} | result: skipped"
-                )
-                continue
-            sharding_value = int(float(batch_item[sharding_key]))
-            batch_item[sharding_key] = str(sharding_value)
-
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
-
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        for shard, shard_batch in self._shard_router.bucket_batch(batch).items():
             message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
+                message_type, session_id, shard_batch
             )
-            mom_producer.send(message)
+            self._mom_producers[shard].send(message)
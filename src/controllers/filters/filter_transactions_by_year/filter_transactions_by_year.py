@@ -1,7 +1,8 @@
-import logging
 from typing import Any
 
 from controllers.filters.shared.filter import Filter
+from controllers.shared import shard_router
+from controllers.shared.shard_router import ShardRouter
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
@@ -54,6 +55,20 @@ class FilterTransactionsByYear(Filter):
 
         self._years_to_keep = set(years_to_keep)
 
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
+        # [IMPORTANT] this must consider the next controller's grouping key
+        self._shard_router = ShardRouter(
+            sharding_key="user_id",
+            shards_amount=len(self._mom_producers),
+            shard_hash=shard_router.numeric_shard_hash,
+            empty_key_policy=shard_router.EMPTY_KEY_TO_FIRST_SHARD,
+        )
+
     # ============================== PRIVATE - TRANSFORM DATA ============================== #
 
     def _should_be_included(self, batch_item: dict[str, str]) -> bool:
@@ -65,31 +80,11 @@ class FilterTransactionsByYear(Filter):
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "user_id"
-
-        message_type = communication_protocol.get_message_type(message)
-        session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                # [IMPORTANT] If sharding value is empty, the hash will fail
-                # but we are going to assign it to the first reducer anyway
-                hash = 0
-                batchs_by_hash.setdefault(hash, [])
-                batchs_by_hash[hash].append(batch_item)
-                continue
-            sharding_value = int(float(batch_item[sharding_key]))
-            batch_item[sharding_key] = str(sharding_value)
-
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
-
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        for shard, shard_batch in self._shard_router.bucket_batch(batch).items():
             message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
+                message_type, session_id, shard_batch
             )
-            mom_producer.send(message)
+            self._mom_producers[shard].send(message)
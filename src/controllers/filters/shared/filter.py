@@ -1,6 +1,6 @@
 import logging
 from abc import abstractmethod
-from typing import Any, Callable
+from typing import Any
 
 from controllers.shared.controller import Controller
 from middleware.middleware import MessageMiddleware
@@ -66,32 +66,21 @@ class Filter(Controller):
     def _should_be_included(self, batch_item: dict[str, str]) -> bool:
         raise NotImplementedError("subclass responsibility")
 
-    def _transform_batch_message_using(
-        self,
-        message: str,
-        decoder: Callable,
-        encoder: Callable,
-        message_type: str,
-        session_id: str,
-    ) -> str:
+    def _transform_batch(self, batch: list[dict[str, str]]) -> list[dict[str, str]]:
         new_batch = []
-        for item in decoder(message):
+        for item in batch:
             if self._should_be_included(item):
                 new_batch.append(item)
-        return str(encoder(message_type, session_id, new_batch))
-
-    def _transform_batch_message(self, message: str) -> str:
-        return self._transform_batch_message_using(
-            message,
-            communication_protocol.decode_batch_message,
-            communication_protocol.encode_batch_message,
-            communication_protocol.get_message_type(message),
-            communication_protocol.get_message_session_id(message),
-        )
+        return new_batch
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        message = communication_protocol.encode_batch_message(
+            message_type, session_id, batch
+        )
         mom_producer = self._mom_producers[self._current_producer_id]
         mom_producer.send(message)
 
@@ -100,9 +89,13 @@ class Filter(Controller):
             self._current_producer_id = 0
 
     def _handle_data_batch_message(self, message: str) -> None:
-        output_message = self._transform_batch_message(message)
-        if not communication_protocol.message_without_payload(output_message):
-            self._mom_send_message_to_next(output_message)
+        message_type = communication_protocol.get_message_type(message)
+        session_id = communication_protocol.get_message_session_id(message)
+        batch = communication_protocol.decode_batch_message(message)
+
+        output_batch = self._transform_batch(batch)
+        if len(output_batch) != 0:
+            self._mom_send_batch_to_next(message_type, session_id, output_batch)
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
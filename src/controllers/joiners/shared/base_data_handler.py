@@ -1,12 +1,16 @@
 import logging
 import threading
-from typing import Any, Callable, Union
+from typing import Any, Callable, Optional, Union
 
+from controllers.joiners.shared import dimension_cache
+from controllers.joiners.shared.dimension_cache import DimensionCache
+from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
 )
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
 from shared import communication_protocol
+from shared.bloom_filter import BloomFilter
 
 
 class BaseDataHandler:
@@ -27,23 +31,49 @@ class BaseDataHandler:
             RabbitMQMessageMiddlewareQueue, RabbitMQMessageMiddlewareExchange
         ] = self._build_mom_consumer(rabbitmq_host, consumers_config)
 
+    def _init_mom_bloom_filter_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        self._mom_bloom_filter_producers: list[MessageMiddleware] = (
+            self._build_mom_bloom_filter_producers(rabbitmq_host, producers_config)
+        )
+        # [IMPORTANT] the rate is required as soon as a bloom filter is sent,
+        # so a missing config fails here instead of at the first EOF
+        self._bloom_filter_false_positive_rate: float = 0.0
+        if len(self._mom_bloom_filter_producers) > 0:
+            self._bloom_filter_false_positive_rate = producers_config[
+                "bloom_filter_false_positive_rate"
+            ]
+
     def __init__(
         self,
         controller_id: int,
         rabbitmq_host: str,
         consumers_config: dict[str, Any],
+        producers_config: dict[str, Any],
         build_mom_consumer: Callable,
-        base_data_by_session_id: dict[str, list[dict[str, Any]]],
+        build_mom_bloom_filter_producers: Callable,
+        base_data_by_session_id: dict[str, dict[Any, tuple[str, ...]]],
         base_data_by_session_id_lock: Any,
         all_base_data_received: dict[str, bool],
         all_base_data_received_lock: Any,
+        join_key: str,
+        base_data_columns: list[str],
+        transform_function: Callable,
+        on_all_base_data_received: Callable[[str], None],
+        dimension_cache: Optional[DimensionCache],
         is_stopped: threading.Event,
     ) -> None:
         self._controller_id = controller_id
 
         self._build_mom_consumer = build_mom_consumer
 
+        self._build_mom_bloom_filter_producers = build_mom_bloom_filter_producers
+
         self._init_mom_consumers(rabbitmq_host, consumers_config)
+        self._init_mom_bloom_filter_producers(rabbitmq_host, producers_config)
 
         self._base_data_by_session_id = base_data_by_session_id
         self._base_data_by_session_id_lock = base_data_by_session_id_lock
@@ -51,6 +81,16 @@ class BaseDataHandler:
         self._all_base_data_received = all_base_data_received
         self._all_base_data_received_lock = all_base_data_received_lock
 
+        self._join_key = join_key
+        self._base_data_columns = base_data_columns
+        self._transform_function = transform_function
+
+        self._on_all_base_data_received = on_all_base_data_received
+
+        self._dimension_cache = dimension_cache
+        self._base_data_messages_by_session_id: dict[str, list[str]] = {}
+        self._base_data_digest_by_session_id: dict[str, int] = {}
+
         self.is_stopped = is_stopped
 
     # ============================== PRIVATE - LOGGING ============================== #
@@ -76,13 +116,110 @@ class BaseDataHandler:
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
+    def _index_base_data_item(
+        self, base_data_index: dict[Any, tuple[str, ...]], item_batch: dict[str, str]
+    ) -> None:
+        join_value = item_batch.get(self._join_key)
+        if join_value is None or join_value == "":
+            self._log_debug(
+                f"action: index_base_data_item | result: skipped | item_batch: {item_batch}"
+            )
+            return
+
+        # [IMPORTANT] the first base item of each key wins, as it did when
+        # the stream side scanned the base data in arrival order
+        index_key = self._transform_function(join_value)
+        if index_key not in base_data_index:
+            base_data_index[index_key] = tuple(
+                item_batch[column] for column in self._base_data_columns
+            )
+
+    def _stage_cacheable_base_data_batch_message(self, message: str) -> None:
+        # [IMPORTANT] the index is built at EOF only if no other session
+        # already built one for the same base data
+        session_id = communication_protocol.get_message_session_id(message)
+        payload_digest = dimension_cache.batch_payload_digest(
+            communication_protocol.get_message_payload(message)
+        )
+        self._base_data_digest_by_session_id[session_id] = (
+            dimension_cache.combined_digest(
+                self._base_data_digest_by_session_id.get(session_id, 0),
+                payload_digest,
+            )
+        )
+        self._base_data_messages_by_session_id.setdefault(session_id, []).append(
+            message
+        )
+
+    def _publish_cached_base_data_of(
+        self, session_id: str, base_data_cache: DimensionCache
+    ) -> None:
+        messages = self._base_data_messages_by_session_id.pop(session_id, [])
+        digest = self._base_data_digest_by_session_id.pop(session_id, 0)
+
+        base_data_index = base_data_cache.acquire(session_id, digest)
+        if base_data_index is None:
+            base_data_index = {}
+            for message in messages:
+                for item_batch in communication_protocol.decode_batch_message(message):
+                    self._index_base_data_item(base_data_index, item_batch)
+            base_data_index = base_data_cache.publish(
+                session_id, digest, base_data_index
+            )
+            self._log_info(
+                f"action: dimension_cache_lookup | result: miss | session_id: {session_id}"
+            )
+        else:
+            self._log_info(
+                f"action: dimension_cache_lookup | result: hit | session_id: {session_id}"
+            )
+
+        with self._base_data_by_session_id_lock:
+            self._base_data_by_session_id[session_id] = base_data_index
+
     def _handle_base_data_batch_message(self, message: str) -> None:
+        if self._dimension_cache is not None:
+            self._stage_cacheable_base_data_batch_message(message)
+            return
+
         session_id = communication_protocol.get_message_session_id(message)
         batch_message = communication_protocol.decode_batch_message(message)
+
+        # [IMPORTANT] the batch is indexed outside the lock and published
+        # with a single lock acquisition, so the stream side does not stall
+        staged_base_data_index: dict[Any, tuple[str, ...]] = {}
         for item_batch in batch_message:
-            with self._base_data_by_session_id_lock:
-                self._base_data_by_session_id.setdefault(session_id, [])
-                self._base_data_by_session_id[session_id].append(item_batch)
+            self._index_base_data_item(staged_base_data_index, item_batch)
+
+        with self._base_data_by_session_id_lock:
+            base_data_index = self._base_data_by_session_id.setdefault(session_id, {})
+            for index_key, base_values in staged_base_data_index.items():
+                base_data_index.setdefault(index_key, base_values)
+
+    def _send_bloom_filter_of(self, session_id: str) -> None:
+        if len(self._mom_bloom_filter_producers) == 0:
+            return
+
+        with self._base_data_by_session_id_lock:
+            join_keys = list(self._base_data_by_session_id.get(session_id, {}))
+
+        bloom_filter = BloomFilter.for_expected_items(
+            len(join_keys), self._bloom_filter_false_positive_rate
+        )
+        for join_key in join_keys:
+            bloom_filter.add(str(join_key))
+
+        message = communication_protocol.encode_bloom_filter_message(
+            session_id,
+            bloom_filter.bits_amount(),
+            bloom_filter.hashes_amount(),
+            bloom_filter.bits(),
+        )
+        for mom_producer in self._mom_bloom_filter_producers:
+            mom_producer.send(message)
+        self._log_info(
+            f"action: bloom_filter_sent | result: success | session_id: {session_id} | join_keys: {len(join_keys)} | bits_amount: {bloom_filter.bits_amount()}"
+        )
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
@@ -111,8 +248,16 @@ class BaseDataHandler:
                 f"action: all_eofs_received | result: success | session_id: {session_id}"
             )
 
+            if self._dimension_cache is not None:
+                self._publish_cached_base_data_of(session_id, self._dimension_cache)
+
+            # [IMPORTANT] the bloom filter is sent before releasing the stream
+            # side, which cleans the base data of the session once it is done
+            self._send_bloom_filter_of(session_id)
+
             with self._all_base_data_received_lock:
                 self._all_base_data_received[session_id] = True
+            self._on_all_base_data_received(session_id)
 
             self._clean_session_data_of(session_id)
 
@@ -136,6 +281,10 @@ class BaseDataHandler:
         self._mom_consumer.start_consuming(self._handle_base_data)
 
     def _close_all(self) -> None:
+        for mom_producer in self._mom_bloom_filter_producers:
+            mom_producer.close()
+            self._log_debug(f"action: mom_bloom_filter_producer_close | result: success")
+
         self._mom_consumer.delete()
         self._mom_consumer.close()
         self._log_info(f"action: mom_consumer_close | result: success")
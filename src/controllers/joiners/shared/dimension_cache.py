@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# digests of the base data batches are added modulo this value, so the
+# digest does not depend on the order the batches are received in
+DIGEST_MODULUS = 2**128
+
+
+def batch_payload_digest(payload: str) -> int:
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest, byteorder="big")
+
+
+def combined_digest(digest: int, another_digest: int) -> int:
+    return (digest + another_digest) % DIGEST_MODULUS
+
+
+class _CachedDimension:
+
+    def __init__(self, base_data_index: dict[Any, tuple[str, ...]]) -> None:
+        self.base_data_index = base_data_index
+        self.references = 0
+
+
+class DimensionCache:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, max_unused_entries: int = 4) -> None:
+        self._max_unused_entries = max_unused_entries
+
+        self._cached_dimension_by_digest: dict[int, _CachedDimension] = {}
+        # [IMPORTANT] only entries without references can be evicted,
+        # and they are kept here in least recently used order
+        self._unused_digests: OrderedDict[int, None] = OrderedDict()
+        self._digest_by_session_id: dict[str, int] = {}
+
+        self._lock = threading.Lock()
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _reference(self, session_id: str, digest: int) -> _CachedDimension:
+        cached_dimension = self._cached_dimension_by_digest[digest]
+        cached_dimension.references += 1
+        self._unused_digests.pop(digest, None)
+        self._digest_by_session_id[session_id] = digest
+        return cached_dimension
+
+    def _evict_unused_entries(self) -> None:
+        while len(self._unused_digests) > self._max_unused_entries:
+            digest, _ = self._unused_digests.popitem(last=False)
+            del self._cached_dimension_by_digest[digest]
+            logging.debug(
+                f"action: dimension_cache_evict | result: success | digest: {digest:x}"
+            )
+
+    # ============================== PUBLIC ============================== #
+
+    def acquire(
+        self, session_id: str, digest: int
+    ) -> Optional[dict[Any, tuple[str, ...]]]:
+        with self._lock:
+            if digest not in self._cached_dimension_by_digest:
+                return None
+            return self._reference(session_id, digest).base_data_index
+
+    def publish(
+        self,
+        session_id: str,
+        digest: int,
+        base_data_index: dict[Any, tuple[str, ...]],
+    ) -> dict[Any, tuple[str, ...]]:
+        with self._lock:
+            if digest not in self._cached_dimension_by_digest:
+                self._cached_dimension_by_digest[digest] = _CachedDimension(
+                    base_data_index
+                )
+            return self._reference(session_id, digest).base_data_index
+
+    def release(self, session_id: str) -> None:
+        with self._lock:
+            digest = self._digest_by_session_id.pop(session_id, None)
+            if digest is None:
+                return
+
+            cached_dimension = self._cached_dimension_by_digest[digest]
+            cached_dimension.references -= 1
+            if cached_dimension.references == 0:
+                self._unused_digests[digest] = None
+                self._evict_unused_entries()
+
+    def entries_amount(self) -> int:
+        with self._lock:
+            return len(self._cached_dimension_by_digest)
@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Any
+
+
+class InstrumentedLock:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._lock = threading.Lock()
+
+        # [IMPORTANT] counters are only updated while holding the lock
+        self._acquisitions = 0
+        self._contended_acquisitions = 0
+        self._waiting_seconds = 0.0
+
+    # ============================== PUBLIC ============================== #
+
+    def acquire(self) -> bool:
+        if self._lock.acquire(blocking=False):
+            self._acquisitions += 1
+            return True
+
+        waiting_since = time.monotonic()
+        self._lock.acquire()
+        self._acquisitions += 1
+        self._contended_acquisitions += 1
+        self._waiting_seconds += time.monotonic() - waiting_since
+        return True
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def __enter__(self) -> "InstrumentedLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
+    def name(self) -> str:
+        return self._name
+
+    def contention_counters(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "acquisitions": self._acquisitions,
+                "contended_acquisitions": self._contended_acquisitions,
+                "waiting_seconds": round(self._waiting_seconds, 6),
+            }
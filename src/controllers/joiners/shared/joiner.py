@@ -4,6 +4,8 @@ from abc import abstractmethod
 from typing import Any, Optional
 
 from controllers.joiners.shared.base_data_handler import BaseDataHandler
+from controllers.joiners.shared.dimension_cache import DimensionCache
+from controllers.joiners.shared.instrumented_lock import InstrumentedLock
 from controllers.joiners.shared.stream_data_handler import StreamDataHandler
 from controllers.shared.controller import Controller
 from middleware.middleware import MessageMiddleware
@@ -36,6 +38,14 @@ class Joiner(Controller):
     ) -> MessageMiddleware:
         raise NotImplementedError("subclass responsibility")
 
+    @abstractmethod
+    def _build_mom_bloom_filter_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> list[MessageMiddleware]:
+        raise NotImplementedError("subclass responsibility")
+
     def _init_mom_consumers(
         self,
         rabbitmq_host: str,
@@ -69,11 +79,19 @@ class Joiner(Controller):
         self._consumers_config = consumers_config
         self._producers_config = producers_config
 
-        self._base_data_by_session_id = {}
-        self._base_data_by_session_id_lock = threading.Lock()
+        self._base_data_by_session_id: dict[str, dict[Any, tuple[str, ...]]] = {}
+        self._base_data_by_session_id_lock = InstrumentedLock(
+            "base_data_by_session_id_lock"
+        )
 
         self._all_base_data_received = {}
-        self._all_base_data_received_lock = threading.Lock()
+        self._all_base_data_received_lock = InstrumentedLock(
+            "all_base_data_received_lock"
+        )
+
+        self._dimension_cache: Optional[DimensionCache] = None
+        if self._cache_base_data_across_sessions():
+            self._dimension_cache = DimensionCache()
 
         self._base_data_handler: Optional[BaseDataHandler] = None
         self._stream_data_handler: Optional[StreamDataHandler] = None
@@ -110,17 +128,42 @@ class Joiner(Controller):
     def _transform_function(self, value: str) -> Any:
         raise NotImplementedError("subclass responsibility")
 
+    @abstractmethod
+    def _base_data_columns_to_keep(self) -> list[str]:
+        raise NotImplementedError("subclass responsibility")
+
+    @abstractmethod
+    def _cache_base_data_across_sessions(self) -> bool:
+        raise NotImplementedError("subclass responsibility")
+
+    def _log_lock_contention_counters(self) -> None:
+        logging.info(
+            f"action: lock_contention_counters | result: success | counters: {self.lock_contention_counters()}"
+        )
+
+    def _on_all_base_data_received(self, session_id: str) -> None:
+        self._log_lock_contention_counters()
+        if self._stream_data_handler:
+            self._stream_data_handler.release_pending_eof_of(session_id)
+
     def _handle_base_data(self) -> None:
         try:
             self._base_data_handler = BaseDataHandler(
                 controller_id=self._controller_id,
                 rabbitmq_host=self._rabbitmq_host,
                 consumers_config=self._consumers_config,
+                producers_config=self._producers_config,
                 build_mom_consumer=self._build_mom_base_data_consumer,
+                build_mom_bloom_filter_producers=self._build_mom_bloom_filter_producers,
                 base_data_by_session_id=self._base_data_by_session_id,
                 base_data_by_session_id_lock=self._base_data_by_session_id_lock,
                 all_base_data_received=self._all_base_data_received,
                 all_base_data_received_lock=self._all_base_data_received_lock,
+                join_key=self._join_key(),
+                base_data_columns=self._base_data_columns_to_keep(),
+                transform_function=self._transform_function,
+                dimension_cache=self._dimension_cache,
+                on_all_base_data_received=self._on_all_base_data_received,
                 is_stopped=self.is_stopped,
             )
             self._base_data_handler.run()
@@ -145,7 +188,9 @@ class Joiner(Controller):
                 all_base_data_received=self._all_base_data_received,
                 all_base_data_received_lock=self._all_base_data_received_lock,
                 join_key=self._join_key(),
+                base_data_columns=self._base_data_columns_to_keep(),
                 transform_function=self._transform_function,
+                dimension_cache=self._dimension_cache,
                 is_stopped=self.is_stopped,
             )
             self._stream_data_handler.run()
@@ -173,6 +218,19 @@ class Joiner(Controller):
         self._stream_data_thread.join()
         logging.info(f"action: {self._stream_data_thread.name}_join | result: success")
 
+        self._log_lock_contention_counters()
+
         with self._uncaught_exception_lock:
             if self._uncaught_exception is not None:
                 raise self._uncaught_exception
+
+    # ============================== PUBLIC ============================== #
+
+    def lock_contention_counters(self) -> dict[str, dict[str, float]]:
+        return {
+            lock.name(): lock.contention_counters()
+            for lock in [
+                self._base_data_by_session_id_lock,
+                self._all_base_data_received_lock,
+            ]
+        }
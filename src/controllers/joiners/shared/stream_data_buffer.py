@@ -0,0 +1,87 @@
+import logging
+import tempfile
+from typing import IO, Iterator
+
+# bytes used to write the length of each message in the segment log
+SEGMENT_LOG_LENGTH_BYTES = 4
+
+
+class StreamDataBuffer:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, max_bytes_in_memory: int) -> None:
+        self._max_bytes_in_memory = max_bytes_in_memory
+        self._bytes_in_memory = 0
+
+        self._messages_by_session_id: dict[str, list[str]] = {}
+        self._segment_log_by_session_id: dict[str, IO[bytes]] = {}
+
+    # ============================== PRIVATE - SEGMENT LOG ============================== #
+
+    def _open_segment_log_for(self, session_id: str) -> IO[bytes]:
+        segment_log = tempfile.TemporaryFile()
+        self._segment_log_by_session_id[session_id] = segment_log
+        logging.info(
+            f"action: stream_data_buffer_spill | result: success | session_id: {session_id} | bytes_in_memory: {self._bytes_in_memory}"
+        )
+        return segment_log
+
+    def _append_to_segment_log(self, segment_log: IO[bytes], message: str) -> None:
+        encoded_message = message.encode("utf-8")
+        segment_log.write(
+            len(encoded_message).to_bytes(SEGMENT_LOG_LENGTH_BYTES, byteorder="big")
+        )
+        segment_log.write(encoded_message)
+
+    def _replay_segment_log(self, segment_log: IO[bytes]) -> Iterator[str]:
+        with segment_log:
+            segment_log.seek(0)
+            while True:
+                length = segment_log.read(SEGMENT_LOG_LENGTH_BYTES)
+                if len(length) < SEGMENT_LOG_LENGTH_BYTES:
+                    return
+                message_size = int.from_bytes(length, byteorder="big")
+                yield segment_log.read(message_size).decode("utf-8")
+
+    # ============================== PUBLIC ============================== #
+
+    def append(self, session_id: str, message: str) -> None:
+        segment_log = self._segment_log_by_session_id.get(session_id)
+        if (
+            segment_log is None
+            and self._bytes_in_memory + len(message) > self._max_bytes_in_memory
+        ):
+            segment_log = self._open_segment_log_for(session_id)
+
+        # [IMPORTANT] once a session overflows, all its next messages go to
+        # the segment log too, so they are replayed in the received order
+        if segment_log is not None:
+            self._append_to_segment_log(segment_log, message)
+            return
+
+        self._messages_by_session_id.setdefault(session_id, []).append(message)
+        self._bytes_in_memory += len(message)
+
+    def take_all(self, session_id: str) -> Iterator[str]:
+        messages = self._messages_by_session_id.pop(session_id, [])
+        segment_log = self._segment_log_by_session_id.pop(session_id, None)
+
+        for message in messages:
+            self._bytes_in_memory -= len(message)
+            yield message
+
+        if segment_log is not None:
+            yield from self._replay_segment_log(segment_log)
+
+    def discard(self, session_id: str) -> None:
+        for message in self._messages_by_session_id.pop(session_id, []):
+            self._bytes_in_memory -= len(message)
+
+        segment_log = self._segment_log_by_session_id.pop(session_id, None)
+        if segment_log is not None:
+            segment_log.close()
+
+    def close(self) -> None:
+        for session_id in list(self._segment_log_by_session_id):
+            self.discard(session_id)
@@ -1,7 +1,9 @@
 import logging
 import threading
-from typing import Any, Callable, Union
+from typing import Any, Callable, Optional, Union
 
+from controllers.joiners.shared.dimension_cache import DimensionCache
+from controllers.joiners.shared.stream_data_buffer import StreamDataBuffer
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
@@ -20,6 +22,7 @@ class StreamDataHandler:
         consumers_config: dict[str, Any],
     ) -> None:
         self._eof_recv_from_prev_controllers: dict[str, int] = {}
+        self._pending_eof_by_session_id: dict[str, str] = {}
         self._prev_controllers_amount = consumers_config[
             "stream_data_prev_controllers_amount"
         ]
@@ -51,12 +54,14 @@ class StreamDataHandler:
         producers_config: dict[str, Any],
         build_mom_consumer: Callable,
         build_mom_producer: Callable,
-        base_data_by_session_id: dict[str, list[dict[str, Any]]],
+        base_data_by_session_id: dict[str, dict[Any, tuple[str, ...]]],
         base_data_by_session_id_lock: Any,
         all_base_data_received: dict[str, bool],
         all_base_data_received_lock: Any,
         join_key: str,
+        base_data_columns: list[str],
         transform_function: Callable,
+        dimension_cache: Optional[DimensionCache],
         is_stopped: threading.Event,
     ) -> None:
         self._controller_id = controller_id
@@ -68,9 +73,12 @@ class StreamDataHandler:
         self._init_mom_producers(rabbitmq_host, producers_config)
 
         self._join_key = join_key
+        self._base_data_columns = base_data_columns
         self._transform_function = transform_function
 
-        self._stream_data_buffer_by_session_id: dict[str, list[str]] = {}
+        self._stream_data_buffer = StreamDataBuffer(
+            consumers_config["stream_data_buffer_max_bytes"]
+        )
 
         self._base_data_by_session_id = base_data_by_session_id
         self._base_data_by_session_id_lock = base_data_by_session_id_lock
@@ -78,6 +86,8 @@ class StreamDataHandler:
         self._all_base_data_received = all_base_data_received
         self._all_base_data_received_lock = all_base_data_received_lock
 
+        self._dimension_cache = dimension_cache
+
         self.is_stopped = is_stopped
 
     # ============================== PRIVATE - LOGGING ============================== #
@@ -106,35 +116,34 @@ class StreamDataHandler:
 
     # ============================== PRIVATE - JOIN ============================== #
 
-    def _should_be_joined(
-        self, base_item: dict[str, str], stream_item: dict[str, str]
-    ) -> bool:
-        base_optional_value = base_item.get(self._join_key)
+    def _find_base_values_for(
+        self,
+        base_data_index: dict[Any, tuple[str, ...]],
+        stream_item: dict[str, str],
+    ) -> Optional[tuple[str, ...]]:
         stream_optional_value = stream_item.get(self._join_key)
-        if base_optional_value is None or stream_optional_value is None:
-            return False
+        if stream_optional_value is None or stream_optional_value == "":
+            return None
 
-        base_value = self._transform_function(base_optional_value)
         stream_value = self._transform_function(stream_optional_value)
-        return base_value == stream_value  # type: ignore
+        return base_data_index.get(stream_value)
 
     def _join_with_base_data(self, message: str) -> str:
         message_type = communication_protocol.get_message_type(message)
         session_id = communication_protocol.get_message_session_id(message)
         stream_data = communication_protocol.decode_batch_message(message)
+        base_data_index = self._base_data_by_session_id.get(session_id, {})
         joined_data: list[dict[str, str]] = []
         for stream_item in stream_data:
-            was_joined = False
-            for base_item in self._base_data_by_session_id[session_id]:
-                if self._should_be_joined(base_item, stream_item):
-                    joined_item = {**stream_item, **base_item}
-                    joined_data.append(joined_item)
-                    was_joined = True
-                    break
-            if not was_joined:
+            base_values = self._find_base_values_for(base_data_index, stream_item)
+            if base_values is None:
                 self._log_warning(
                     f"action: join_with_base_data | result: error | stream_item: {stream_item}"
                 )
+                continue
+            for column, value in zip(self._base_data_columns, base_values):
+                stream_item[column] = value
+            joined_data.append(stream_item)
         return communication_protocol.encode_batch_message(
             message_type, session_id, joined_data
         )
@@ -153,21 +162,22 @@ class StreamDataHandler:
         self._log_info(
             f"action: handle_all_buffered_messages | result: success | session_id: {session_id}"
         )
-        messages = self._stream_data_buffer_by_session_id.get(session_id, [])
-        for message in messages:
-            joined_message = self._join_with_base_data(message)
-            if not communication_protocol.message_without_payload(joined_message):
-                self._mom_send_message_to_next(joined_message)
-        self._stream_data_buffer_by_session_id[session_id] = []
+        for message in self._stream_data_buffer.take_all(session_id):
+            self._join_and_send_to_next(message)
+
+    def _join_and_send_to_next(self, message: str) -> None:
+        joined_message = self._join_with_base_data(message)
+        if not communication_protocol.message_without_payload(joined_message):
+            self._mom_send_message_to_next(joined_message)
 
     def _handle_batch_message_when_all_base_data_received(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
         with self._all_base_data_received_lock:
-            self._stream_data_buffer_by_session_id.setdefault(session_id, [])
-            self._stream_data_buffer_by_session_id[session_id].append(message)
             if self._all_base_data_received.get(session_id, False):
                 self._handle_all_buffered_messages(session_id)
+                self._join_and_send_to_next(message)
             else:
+                self._stream_data_buffer.append(session_id, message)
                 self._log_debug(
                     f"action: stream_data_received_before_base_data | result: success | session_id: {session_id}"
                 )
@@ -178,14 +188,16 @@ class StreamDataHandler:
         )
 
         del self._eof_recv_from_prev_controllers[session_id]
+        self._pending_eof_by_session_id.pop(session_id, None)
 
-        if session_id in self._stream_data_buffer_by_session_id:
-            del self._stream_data_buffer_by_session_id[session_id]
+        self._stream_data_buffer.discard(session_id)
 
         with self._all_base_data_received_lock:
             del self._all_base_data_received[session_id]
         with self._base_data_by_session_id_lock:
             del self._base_data_by_session_id[session_id]
+        if self._dimension_cache is not None:
+            self._dimension_cache.release(session_id)
 
         logging.info(
             f"action: clean_session_data | result: success | session_id: {session_id}"
@@ -209,24 +221,38 @@ class StreamDataHandler:
                 )
 
             if all_base_data_received:
-                self._log_info(
-                    f"action: all_eofs_received | result: success | session_id: {session_id}"
-                )
-                self._handle_all_buffered_messages(session_id)
-
-                for mom_producer in self._mom_producers:
-                    mom_producer.send(message)
-                self._log_info(
-                    f"action: eof_sent | result: success | session_id: {session_id}"
-                )
-
-                self._clean_session_data_of(session_id)
+                self._handle_all_eofs_received(session_id, message)
             else:
+                # [IMPORTANT] the EOF is released by the base data handler
+                # through release_pending_eof_of once all base data is received
                 self._log_debug(
                     f"action: all_eofs_received_before_base_data | result: success | session_id: {session_id}"
                 )
-                self._eof_recv_from_prev_controllers[session_id] -= 1
-                self._mom_consumer.send(message)
+                self._pending_eof_by_session_id[session_id] = message
+
+    def _handle_all_eofs_received(self, session_id: str, message: str) -> None:
+        self._log_info(
+            f"action: all_eofs_received | result: success | session_id: {session_id}"
+        )
+        self._handle_all_buffered_messages(session_id)
+
+        for mom_producer in self._mom_producers:
+            mom_producer.send(message)
+        self._log_info(
+            f"action: eof_sent | result: success | session_id: {session_id}"
+        )
+
+        self._clean_session_data_of(session_id)
+
+    def _release_pending_eof_of(self, session_id: str) -> None:
+        message = self._pending_eof_by_session_id.pop(session_id, None)
+        if message is None:
+            return
+
+        self._log_debug(
+            f"action: pending_eof_released | result: success | session_id: {session_id}"
+        )
+        self._handle_all_eofs_received(session_id, message)
 
     def _handle_stream_data(self, message_as_bytes: bytes) -> None:
         if not self._is_running():
@@ -256,6 +282,8 @@ class StreamDataHandler:
         self._mom_consumer.close()
         self._log_info(f"action: mom_consumer_close | result: success")
 
+        self._stream_data_buffer.close()
+
     def _ensure_connections_close_after_doing(self, callback: Callable) -> None:
         try:
             callback()
@@ -268,6 +296,13 @@ class StreamDataHandler:
 
     # ============================== PUBLIC ============================== #
 
+    def release_pending_eof_of(self, session_id: str) -> None:
+        # [IMPORTANT] it is called from the base data thread, so the EOF
+        # is handled in the stream data thread through the consumer connection
+        self._mom_consumer.schedule_callback(
+            lambda: self._release_pending_eof_of(session_id)
+        )
+
     def run(self) -> None:
         self._log_info(f"action: handler_startup | result: success")
 
@@ -42,6 +42,13 @@ class TransactionItemsWithMenuItemsJoiner(Joiner):
         queue_name = f"{queue_name_prefix}-{producer_id}"
         return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
 
+    def _build_mom_bloom_filter_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> list[MessageMiddleware]:
+        return []
+
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _join_key(self) -> str:
@@ -49,3 +56,9 @@ class TransactionItemsWithMenuItemsJoiner(Joiner):
 
     def _transform_function(self, value: str) -> Any:
         return int(float(value))
+
+    def _base_data_columns_to_keep(self) -> list[str]:
+        return ["item_name"]
+
+    def _cache_base_data_across_sessions(self) -> bool:
+        return True
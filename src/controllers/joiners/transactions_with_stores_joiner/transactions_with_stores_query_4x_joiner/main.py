@@ -14,6 +14,7 @@ def main():
             "RABBITMQ_HOST",
             "BASE_DATA_PREV_CONTROLLERS_AMOUNT",
             "STREAM_DATA_PREV_CONTROLLERS_AMOUNT",
+            "STREAM_DATA_BUFFER_MAX_BYTES",
             "NEXT_CONTROLLERS_AMOUNT",
         ]
     )
@@ -30,6 +31,9 @@ def main():
         "stream_data_prev_controllers_amount": int(
             config_params["STREAM_DATA_PREV_CONTROLLERS_AMOUNT"]
         ),
+        "stream_data_buffer_max_bytes": int(
+            config_params["STREAM_DATA_BUFFER_MAX_BYTES"]
+        ),
     }
     producers_config = {
         "queue_name_prefix": constants.SORTED_DESC_BY_STORE_NAME__PURCHASES_QTY_WITH_USER_BITHDATE,
@@ -14,7 +14,10 @@ def main():
             "RABBITMQ_HOST",
             "BASE_DATA_PREV_CONTROLLERS_AMOUNT",
             "STREAM_DATA_PREV_CONTROLLERS_AMOUNT",
+            "STREAM_DATA_BUFFER_MAX_BYTES",
             "NEXT_CONTROLLERS_AMOUNT",
+            "BLOOM_FILTER_NEXT_CONTROLLERS_AMOUNT",
+            "BLOOM_FILTER_FALSE_POSITIVE_RATE",
         ]
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
@@ -29,10 +32,21 @@ def main():
         "stream_data_prev_controllers_amount": int(
             config_params["STREAM_DATA_PREV_CONTROLLERS_AMOUNT"]
         ),
+        "stream_data_buffer_max_bytes": int(
+            config_params["STREAM_DATA_BUFFER_MAX_BYTES"]
+        ),
     }
     producers_config = {
         "queue_name_prefix": constants.SORTED_DESC_BY_STORE_ID__PURCHASES_QTY_WITH_USER_BITHDATE,
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
+        "bloom_filter_exchange_name_prefix": constants.FILTERED_TRN_BY_YEAR_EXCHANGE_PREFIX,
+        "bloom_filter_routing_key_prefix": constants.USR_BLOOM_FILTER_ROUTING_KEY_PREFIX,
+        "bloom_filter_next_controllers_amount": int(
+            config_params["BLOOM_FILTER_NEXT_CONTROLLERS_AMOUNT"]
+        ),
+        "bloom_filter_false_positive_rate": float(
+            config_params["BLOOM_FILTER_FALSE_POSITIVE_RATE"]
+        ),
     }
 
     controller = TransactionsWithUsersJoiner(
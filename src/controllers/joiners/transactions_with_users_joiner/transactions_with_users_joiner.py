@@ -2,6 +2,9 @@ from typing import Any
 
 from controllers.joiners.shared.joiner import Joiner
 from middleware.middleware import MessageMiddleware
+from middleware.rabbitmq_message_middleware_exchange import (
+    RabbitMQMessageMiddlewareExchange,
+)
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
 
 
@@ -35,6 +38,29 @@ class TransactionsWithUsersJoiner(Joiner):
         queue_name = f"{queue_name_prefix}-{producer_id}"
         return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
 
+    def _build_mom_bloom_filter_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> list[MessageMiddleware]:
+        # [IMPORTANT] the filter is broadcast to every purchases reducer,
+        # so they can drop the users that will never be joined
+        exchange_name = producers_config["bloom_filter_exchange_name_prefix"]
+        routing_key_prefix = producers_config["bloom_filter_routing_key_prefix"]
+        routing_keys = [
+            f"{routing_key_prefix}.{reducer_id}"
+            for reducer_id in range(
+                producers_config["bloom_filter_next_controllers_amount"]
+            )
+        ]
+        return [
+            RabbitMQMessageMiddlewareExchange(
+                host=rabbitmq_host,
+                exchange_name=exchange_name,
+                route_keys=routing_keys,
+            )
+        ]
+
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _join_key(self) -> str:
@@ -42,3 +68,9 @@ class TransactionsWithUsersJoiner(Joiner):
 
     def _transform_function(self, value: str) -> Any:
         return int(float(value))
+
+    def _base_data_columns_to_keep(self) -> list[str]:
+        return ["birthdate"]
+
+    def _cache_base_data_across_sessions(self) -> bool:
+        return False
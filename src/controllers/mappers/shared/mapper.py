@@ -1,7 +1,8 @@
 import logging
 from abc import abstractmethod
-from typing import Any, Callable
+from typing import Any, Optional
 
+from controllers.shared.combiner import Combiner
 from controllers.shared.controller import Controller
 from middleware.middleware import MessageMiddleware
 from shared import communication_protocol
@@ -54,6 +55,46 @@ class Mapper(Controller):
             )
             self._mom_producers.append(mom_producer)
 
+    def _init_combiner(self, combiner_config: dict[str, Any]) -> None:
+        self._combiner: Optional[Combiner] = None
+        if not combiner_config["enabled"]:
+            return
+
+        self._combiner = Combiner(
+            keys=self._combiner_keys(),
+            accumulated_columns=self._combiner_accumulated_columns(),
+            max_keys=combiner_config["max_keys"],
+            max_age_seconds=combiner_config["max_age_seconds"],
+        )
+        logging.info("action: init_combiner | result: success")
+
+    def __init__(
+        self,
+        controller_id: int,
+        rabbitmq_host: str,
+        consumers_config: dict[str, Any],
+        producers_config: dict[str, Any],
+        combiner_config: dict[str, Any],
+    ) -> None:
+        super().__init__(
+            controller_id,
+            rabbitmq_host,
+            consumers_config,
+            producers_config,
+        )
+
+        self._init_combiner(combiner_config)
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    @abstractmethod
+    def _combiner_keys(self) -> list[str]:
+        raise NotImplementedError("subclass responsibility")
+
+    @abstractmethod
+    def _combiner_accumulated_columns(self) -> list[str]:
+        raise NotImplementedError("subclass responsibility")
+
     # ============================== PRIVATE - SIGNAL HANDLER ============================== #
 
     def _stop(self) -> None:
@@ -66,39 +107,46 @@ class Mapper(Controller):
     def _transform_batch_item(self, batch_item: dict[str, str]) -> dict[str, str]:
         raise NotImplementedError("subclass responsibility")
 
-    def _transform_batch_message_using(
-        self,
-        message: str,
-        decoder: Callable,
-        encoder: Callable,
-        message_type: str,
-        session_id: str,
-    ) -> str:
+    def _transform_batch(self, batch: list[dict[str, str]]) -> list[dict[str, str]]:
         new_batch = []
-        for item in decoder(message):
+        for item in batch:
             modified_item = self._transform_batch_item(item)
             new_batch.append(modified_item)
-        return str(encoder(message_type, session_id, new_batch))
-
-    def _transform_batch_message(self, message: str) -> str:
-        return self._transform_batch_message_using(
-            message,
-            communication_protocol.decode_batch_message,
-            communication_protocol.encode_batch_message,
-            communication_protocol.get_message_type(message),
-            communication_protocol.get_message_session_id(message),
-        )
+        return new_batch
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     @abstractmethod
-    def _mom_send_message_to_next(self, message: str) -> None:
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
         raise NotImplementedError("subclass responsibility")
 
     def _handle_data_batch_message(self, message: str) -> None:
-        output_message = self._transform_batch_message(message)
-        if not communication_protocol.message_without_payload(output_message):
-            self._mom_send_message_to_next(output_message)
+        message_type = communication_protocol.get_message_type(message)
+        session_id = communication_protocol.get_message_session_id(message)
+        batch = communication_protocol.decode_batch_message(message)
+
+        output_batch = self._transform_batch(batch)
+        if self._combiner is not None:
+            self._combiner.combine(session_id, output_batch)
+            for session_id_to_flush in self._combiner.sessions_to_flush():
+                self._flush_combined_data_of(message_type, session_id_to_flush)
+            return
+
+        if len(output_batch) != 0:
+            self._mom_send_batch_to_next(message_type, session_id, output_batch)
+
+    def _flush_combined_data_of(self, message_type: str, session_id: str) -> None:
+        if self._combiner is None:
+            return
+
+        combined_batch = self._combiner.take_combined_batch(session_id)
+        if len(combined_batch) != 0:
+            self._mom_send_batch_to_next(message_type, session_id, combined_batch)
+        logging.debug(
+            f"action: combined_data_flush | result: success | session_id: {session_id} | batch_size: {len(combined_batch)}"
+        )
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
@@ -127,6 +175,10 @@ class Mapper(Controller):
                 f"action: all_eofs_received | result: success | session_id: {session_id}"
             )
 
+            self._flush_combined_data_of(
+                communication_protocol.decode_eof_message(message), session_id
+            )
+
             for mom_producer in self._mom_producers:
                 mom_producer.send(message)
             logging.info(
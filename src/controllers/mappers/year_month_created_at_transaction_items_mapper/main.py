@@ -14,6 +14,9 @@ def main():
             "RABBITMQ_HOST",
             "PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
+            "COMBINER_ENABLED",
+            "COMBINER_MAX_KEYS",
+            "COMBINER_MAX_AGE_SECONDS",
         ]
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
@@ -28,12 +31,18 @@ def main():
         "routing_key_prefix": constants.MAPPED_YEAR_MONTH_TIT_ROUTING_KEY_PREFIX,
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
     }
+    combiner_config = {
+        "enabled": config_params["COMBINER_ENABLED"].lower() == "true",
+        "max_keys": int(config_params["COMBINER_MAX_KEYS"]),
+        "max_age_seconds": float(config_params["COMBINER_MAX_AGE_SECONDS"]),
+    }
 
     controller = YearMonthCreatedAtTransactionItemsMapper(
         controller_id=int(config_params["CONTROLLER_ID"]),
         rabbitmq_host=config_params["RABBITMQ_HOST"],
         consumers_config=consumers_config,
         producers_config=producers_config,
+        combiner_config=combiner_config,
     )
     controller.run()
 
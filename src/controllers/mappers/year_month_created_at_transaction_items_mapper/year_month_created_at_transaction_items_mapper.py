@@ -1,6 +1,8 @@
 from typing import Any
 
 from controllers.mappers.shared.mapper import Mapper
+from controllers.shared import shard_router
+from controllers.shared.shard_router import ShardRouter
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
@@ -36,6 +38,29 @@ class YearMonthCreatedAtTransactionItemsMapper(Mapper):
             route_keys=[routing_key],
         )
 
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
+        # [IMPORTANT] this must consider the next controller's grouping key
+        self._shard_router = ShardRouter(
+            sharding_key="item_id",
+            shards_amount=len(self._mom_producers),
+            shard_hash=shard_router.numeric_shard_hash,
+            empty_key_policy=shard_router.EMPTY_KEY_TO_FIRST_SHARD,
+        )
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _combiner_keys(self) -> list[str]:
+        # [IMPORTANT] this must consider the next controller's grouping keys
+        return ["item_id", "year_month_created_at"]
+
+    def _combiner_accumulated_columns(self) -> list[str]:
+        return ["quantity", "subtotal"]
+
     # ============================== PRIVATE - TRANSFORM DATA ============================== #
 
     def _transform_batch_item(self, batch_item: dict[str, str]) -> dict[str, str]:
@@ -47,31 +72,11 @@ class YearMonthCreatedAtTransactionItemsMapper(Mapper):
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "item_id"
-
-        message_type = communication_protocol.get_message_type(message)
-        session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                # [IMPORTANT] If sharding value is empty, the hash will fail
-                # but we are going to assign it to the first reducer anyway
-                hash = 0
-                batchs_by_hash.setdefault(hash, [])
-                batchs_by_hash[hash].append(batch_item)
-                continue
-            sharding_value = int(float(batch_item[sharding_key]))
-            batch_item[sharding_key] = str(sharding_value)
-
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
-
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        for shard, shard_batch in self._shard_router.bucket_batch(batch).items():
             message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
+                message_type, session_id, shard_batch
             )
-            mom_producer.send(message)
+            self._mom_producers[shard].send(message)
@@ -2,6 +2,9 @@ import logging
 from abc import abstractmethod
 from typing import Any, Callable
 
+from controllers.output_builders.shared.session_producer_cache import (
+    SessionProducerCache,
+)
 from controllers.shared.controller import Controller
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
 from shared import communication_protocol
@@ -33,7 +36,18 @@ class QueryOutputBuilder(Controller):
         self._rabbitmq_host = rabbitmq_host
         self._queue_name_prefix = producers_config["queue_name_prefix"]
 
-        self._mom_producers: dict[str, RabbitMQMessageMiddlewareQueue] = {}
+        self._mom_producers = SessionProducerCache(
+            build_producer=self._build_mom_producer,
+            idle_timeout_seconds=self._mom_producer_idle_timeout_seconds(),
+        )
+
+    def _build_mom_producer(self, session_id: str) -> RabbitMQMessageMiddlewareQueue:
+        return RabbitMQMessageMiddlewareQueue(
+            self._rabbitmq_host, f"{self._queue_name_prefix}-{session_id}"
+        )
+
+    def _mom_producer_idle_timeout_seconds(self) -> float:
+        return 300.0
 
     # ============================== PRIVATE - INTERFACE ============================== #
 
@@ -87,13 +101,7 @@ class QueryOutputBuilder(Controller):
     def _handle_data_batch_message(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
         output_message = self._transform_batch_message(message)
-        self._mom_producers.setdefault(
-            session_id,
-            RabbitMQMessageMiddlewareQueue(
-                self._rabbitmq_host, f"{self._queue_name_prefix}-{session_id}"
-            ),
-        )
-        self._mom_producers[session_id].send(output_message)
+        self._mom_producers.producer_for(session_id).send(output_message)
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
@@ -102,10 +110,7 @@ class QueryOutputBuilder(Controller):
 
         del self._eof_recv_from_prev_controllers[session_id]
 
-        mom_producer = self._mom_producers.pop(session_id, None)
-        if mom_producer:
-            mom_producer.close()
-            logging.debug("action: mom_producer_close | result: success")
+        self._mom_producers.evict(session_id)
 
         logging.info(
             f"action: clean_session_data | result: success | session_id: {session_id}"
@@ -130,13 +135,7 @@ class QueryOutputBuilder(Controller):
             message = communication_protocol.encode_eof_message(
                 session_id, self._output_message_type()
             )
-            self._mom_producers.setdefault(
-                session_id,
-                RabbitMQMessageMiddlewareQueue(
-                    self._rabbitmq_host, f"{self._queue_name_prefix}-{session_id}"
-                ),
-            )
-            self._mom_producers[session_id].send(message)
+            self._mom_producers.producer_for(session_id).send(message)
             logging.info(
                 f"action: eof_sent | result: success | session_id: {session_id}"
             )
@@ -165,9 +164,7 @@ class QueryOutputBuilder(Controller):
         self._mom_consumer.start_consuming(self._handle_received_data)
 
     def _close_all(self) -> None:
-        for mom_producer in self._mom_producers.values():
-            mom_producer.close()
-            logging.debug("action: mom_producer_close | result: success")
+        self._mom_producers.close_all()
 
         self._mom_consumer.delete()
         self._mom_consumer.close()
@@ -0,0 +1,78 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from middleware.middleware import MessageMiddleware
+
+
+class SessionProducerCache:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        build_producer: Callable[[str], MessageMiddleware],
+        idle_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._build_producer = build_producer
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._clock = clock
+
+        # [IMPORTANT] ordered from the least to the most recently used session,
+        # so idle producers are always at the beginning
+        self._producers_by_session_id: OrderedDict[
+            str, tuple[MessageMiddleware, float]
+        ] = OrderedDict()
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _close_producer(self, session_id: str, producer: MessageMiddleware) -> None:
+        producer.close()
+        logging.debug(
+            f"action: mom_producer_close | result: success | session_id: {session_id}"
+        )
+
+    def _evict_idle_producers(self, now: float) -> None:
+        while len(self._producers_by_session_id) > 0:
+            session_id, (producer, last_used_at) = next(
+                iter(self._producers_by_session_id.items())
+            )
+            if now - last_used_at < self._idle_timeout_seconds:
+                return
+
+            del self._producers_by_session_id[session_id]
+            self._close_producer(session_id, producer)
+            logging.info(
+                f"action: evict_idle_mom_producer | result: success | session_id: {session_id}"
+            )
+
+    # ============================== PUBLIC ============================== #
+
+    def producer_for(self, session_id: str) -> MessageMiddleware:
+        now = self._clock()
+
+        cached_entry = self._producers_by_session_id.pop(session_id, None)
+        self._evict_idle_producers(now)
+
+        if cached_entry is None:
+            producer = self._build_producer(session_id)
+            logging.debug(
+                f"action: mom_producer_create | result: success | session_id: {session_id}"
+            )
+        else:
+            producer, _ = cached_entry
+
+        self._producers_by_session_id[session_id] = (producer, now)
+        return producer
+
+    def evict(self, session_id: str) -> None:
+        cached_entry = self._producers_by_session_id.pop(session_id, None)
+        if cached_entry is not None:
+            producer, _ = cached_entry
+            self._close_producer(session_id, producer)
+
+    def close_all(self) -> None:
+        for session_id in list(self._producers_by_session_id.keys()):
+            self.evict(session_id)
@@ -13,8 +13,10 @@ def main():
             "CONTROLLER_ID",
             "RABBITMQ_HOST",
             "PREV_CONTROLLERS_AMOUNT",
+            "BLOOM_FILTER_PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
             "BATCH_MAX_SIZE",
+            "STATE_SPILL_THRESHOLD",
         ]
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
@@ -24,6 +26,10 @@ def main():
         "exchange_name_prefix": constants.FILTERED_TRN_BY_YEAR_EXCHANGE_PREFIX,
         "routing_key_prefix": constants.FILTERED_TRN_BY_YEAR_ROUTING_KEY_PREFIX,
         "prev_controllers_amount": int(config_params["PREV_CONTROLLERS_AMOUNT"]),
+        "bloom_filter_routing_key_prefix": constants.USR_BLOOM_FILTER_ROUTING_KEY_PREFIX,
+        "bloom_filter_prev_controllers_amount": int(
+            config_params["BLOOM_FILTER_PREV_CONTROLLERS_AMOUNT"]
+        ),
     }
     producers_config = {
         "queue_name_prefix": constants.PURCHASES_QTY_BY_USR_ID__STORE_ID_QUEUE_PREFIX,
@@ -36,6 +42,7 @@ def main():
         consumers_config=consumers_config,
         producers_config=producers_config,
         batch_max_size=int(config_params["BATCH_MAX_SIZE"]),
+        state_spill_threshold=int(config_params["STATE_SPILL_THRESHOLD"]),
     )
     controller.run()
 
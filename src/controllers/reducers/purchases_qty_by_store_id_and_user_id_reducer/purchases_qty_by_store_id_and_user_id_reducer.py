@@ -1,12 +1,17 @@
+import logging
 from typing import Any
 
+from controllers.reducers.shared.accumulators import Accumulator, CountAccumulator
 from controllers.reducers.shared.reducer import Reducer
+from controllers.shared import shard_router
+from controllers.shared.shard_router import ShardRouter
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_exchange import (
     RabbitMQMessageMiddlewareExchange,
 )
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
 from shared import communication_protocol
+from shared.bloom_filter import BloomFilter
 
 
 class PurchasesQtyByStoreIdAndUserIdReducer(Reducer):
@@ -20,12 +25,27 @@ class PurchasesQtyByStoreIdAndUserIdReducer(Reducer):
     ) -> MessageMiddleware:
         exchange_name = consumers_config["exchange_name_prefix"]
         routing_key = f"{consumers_config["routing_key_prefix"]}.{self._controller_id}"
+        bloom_filter_routing_key = f"{consumers_config["bloom_filter_routing_key_prefix"]}.{self._controller_id}"
         return RabbitMQMessageMiddlewareExchange(
             host=rabbitmq_host,
             exchange_name=exchange_name,
-            route_keys=[routing_key],
+            route_keys=[routing_key, bloom_filter_routing_key],
         )
 
+    def _init_mom_consumers(
+        self,
+        rabbitmq_host: str,
+        consumers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_consumers(rabbitmq_host, consumers_config)
+        # [IMPORTANT] each users joiner sends the bloom filter of its users,
+        # the session is flushed once all of them and all the EOFs arrived
+        self._bloom_filter_prev_controllers_amount: int = consumers_config[
+            "bloom_filter_prev_controllers_amount"
+        ]
+        self._bloom_filters_by_session_id: dict[str, list[BloomFilter]] = {}
+        self._pending_eof_by_session_id: dict[str, str] = {}
+
     def _build_mom_producer_using(
         self,
         rabbitmq_host: str,
@@ -36,51 +56,93 @@ class PurchasesQtyByStoreIdAndUserIdReducer(Reducer):
         queue_name = f"{queue_name_prefix}-{producer_id}"
         return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
 
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        super()._init_mom_producers(rabbitmq_host, producers_config)
+        # [IMPORTANT] this must consider the next controller's grouping key
+        self._shard_router = ShardRouter(
+            sharding_key="store_id",
+            shards_amount=len(self._mom_producers),
+            shard_hash=shard_router.numeric_shard_hash,
+            empty_key_policy=shard_router.EMPTY_KEY_TO_FIRST_SHARD,
+        )
+
     # ============================== PRIVATE - ACCESSING ============================== #
 
     def _keys(self) -> list[str]:
         return ["store_id", "user_id"]
 
-    def _accumulator_name(self) -> str:
-        return "purchases_qty"
+    def _accumulators(self) -> list[Accumulator]:
+        return [CountAccumulator("purchases_qty")]
 
     def _message_type(self) -> str:
         return communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
 
-    # ============================== PRIVATE - HANDLE DATA ============================== #
+    # ============================== PRIVATE - BLOOM FILTERS ============================== #
 
-    def _reduce_function(
-        self, current_value: float, batch_item: dict[str, str]
-    ) -> float:
-        return current_value + 1
+    def _all_bloom_filters_received(self, session_id: str) -> bool:
+        bloom_filters = self._bloom_filters_by_session_id.get(session_id, [])
+        return len(bloom_filters) == self._bloom_filter_prev_controllers_amount
 
-    # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
+    def _might_be_joined(self, session_id: str, batch_item: dict[str, str]) -> bool:
+        user_id = str(int(float(batch_item["user_id"])))
+        return any(
+            bloom_filter.might_contain(user_id)
+            for bloom_filter in self._bloom_filters_by_session_id[session_id]
+        )
 
-    def _mom_send_message_to_next(self, message: str) -> None:
-        batchs_by_hash: dict[int, list] = {}
-        # [IMPORTANT] this must consider the next controller's grouping key
-        sharding_key = "store_id"
+    def _handle_bloom_filter_message(self, message: str) -> None:
+        session_id = communication_protocol.get_message_session_id(message)
+        bits_amount, hashes_amount, bits = (
+            communication_protocol.decode_bloom_filter_message(message)
+        )
+        self._bloom_filters_by_session_id.setdefault(session_id, []).append(
+            BloomFilter(bits_amount, hashes_amount, bits)
+        )
+        logging.info(
+            f"action: bloom_filter_received | result: success | session_id: {session_id}"
+        )
 
+        pending_eof = self._pending_eof_by_session_id.get(session_id)
+        if pending_eof is not None and self._all_bloom_filters_received(session_id):
+            del self._pending_eof_by_session_id[session_id]
+            self._handle_all_eofs_received(session_id, pending_eof)
+
+    # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
+
+    def _handle_data_batch_message(self, message: str) -> None:
         message_type = communication_protocol.get_message_type(message)
-        session_id = communication_protocol.get_message_session_id(message)
-        for batch_item in communication_protocol.decode_batch_message(message):
-            if batch_item[sharding_key] == "":
-                # [IMPORTANT] If sharding value is empty, the hash will fail
-                # but we are going to assign it to the first reducer anyway
-                hash = 0
-                batchs_by_hash.setdefault(hash, [])
-                batchs_by_hash[hash].append(batch_item)
-                continue
-            sharding_value = int(float(batch_item[sharding_key]))
-            batch_item[sharding_key] = str(sharding_value)
-
-            hash = sharding_value % len(self._mom_producers)
-            batchs_by_hash.setdefault(hash, [])
-            batchs_by_hash[hash].append(batch_item)
-
-        for hash, user_batch in batchs_by_hash.items():
-            mom_producer = self._mom_producers[hash]
+        if message_type == communication_protocol.BLOOM_FILTER_MSG_TYPE:
+            self._handle_bloom_filter_message(message)
+            return
+        super()._handle_data_batch_message(message)
+
+    def _handle_all_eofs_received(self, session_id: str, message: str) -> None:
+        if not self._all_bloom_filters_received(session_id):
+            self._pending_eof_by_session_id[session_id] = message
+            logging.info(
+                f"action: waiting_for_bloom_filters | result: in_progress | session_id: {session_id}"
+            )
+            return
+
+        super()._handle_all_eofs_received(session_id, message)
+        del self._bloom_filters_by_session_id[session_id]
+
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        # [IMPORTANT] users without a match in any bloom filter can not be
+        # joined later, so they are dropped before reaching the sorters
+        batch = [
+            batch_item
+            for batch_item in batch
+            if self._might_be_joined(session_id, batch_item)
+        ]
+        for shard, shard_batch in self._shard_router.bucket_batch(batch).items():
             message = communication_protocol.encode_batch_message(
-                message_type, session_id, user_batch
+                message_type, session_id, shard_batch
             )
-            mom_producer.send(message)
+            self._mom_producers[shard].send(message)
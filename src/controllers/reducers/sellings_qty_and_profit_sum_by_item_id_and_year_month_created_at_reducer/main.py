@@ -1,7 +1,7 @@
 import logging
 
-from controllers.reducers.sellings_qty_by_item_id_and_year_month_created_at_reducer.sellings_qty_by_item_id_and_year_month_created_at_reducer import (
-    SellingsQtyByItemIdAndYearMonthCreatedAtReducer,
+from controllers.reducers.sellings_qty_and_profit_sum_by_item_id_and_year_month_created_at_reducer.sellings_qty_and_profit_sum_by_item_id_and_year_month_created_at_reducer import (
+    SellingsQtyAndProfitSumByItemIdAndYearMonthCreatedAtReducer,
 )
 from shared import constants, initializer
 
@@ -15,6 +15,7 @@ def main():
             "PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
             "BATCH_MAX_SIZE",
+            "STATE_SPILL_THRESHOLD",
         ]
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
@@ -26,16 +27,20 @@ def main():
         "prev_controllers_amount": int(config_params["PREV_CONTROLLERS_AMOUNT"]),
     }
     producers_config = {
-        "queue_name_prefix": constants.SELLINGS_QTY_BY_YEAR_MONTH_CREATED_AT__ITEM_ID_QUEUE_PREFIX,
+        "queue_name_prefix_by_accumulator_name": {
+            "sellings_qty": constants.SELLINGS_QTY_BY_YEAR_MONTH_CREATED_AT__ITEM_ID_QUEUE_PREFIX,
+            "profit_sum": constants.PROFIT_SUM_BY_YEAR_MONTH__ITEM_ID_CREATED_AT_QUEUE_PREFIX,
+        },
         "next_controllers_amount": int(config_params["NEXT_CONTROLLERS_AMOUNT"]),
     }
 
-    controller = SellingsQtyByItemIdAndYearMonthCreatedAtReducer(
+    controller = SellingsQtyAndProfitSumByItemIdAndYearMonthCreatedAtReducer(
         controller_id=int(config_params["CONTROLLER_ID"]),
         rabbitmq_host=config_params["RABBITMQ_HOST"],
         consumers_config=consumers_config,
         producers_config=producers_config,
         batch_max_size=int(config_params["BATCH_MAX_SIZE"]),
+        state_spill_threshold=int(config_params["STATE_SPILL_THRESHOLD"]),
     )
     controller.run()
 
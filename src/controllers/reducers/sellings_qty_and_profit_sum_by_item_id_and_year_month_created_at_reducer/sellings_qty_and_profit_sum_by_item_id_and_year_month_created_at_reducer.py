@@ -0,0 +1,112 @@
+from typing import Any
+
+from controllers.reducers.shared.accumulators import Accumulator, SumAccumulator
+from controllers.reducers.shared.reducer import Reducer
+from controllers.shared import shard_router
+from controllers.shared.shard_router import ShardRouter
+from middleware.middleware import MessageMiddleware
+from middleware.rabbitmq_message_middleware_exchange import (
+    RabbitMQMessageMiddlewareExchange,
+)
+from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+from shared import communication_protocol
+
+
+class SellingsQtyAndProfitSumByItemIdAndYearMonthCreatedAtReducer(Reducer):
+
+    # ============================== INITIALIZE ============================== #
+
+    def _build_mom_consumer_using(
+        self,
+        rabbitmq_host: str,
+        consumers_config: dict[str, Any],
+    ) -> MessageMiddleware:
+        exchange_name = consumers_config["exchange_name_prefix"]
+        routing_key = f"{consumers_config["routing_key_prefix"]}.{self._controller_id}"
+        return RabbitMQMessageMiddlewareExchange(
+            host=rabbitmq_host,
+            exchange_name=exchange_name,
+            route_keys=[routing_key],
+        )
+
+    def _build_mom_producer_using(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+        producer_id: int,
+    ) -> MessageMiddleware:
+        queue_name_prefix = producers_config["queue_name_prefix"]
+        queue_name = f"{queue_name_prefix}-{producer_id}"
+        return RabbitMQMessageMiddlewareQueue(host=rabbitmq_host, queue_name=queue_name)
+
+    def _init_mom_producers(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+    ) -> None:
+        self._current_producer_id = 0
+        self._mom_producers: list[MessageMiddleware] = []
+
+        # [IMPORTANT] each accumulator is routed to its own query's sorters,
+        # the EOFs are sent to all of them through self._mom_producers
+        self._mom_producers_by_accumulator_name: dict[str, list[MessageMiddleware]] = {}
+        next_controllers_amount = producers_config["next_controllers_amount"]
+        queue_name_prefixes = producers_config["queue_name_prefix_by_accumulator_name"]
+        for accumulator_name, queue_name_prefix in queue_name_prefixes.items():
+            route_producers_config = {
+                **producers_config,
+                "queue_name_prefix": queue_name_prefix,
+            }
+            mom_producers = [
+                self._build_mom_producer_using(
+                    rabbitmq_host, route_producers_config, producer_id
+                )
+                for producer_id in range(next_controllers_amount)
+            ]
+            self._mom_producers_by_accumulator_name[accumulator_name] = mom_producers
+            self._mom_producers.extend(mom_producers)
+
+        # [IMPORTANT] this must consider the next controller's grouping key
+        self._shard_router = ShardRouter(
+            sharding_key="year_month_created_at",
+            shards_amount=next_controllers_amount,
+            shard_hash=shard_router.string_shard_hash,
+            empty_key_policy=shard_router.EMPTY_KEY_TO_FIRST_SHARD,
+        )
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _keys(self) -> list[str]:
+        return ["item_id", "year_month_created_at"]
+
+    def _accumulators(self) -> list[Accumulator]:
+        return [
+            SumAccumulator("sellings_qty", "quantity"),
+            SumAccumulator("profit_sum", "subtotal"),
+        ]
+
+    def _message_type(self) -> str:
+        return communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE
+
+    # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
+
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        keys = self._keys()
+        for shard, shard_batch in self._shard_router.bucket_batch(batch).items():
+            for (
+                accumulator_name,
+                mom_producers,
+            ) in self._mom_producers_by_accumulator_name.items():
+                projected_batch = [
+                    {
+                        **{k: batch_item[k] for k in keys},
+                        accumulator_name: batch_item[accumulator_name],
+                    }
+                    for batch_item in shard_batch
+                ]
+                message = communication_protocol.encode_batch_message(
+                    message_type, session_id, projected_batch
+                )
+                mom_producers[shard].send(message)
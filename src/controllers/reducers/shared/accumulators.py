@@ -0,0 +1,198 @@
+from abc import ABC, abstractmethod
+from array import array
+
+
+class Accumulator(ABC):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    # ============================== PUBLIC ============================== #
+
+    def name(self) -> str:
+        return self._name
+
+    @abstractmethod
+    def add_slot(self) -> None:
+        raise NotImplementedError("subclass responsibility")
+
+    @abstractmethod
+    def accumulate(self, slot: int, batch_item: dict[str, str]) -> None:
+        raise NotImplementedError("subclass responsibility")
+
+    @abstractmethod
+    def values_between(self, first_slot: int, last_slot: int) -> list[str]:
+        raise NotImplementedError("subclass responsibility")
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError("subclass responsibility")
+
+    # [IMPORTANT] states are used to merge the same group from several
+    # spilled runs, so they must be picklable and merged without loss
+
+    @abstractmethod
+    def state_of(self, slot: int) -> tuple:
+        raise NotImplementedError("subclass responsibility")
+
+    @abstractmethod
+    def merged_states(self, state: tuple, another_state: tuple) -> tuple:
+        raise NotImplementedError("subclass responsibility")
+
+    @abstractmethod
+    def value_of_state(self, state: tuple) -> str:
+        raise NotImplementedError("subclass responsibility")
+
+
+class CountAccumulator(Accumulator):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._counts = array("q")
+
+    # ============================== PUBLIC ============================== #
+
+    def add_slot(self) -> None:
+        self._counts.append(0)
+
+    def accumulate(self, slot: int, batch_item: dict[str, str]) -> None:
+        self._counts[slot] += 1
+
+    def values_between(self, first_slot: int, last_slot: int) -> list[str]:
+        return [str(count) for count in self._counts[first_slot:last_slot]]
+
+    def clear(self) -> None:
+        self._counts = array("q")
+
+    def state_of(self, slot: int) -> tuple:
+        return (self._counts[slot],)
+
+    def merged_states(self, state: tuple, another_state: tuple) -> tuple:
+        return (state[0] + another_state[0],)
+
+    def value_of_state(self, state: tuple) -> str:
+        return str(state[0])
+
+
+class _ColumnAccumulator(Accumulator):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str, column: str, initial_value: float) -> None:
+        super().__init__(name)
+        self._column = column
+        self._initial_value = initial_value
+        self._values = array("d")
+
+    # ============================== PRIVATE - ACCUMULATE ============================== #
+
+    @abstractmethod
+    def _accumulate_value(self, current_value: float, value: float) -> float:
+        raise NotImplementedError("subclass responsibility")
+
+    # ============================== PUBLIC ============================== #
+
+    def add_slot(self) -> None:
+        self._values.append(self._initial_value)
+
+    def accumulate(self, slot: int, batch_item: dict[str, str]) -> None:
+        self._values[slot] = self._accumulate_value(
+            self._values[slot], float(batch_item[self._column])
+        )
+
+    def values_between(self, first_slot: int, last_slot: int) -> list[str]:
+        return [str(value) for value in self._values[first_slot:last_slot]]
+
+    def clear(self) -> None:
+        self._values = array("d")
+
+    def state_of(self, slot: int) -> tuple:
+        return (self._values[slot],)
+
+    def merged_states(self, state: tuple, another_state: tuple) -> tuple:
+        return (self._accumulate_value(state[0], another_state[0]),)
+
+    def value_of_state(self, state: tuple) -> str:
+        return str(state[0])
+
+
+class SumAccumulator(_ColumnAccumulator):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str, column: str) -> None:
+        super().__init__(name, column, 0.0)
+
+    # ============================== PRIVATE - ACCUMULATE ============================== #
+
+    def _accumulate_value(self, current_value: float, value: float) -> float:
+        return current_value + value
+
+
+class MinAccumulator(_ColumnAccumulator):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str, column: str) -> None:
+        super().__init__(name, column, float("inf"))
+
+    # ============================== PRIVATE - ACCUMULATE ============================== #
+
+    def _accumulate_value(self, current_value: float, value: float) -> float:
+        return min(current_value, value)
+
+
+class MaxAccumulator(_ColumnAccumulator):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str, column: str) -> None:
+        super().__init__(name, column, float("-inf"))
+
+    # ============================== PRIVATE - ACCUMULATE ============================== #
+
+    def _accumulate_value(self, current_value: float, value: float) -> float:
+        return max(current_value, value)
+
+
+class AvgAccumulator(Accumulator):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, name: str, column: str) -> None:
+        super().__init__(name)
+        self._column = column
+        self._sums = array("d")
+        self._counts = array("q")
+
+    # ============================== PUBLIC ============================== #
+
+    def add_slot(self) -> None:
+        self._sums.append(0.0)
+        self._counts.append(0)
+
+    def accumulate(self, slot: int, batch_item: dict[str, str]) -> None:
+        self._sums[slot] += float(batch_item[self._column])
+        self._counts[slot] += 1
+
+    def values_between(self, first_slot: int, last_slot: int) -> list[str]:
+        sums = self._sums[first_slot:last_slot]
+        counts = self._counts[first_slot:last_slot]
+        return [str(total / count) for total, count in zip(sums, counts)]
+
+    def clear(self) -> None:
+        self._sums = array("d")
+        self._counts = array("q")
+
+    def state_of(self, slot: int) -> tuple:
+        return (self._sums[slot], self._counts[slot])
+
+    def merged_states(self, state: tuple, another_state: tuple) -> tuple:
+        return (state[0] + another_state[0], state[1] + another_state[1])
+
+    def value_of_state(self, state: tuple) -> str:
+        return str(state[0] / state[1])
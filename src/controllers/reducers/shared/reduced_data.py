@@ -1,16 +1,59 @@
+import heapq
+import itertools
 import logging
-from typing import Callable
+import pickle
+import tempfile
+from array import array
+from operator import itemgetter
+from typing import IO, Iterator, Optional
+
+from controllers.reducers.shared.accumulators import Accumulator
+
+# bits reserved for each key component id inside a composite key
+KEY_COMPONENT_ID_BITS = 32
+
+# groups pickled together when writing a spilled run
+SPILLED_RUN_CHUNK_SIZE = 1000
 
 
 class ReducedData:
-    def __init__(self, keys: list[str], accumulator_name: str):
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        keys: list[str],
+        accumulators: list[Accumulator],
+        spill_threshold: Optional[int] = None,
+    ):
         self._keys = keys
-        self._accumulator_name = accumulator_name
+        self._accumulators = accumulators
+        self._spill_threshold = spill_threshold
 
-        self._reduced_data: dict[tuple, float] = {}
+        self._init_reduced_data()
+
+        self._spilled_runs: list[IO[bytes]] = []
+        self._merged_batch_items: Optional[Iterator[dict[str, str]]] = None
+        self._next_merged_batch_item: Optional[dict[str, str]] = None
 
         self._logging_counter = 0
 
+    def _init_reduced_data(self) -> None:
+        # [IMPORTANT] each key component value is interned to an integer id,
+        # so every group is stored as a row of ids plus its accumulator
+        self._id_by_value: list[dict[str, int]] = [{} for _ in self._keys]
+        self._value_by_id: list[list[str]] = [[] for _ in self._keys]
+
+        self._slot_by_composite_key: dict[int, int] = {}
+        self._key_ids_by_component: list[array] = [array("q") for _ in self._keys]
+        for accumulator in self._accumulators:
+            accumulator.clear()
+
+        self._slots_amount = 0
+        self._next_slot_to_take = 0
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
     def _logging_warning_when_count_reached(self) -> None:
         if self._logging_counter >= 1000:
             logging.warning(
@@ -18,30 +61,192 @@ class ReducedData:
             )
             self._logging_counter = 0
 
-    def reduce_using(
-        self,
-        batch_item: dict[str, str],
-        reduce_function: Callable,
-    ) -> None:
+    def _intern(self, component_index: int, value: str) -> int:
+        id_by_value = self._id_by_value[component_index]
+        value_id = id_by_value.get(value)
+        if value_id is None:
+            value_id = len(self._value_by_id[component_index])
+            id_by_value[value] = value_id
+            self._value_by_id[component_index].append(value)
+        return value_id
+
+    def _slot_for(self, key_ids: list[int]) -> int:
+        composite_key = 0
+        for key_id in key_ids:
+            composite_key = (composite_key << KEY_COMPONENT_ID_BITS) | key_id
+
+        slot = self._slot_by_composite_key.get(composite_key)
+        if slot is None:
+            slot = self._slots_amount
+            self._slots_amount += 1
+            self._slot_by_composite_key[composite_key] = slot
+            for i, key_id in enumerate(key_ids):
+                self._key_ids_by_component[i].append(key_id)
+            for accumulator in self._accumulators:
+                accumulator.add_slot()
+        return slot
+
+    # ============================== PRIVATE - SPILL ============================== #
+
+    def _sorted_in_memory_groups(self) -> list[tuple[tuple, tuple]]:
+        groups = []
+        for slot in range(self._next_slot_to_take, self._slots_amount):
+            key = tuple(
+                value_by_id[key_ids[slot]]
+                for value_by_id, key_ids in zip(
+                    self._value_by_id, self._key_ids_by_component
+                )
+            )
+            states = tuple(
+                accumulator.state_of(slot) for accumulator in self._accumulators
+            )
+            groups.append((key, states))
+        groups.sort(key=itemgetter(0))
+        return groups
+
+    def _spill_in_memory_groups(self) -> None:
+        groups = self._sorted_in_memory_groups()
+
+        spilled_run = tempfile.TemporaryFile()
+        for i in range(0, len(groups), SPILLED_RUN_CHUNK_SIZE):
+            pickle.dump(
+                groups[i : i + SPILLED_RUN_CHUNK_SIZE],
+                spilled_run,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        self._spilled_runs.append(spilled_run)
+        self._init_reduced_data()
+
+        logging.debug(
+            f"action: spill_reduced_data | result: success | groups: {len(groups)} | spilled_runs: {len(self._spilled_runs)}"
+        )
+
+    def _groups_of(self, spilled_run: IO[bytes]) -> Iterator[tuple[tuple, tuple]]:
+        spilled_run.seek(0)
+        while True:
+            try:
+                groups = pickle.load(spilled_run)
+            except EOFError:
+                return
+            yield from groups
+
+    def _batch_item_of(self, key: tuple, states: tuple) -> dict[str, str]:
+        batch_item = dict(zip(self._keys, key))
+        for accumulator, state in zip(self._accumulators, states):
+            batch_item[accumulator.name()] = accumulator.value_of_state(state)
+        return batch_item
+
+    def _merge_spilled_runs(self) -> Iterator[dict[str, str]]:
+        # [IMPORTANT] every run is sorted by key, so the k-way merge yields
+        # the same group from all runs consecutively
+        runs = [self._groups_of(spilled_run) for spilled_run in self._spilled_runs]
+        runs.append(iter(self._sorted_in_memory_groups()))
+        self._init_reduced_data()
+
+        current_key = None
+        current_states: tuple = ()
+        for key, states in heapq.merge(*runs, key=itemgetter(0)):
+            if key == current_key:
+                current_states = tuple(
+                    accumulator.merged_states(current_state, state)
+                    for accumulator, current_state, state in zip(
+                        self._accumulators, current_states, states
+                    )
+                )
+                continue
+
+            if current_key is not None:
+                yield self._batch_item_of(current_key, current_states)
+            current_key, current_states = key, states
+
+        if current_key is not None:
+            yield self._batch_item_of(current_key, current_states)
+
+    def _close_spilled_runs(self) -> None:
+        for spilled_run in self._spilled_runs:
+            spilled_run.close()
+        self._spilled_runs = []
+        self._merged_batch_items = None
+        self._next_merged_batch_item = None
+
+    def _take_next_merged_batch(self, batch_max_size: int) -> list[dict[str, str]]:
+        if self._merged_batch_items is None:
+            self._merged_batch_items = self._merge_spilled_runs()
+            self._next_merged_batch_item = next(self._merged_batch_items, None)
+
+        batch: list[dict[str, str]] = []
+        if self._next_merged_batch_item is not None:
+            batch.append(self._next_merged_batch_item)
+            batch.extend(
+                itertools.islice(self._merged_batch_items, batch_max_size - 1)
+            )
+            self._next_merged_batch_item = next(self._merged_batch_items, None)
+
+        if self._next_merged_batch_item is None:
+            self._close_spilled_runs()
+        return batch
+
+    # ============================== PRIVATE - TAKE ============================== #
+
+    def _take_next_in_memory_batch(self, batch_max_size: int) -> list[dict[str, str]]:
+        first_slot = self._next_slot_to_take
+        last_slot = min(first_slot + batch_max_size, self._slots_amount)
+
+        key_columns = [
+            [value_by_id[key_id] for key_id in key_ids[first_slot:last_slot]]
+            for value_by_id, key_ids in zip(
+                self._value_by_id, self._key_ids_by_component
+            )
+        ]
+        accumulator_columns = [
+            accumulator.values_between(first_slot, last_slot)
+            for accumulator in self._accumulators
+        ]
+
+        column_names = [
+            *self._keys,
+            *[accumulator.name() for accumulator in self._accumulators],
+        ]
+        batch = [
+            dict(zip(column_names, row))
+            for row in zip(*key_columns, *accumulator_columns)
+        ]
+
+        self._next_slot_to_take = last_slot
+        if self.is_empty():
+            self._init_reduced_data()
+        return batch
+
+    # ============================== PUBLIC ============================== #
+
+    def reduce(self, batch_item: dict[str, str]) -> None:
         for k in self._keys:
             if batch_item[k] == "":
                 self._logging_counter += 1
                 self._logging_warning_when_count_reached()
                 return
 
-        key = tuple(batch_item[k] for k in self._keys)
-        if key not in self._reduced_data:
-            self._reduced_data[key] = 0
+        key_ids = [self._intern(i, batch_item[k]) for i, k in enumerate(self._keys)]
+        slot = self._slot_for(key_ids)
+        for accumulator in self._accumulators:
+            accumulator.accumulate(slot, batch_item)
 
-        self._reduced_data[key] = reduce_function(self._reduced_data[key], batch_item)
+        if (
+            self._spill_threshold is not None
+            and self._slots_amount >= self._spill_threshold
+        ):
+            self._spill_in_memory_groups()
 
-    def pop_next_batch_item(self) -> dict[str, str]:
-        key, value = self._reduced_data.popitem()
-        batch_item: dict[str, str] = {}
-        for i, k in enumerate(self._keys):
-            batch_item[k] = key[i]
-        batch_item[self._accumulator_name] = str(value)
-        return batch_item
+    def take_next_batch(self, batch_max_size: int) -> list[dict[str, str]]:
+        if len(self._spilled_runs) == 0:
+            return self._take_next_in_memory_batch(batch_max_size)
+        return self._take_next_merged_batch(batch_max_size)
 
     def is_empty(self) -> bool:
-        return len(self._reduced_data) == 0
+        return (
+            len(self._spilled_runs) == 0
+            and self._next_slot_to_take >= self._slots_amount
+        )
+
+    def close(self) -> None:
+        self._close_spilled_runs()
@@ -2,6 +2,7 @@ import logging
 from abc import abstractmethod
 from typing import Any
 
+from controllers.reducers.shared.accumulators import Accumulator
 from controllers.reducers.shared.reduced_data import ReducedData
 from controllers.shared.controller import Controller
 from middleware.middleware import MessageMiddleware
@@ -62,6 +63,7 @@ class Reducer(Controller):
         consumers_config: dict[str, Any],
         producers_config: dict[str, Any],
         batch_max_size: int,
+        state_spill_threshold: int,
     ) -> None:
         super().__init__(
             controller_id,
@@ -71,6 +73,7 @@ class Reducer(Controller):
         )
 
         self._batch_max_size = batch_max_size
+        self._state_spill_threshold = state_spill_threshold
 
         self._reduced_data_by_session_id: dict[str, ReducedData] = {}
 
@@ -87,7 +90,7 @@ class Reducer(Controller):
         raise NotImplementedError("subclass responsibility")
 
     @abstractmethod
-    def _accumulator_name(self) -> str:
+    def _accumulators(self) -> list[Accumulator]:
         raise NotImplementedError("subclass responsibility")
 
     @abstractmethod
@@ -96,44 +99,35 @@ class Reducer(Controller):
 
     # ============================== PRIVATE - HANDLE DATA ============================== #
 
-    @abstractmethod
-    def _reduce_function(
-        self, current_value: float, batch_item: dict[str, str]
-    ) -> float:
-        raise NotImplementedError("subclass responsibility")
-
-    def _reduce_by_keys(self, session_id: str, batch_item: dict[str, str]) -> None:
-        self._reduced_data_by_session_id.setdefault(
-            session_id,
-            ReducedData(self._keys(), self._accumulator_name()),
-        ).reduce_using(batch_item, self._reduce_function)
-
-    def _pop_next_batch_item(self, session_id: str) -> dict[str, str]:
-        return self._reduced_data_by_session_id[session_id].pop_next_batch_item()
+    def _reduced_data_of(self, session_id: str) -> ReducedData:
+        reduced_data = self._reduced_data_by_session_id.get(session_id)
+        if reduced_data is None:
+            reduced_data = ReducedData(
+                self._keys(),
+                self._accumulators(),
+                self._state_spill_threshold,
+            )
+            self._reduced_data_by_session_id[session_id] = reduced_data
+        return reduced_data
 
     def _take_next_batch(self, session_id: str) -> list[dict[str, str]]:
-        batch: list[dict[str, str]] = []
         reduced_data = self._reduced_data_by_session_id.get(session_id)
         if reduced_data is None:
             logging.warning(
                 f"action: no_reduced_data_for_session_id | result: warning | session_id: {session_id}"
             )
-            return batch
-
-        all_batchs_taken = False
-        while not all_batchs_taken and len(batch) < self._batch_max_size:
-            if reduced_data.is_empty():
-                all_batchs_taken = True
-                break
-
-            batch_item = self._pop_next_batch_item(session_id)
-            batch.append(batch_item)
+            return []
 
-        return batch
+        return reduced_data.take_next_batch(self._batch_max_size)
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        message = communication_protocol.encode_batch_message(
+            message_type, session_id, batch
+        )
         mom_cleaned_data_producer = self._mom_producers[self._current_producer_id]
         mom_cleaned_data_producer.send(message)
 
@@ -148,17 +142,15 @@ class Reducer(Controller):
 
         batch = self._take_next_batch(session_id)
         while len(batch) != 0 and self._is_running():
-            message_type = self._message_type()
-            message = communication_protocol.encode_batch_message(
-                message_type, session_id, batch
-            )
-            self._mom_send_message_to_next(message)
+            self._mom_send_batch_to_next(self._message_type(), session_id, batch)
             logging.debug(
                 f"action: batch_sent | result: success | session_id: {session_id} | batch_size: {len(batch)}"
             )
             batch = self._take_next_batch(session_id)
 
-        del self._reduced_data_by_session_id[session_id]
+        reduced_data = self._reduced_data_by_session_id.pop(session_id, None)
+        if reduced_data is not None:
+            reduced_data.close()
         logging.info(
             f"action: all_data_sent | result: success | session_id: {session_id}"
         )
@@ -166,8 +158,9 @@ class Reducer(Controller):
     def _handle_data_batch_message(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
         batch = communication_protocol.decode_batch_message(message)
+        reduced_data = self._reduced_data_of(session_id)
         for batch_item in batch:
-            self._reduce_by_keys(session_id, batch_item)
+            reduced_data.reduce(batch_item)
 
     def _clean_session_data_of(self, session_id: str) -> None:
         logging.info(
@@ -180,6 +173,15 @@ class Reducer(Controller):
             f"action: clean_session_data | result: success | session_id: {session_id}"
         )
 
+    def _handle_all_eofs_received(self, session_id: str, message: str) -> None:
+        self._send_all_data_using_batchs(session_id)
+
+        for mom_producer in self._mom_producers:
+            mom_producer.send(message)
+        logging.info(f"action: eof_sent | result: success | session_id: {session_id}")
+
+        self._clean_session_data_of(session_id)
+
     def _handle_data_batch_eof(self, message: str) -> None:
         session_id = communication_protocol.get_message_session_id(message)
         self._eof_recv_from_prev_controllers.setdefault(session_id, 0)
@@ -195,16 +197,7 @@ class Reducer(Controller):
             logging.info(
                 f"action: all_eofs_received | result: success | session_id: {session_id}"
             )
-
-            self._send_all_data_using_batchs(session_id)
-
-            for mom_producer in self._mom_producers:
-                mom_producer.send(message)
-            logging.info(
-                f"action: eof_sent | result: success | session_id: {session_id}"
-            )
-
-            self._clean_session_data_of(session_id)
+            self._handle_all_eofs_received(session_id, message)
 
     def _handle_received_data(self, message_as_bytes: bytes) -> None:
         if not self._is_running():
@@ -225,6 +218,9 @@ class Reducer(Controller):
         self._mom_consumer.start_consuming(self._handle_received_data)
 
     def _close_all(self) -> None:
+        for reduced_data in self._reduced_data_by_session_id.values():
+            reduced_data.close()
+
         for mom_producer in self._mom_producers:
             mom_producer.close()
             logging.debug("action: mom_producer_producer_close | result: success")
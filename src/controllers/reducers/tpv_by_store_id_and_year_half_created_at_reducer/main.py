@@ -15,6 +15,7 @@ def main():
             "PREV_CONTROLLERS_AMOUNT",
             "NEXT_CONTROLLERS_AMOUNT",
             "BATCH_MAX_SIZE",
+            "STATE_SPILL_THRESHOLD",
         ]
     )
     initializer.init_log(config_params["LOGGING_LEVEL"])
@@ -35,6 +36,7 @@ def main():
         consumers_config=consumers_config,
         producers_config=producers_config,
         batch_max_size=int(config_params["BATCH_MAX_SIZE"]),
+        state_spill_threshold=int(config_params["STATE_SPILL_THRESHOLD"]),
     )
     controller.run()
 
@@ -1,5 +1,6 @@
 from typing import Any
 
+from controllers.reducers.shared.accumulators import Accumulator, SumAccumulator
 from controllers.reducers.shared.reducer import Reducer
 from middleware.middleware import MessageMiddleware
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
@@ -34,15 +35,8 @@ class TpvByStoreIdAndYearHalfCreatedAtReducer(Reducer):
     def _keys(self) -> list[str]:
         return ["store_id", "year_half_created_at"]
 
-    def _accumulator_name(self) -> str:
-        return "tpv"
+    def _accumulators(self) -> list[Accumulator]:
+        return [SumAccumulator("tpv", "final_amount")]
 
     def _message_type(self) -> str:
         return communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
-
-    # ============================== PRIVATE - HANDLE DATA ============================== #
-
-    def _reduce_function(
-        self, current_value: float, batch_item: dict[str, str]
-    ) -> float:
-        return current_value + float(batch_item["final_amount"])
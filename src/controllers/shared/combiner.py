@@ -0,0 +1,102 @@
+import logging
+import time
+from typing import Callable
+
+
+class _CombinedSessionData:
+
+    def __init__(self, created_at: float) -> None:
+        self.created_at = created_at
+        self.sums_by_key: dict[tuple, list[float]] = {}
+
+
+class Combiner:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        keys: list[str],
+        accumulated_columns: list[str],
+        max_keys: int,
+        max_age_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._keys = keys
+        self._accumulated_columns = accumulated_columns
+
+        self._max_keys = max_keys
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+
+        self._combined_data_by_session_id: dict[str, _CombinedSessionData] = {}
+
+        self._logging_counter = 0
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _logging_warning_when_count_reached(self) -> None:
+        if self._logging_counter >= 1000:
+            logging.warning(
+                f"action: empty_key_in_batch_item | result: skipped | total: {self._logging_counter}"
+            )
+            self._logging_counter = 0
+
+    def _has_empty_key(self, batch_item: dict[str, str]) -> bool:
+        for k in self._keys:
+            if batch_item[k] == "":
+                return True
+        return False
+
+    def _should_be_flushed(self, combined_data: _CombinedSessionData, now: float) -> bool:
+        return (
+            len(combined_data.sums_by_key) >= self._max_keys
+            or now - combined_data.created_at >= self._max_age_seconds
+        )
+
+    # ============================== PUBLIC ============================== #
+
+    def combine(self, session_id: str, batch: list[dict[str, str]]) -> None:
+        combined_data = self._combined_data_by_session_id.get(session_id)
+        if combined_data is None:
+            combined_data = _CombinedSessionData(self._clock())
+            self._combined_data_by_session_id[session_id] = combined_data
+
+        sums_by_key = combined_data.sums_by_key
+        for batch_item in batch:
+            # [IMPORTANT] the reducers skip items with empty keys,
+            # so they are not worth sending at all
+            if self._has_empty_key(batch_item):
+                self._logging_counter += 1
+                self._logging_warning_when_count_reached()
+                continue
+
+            key = tuple(batch_item[k] for k in self._keys)
+            sums = sums_by_key.get(key)
+            if sums is None:
+                sums = [0.0] * len(self._accumulated_columns)
+                sums_by_key[key] = sums
+
+            for i, column in enumerate(self._accumulated_columns):
+                sums[i] += float(batch_item[column])
+
+    def sessions_to_flush(self) -> list[str]:
+        now = self._clock()
+        return [
+            session_id
+            for session_id, combined_data in self._combined_data_by_session_id.items()
+            if self._should_be_flushed(combined_data, now)
+        ]
+
+    def take_combined_batch(self, session_id: str) -> list[dict[str, str]]:
+        combined_data = self._combined_data_by_session_id.pop(session_id, None)
+        if combined_data is None:
+            return []
+
+        combined_batch: list[dict[str, str]] = []
+        for key, sums in combined_data.sums_by_key.items():
+            batch_item = dict(zip(self._keys, key))
+            for i, column in enumerate(self._accumulated_columns):
+                batch_item[column] = str(sums[i])
+            combined_batch.append(batch_item)
+        return combined_batch
@@ -0,0 +1,124 @@
+import logging
+import zlib
+from typing import Callable
+
+# empty key policies
+EMPTY_KEY_TO_FIRST_SHARD = "to_first_shard"
+EMPTY_KEY_SKIPPED = "skipped"
+
+# ============================== SHARD HASHES ============================== #
+
+
+def numeric_shard_hash(value: str) -> tuple[int, str]:
+    # [IMPORTANT] numeric keys are normalized ("3.0" -> "3") so the next
+    # controller groups them the same way no matter how they were written
+    numeric_value = int(float(value))
+    return numeric_value, str(numeric_value)
+
+
+def string_shard_hash(value: str) -> tuple[int, str]:
+    # [IMPORTANT] python's hash() is salted per process, so it can not be used
+    # to route the same key to the same shard from different controllers
+    return zlib.crc32(value.encode("utf-8")), value
+
+
+class ShardRouter:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        sharding_key: str,
+        shards_amount: int,
+        shard_hash: Callable[[str], tuple[int, str]],
+        empty_key_policy: str,
+        hash_cache_max_size: int = 100_000,
+        log_counters_every: int = 1_000_000,
+    ) -> None:
+        if empty_key_policy not in [EMPTY_KEY_TO_FIRST_SHARD, EMPTY_KEY_SKIPPED]:
+            raise ValueError(f"Unknown empty key policy: {empty_key_policy}")
+
+        self._sharding_key = sharding_key
+        self._shards_amount = shards_amount
+        self._shard_hash = shard_hash
+        self._empty_key_policy = empty_key_policy
+
+        self._hash_cache: dict[str, tuple[int, str]] = {}
+        self._hash_cache_max_size = hash_cache_max_size
+
+        self._items_by_shard = [0] * shards_amount
+        self._skipped_items = 0
+        self._routed_items_since_last_log = 0
+        self._log_counters_every = log_counters_every
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _shard_and_value_for(self, value: str) -> tuple[int, str]:
+        cached_entry = self._hash_cache.get(value)
+        if cached_entry is not None:
+            return cached_entry
+
+        hash_value, normalized_value = self._shard_hash(value)
+        entry = (hash_value % self._shards_amount, normalized_value)
+
+        if len(self._hash_cache) >= self._hash_cache_max_size:
+            self._hash_cache.clear()
+        self._hash_cache[value] = entry
+        return entry
+
+    def _log_counters_when_count_reached(self, routed_items: int) -> None:
+        self._routed_items_since_last_log += routed_items
+        if self._routed_items_since_last_log >= self._log_counters_every:
+            self.log_counters()
+            self._routed_items_since_last_log = 0
+
+    # ============================== PUBLIC ============================== #
+
+    def bucket_batch(
+        self, batch: list[dict[str, str]]
+    ) -> dict[int, list[dict[str, str]]]:
+        batchs_by_shard: dict[int, list[dict[str, str]]] = {}
+        skipped_items = 0
+
+        for batch_item in batch:
+            value = batch_item[self._sharding_key]
+            if value == "":
+                if self._empty_key_policy == EMPTY_KEY_SKIPPED:
+                    skipped_items += 1
+                    continue
+                # [IMPORTANT] If sharding value is empty, the hash will fail
+                # but we are going to assign it to the first shard anyway
+                shard = 0
+            else:
+                shard, batch_item[self._sharding_key] = self._shard_and_value_for(
+                    value
+                )
+
+            shard_batch = batchs_by_shard.get(shard)
+            if shard_batch is None:
+                shard_batch = []
+                batchs_by_shard[shard] = shard_batch
+            shard_batch.append(batch_item)
+
+        for shard, shard_batch in batchs_by_shard.items():
+            self._items_by_shard[shard] += len(shard_batch)
+
+        if skipped_items > 0:
+            self._skipped_items += skipped_items
+            logging.warning(
+                f"action: invalid_{self._sharding_key} | result: skipped | total: {skipped_items}"
+            )
+
+        self._log_counters_when_count_reached(len(batch))
+        return batchs_by_shard
+
+    def items_by_shard(self) -> list[int]:
+        return list(self._items_by_shard)
+
+    def skipped_items(self) -> int:
+        return self._skipped_items
+
+    def log_counters(self) -> None:
+        logging.info(
+            f"action: shard_counters | result: success | key: {self._sharding_key} | items_by_shard: {self._items_by_shard} | skipped: {self._skipped_items}"
+        )
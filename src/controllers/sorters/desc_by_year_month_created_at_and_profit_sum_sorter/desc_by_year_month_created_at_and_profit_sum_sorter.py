@@ -45,7 +45,12 @@ class DescByYearMonthCreatedAtAndProfitSumSorter(Sorter):
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, message: str) -> None:
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
+        message = communication_protocol.encode_batch_message(
+            message_type, session_id, batch
+        )
         mom_cleaned_data_producer = self._mom_producers[self._current_producer_id]
         mom_cleaned_data_producer.send(message)
 
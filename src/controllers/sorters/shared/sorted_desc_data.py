@@ -1,3 +1,7 @@
+import heapq
+import itertools
+
+
 class SortedDescData:
 
     def __init__(
@@ -14,40 +18,49 @@ class SortedDescData:
 
         self._amount_per_group = amount_per_group
 
-        self._sorted_desc_by_grouping_key: dict[str, list[dict[str, str]]] = {}
+        # [IMPORTANT] each group keeps a min-heap of its best items, so the root
+        # is always the item to discard when a better one arrives.
+        # The arrival number breaks ties in favour of the earliest item.
+        self._top_k_by_grouping_key: dict[
+            str, list[tuple[str, float, int, dict[str, str]]]
+        ] = {}
+        self._arrivals_counter = itertools.count()
 
-    def add_batch_item_keeping_sort_desc(self, batch_item: dict[str, str]) -> None:
-        grouping_key_value = batch_item[self._grouping_key]
-        primary_sort_value = batch_item[self._primary_sort_key]
-        secondary_sort_value = batch_item[self._secondary_sort_key]
+        self._draining_batch_items: list[tuple[str, float, int, dict[str, str]]] = []
 
-        sorted_desc_batch_items = self._sorted_desc_by_grouping_key.setdefault(
-            grouping_key_value, []
+    def _heap_entry_for(
+        self, batch_item: dict[str, str]
+    ) -> tuple[str, float, int, dict[str, str]]:
+        return (
+            batch_item[self._primary_sort_key],
+            float(batch_item[self._secondary_sort_key]),
+            -next(self._arrivals_counter),
+            batch_item,
         )
 
-        index = 0
-        while index < len(sorted_desc_batch_items):
-            current_batch_item = sorted_desc_batch_items[index]
-            current_primary_sort_value = current_batch_item[self._primary_sort_key]
-            current_secondary_sort_value = current_batch_item[self._secondary_sort_key]
+    def add_batch_item_keeping_sort_desc(self, batch_item: dict[str, str]) -> None:
+        if self._amount_per_group <= 0:
+            return
 
-            if primary_sort_value > current_primary_sort_value:
-                break
-            if primary_sort_value == current_primary_sort_value:
-                if secondary_sort_value > current_secondary_sort_value:
-                    break
-            index += 1
+        grouping_key_value = batch_item[self._grouping_key]
+        top_k = self._top_k_by_grouping_key.setdefault(grouping_key_value, [])
 
-        sorted_desc_batch_items.insert(index, batch_item)
-        if len(sorted_desc_batch_items) > self._amount_per_group:
-            sorted_desc_batch_items.pop()
+        heap_entry = self._heap_entry_for(batch_item)
+        if len(top_k) < self._amount_per_group:
+            heapq.heappush(top_k, heap_entry)
+        else:
+            heapq.heappushpop(top_k, heap_entry)
 
     def pop_next_batch_item(self) -> dict[str, str]:
-        key = next(iter(self._sorted_desc_by_grouping_key))
-        batch_item = self._sorted_desc_by_grouping_key[key].pop(0)
-        if not self._sorted_desc_by_grouping_key[key]:
-            del self._sorted_desc_by_grouping_key[key]
-        return batch_item
+        if len(self._draining_batch_items) == 0:
+            key = next(iter(self._top_k_by_grouping_key))
+            # sorted ascending, so popping from the end drains it in desc order
+            self._draining_batch_items = sorted(self._top_k_by_grouping_key.pop(key))
+
+        return self._draining_batch_items.pop()[-1]
 
     def is_empty(self) -> bool:
-        return len(self._sorted_desc_by_grouping_key.keys()) == 0
+        return (
+            len(self._draining_batch_items) == 0
+            and len(self._top_k_by_grouping_key.keys()) == 0
+        )
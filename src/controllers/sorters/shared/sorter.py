@@ -104,15 +104,17 @@ class Sorter(Controller):
     def _add_batch_item_keeping_sort_desc(
         self, session_id: str, batch_item: dict[str, str]
     ) -> None:
-        self._sorted_desc_data_by_session_id.setdefault(
-            session_id,
-            SortedDescData(
+        sorted_desc_data = self._sorted_desc_data_by_session_id.get(session_id)
+        if sorted_desc_data is None:
+            sorted_desc_data = SortedDescData(
                 self._grouping_key(),
                 self._primary_sort_key(),
                 self._secondary_sort_key(),
                 self._amount_per_group,
-            ),
-        ).add_batch_item_keeping_sort_desc(batch_item)
+            )
+            self._sorted_desc_data_by_session_id[session_id] = sorted_desc_data
+
+        sorted_desc_data.add_batch_item_keeping_sort_desc(batch_item)
 
     def _pop_next_batch_item(self, session_id: str) -> dict[str, str]:
         return self._sorted_desc_data_by_session_id[session_id].pop_next_batch_item()
@@ -142,7 +144,9 @@ class Sorter(Controller):
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
     @abstractmethod
-    def _mom_send_message_to_next(self, message: str) -> None:
+    def _mom_send_batch_to_next(
+        self, message_type: str, session_id: str, batch: list[dict[str, str]]
+    ) -> None:
         raise NotImplementedError("subclass responsibility")
 
     def _send_all_data_using_batchs(self, session_id: str) -> None:
@@ -152,11 +156,7 @@ class Sorter(Controller):
 
         batch = self._take_next_batch(session_id)
         while len(batch) != 0 and self._is_running():
-            message_type = self._message_type()
-            message = communication_protocol.encode_batch_message(
-                message_type, session_id, batch
-            )
-            self._mom_send_message_to_next(message)
+            self._mom_send_batch_to_next(self._message_type(), session_id, batch)
             logging.debug(
                 f"action: batch_sent | result: success | session_id: {session_id} | batch_size: {len(batch)}"
             )
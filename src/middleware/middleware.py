@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from collections.abc import Callable
-from typing import List
+from typing import List, Union
 
 
 class MessageMiddlewareMessageError(Exception):
@@ -40,7 +40,7 @@ class MessageMiddleware(ABC):
     # Si se pierde la conexión con el middleware eleva MessageMiddlewareDisconnectedError.
     # Si ocurre un error interno que no puede resolverse eleva MessageMiddlewareMessageError.
     @abstractmethod
-    def send(self, message: str) -> None:
+    def send(self, message: Union[str, bytes]) -> None:
         pass
 
     # Se desconecta de la cola o exchange al que estaba conectado.
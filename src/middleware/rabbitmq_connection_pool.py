@@ -0,0 +1,113 @@
+import os
+import threading
+from typing import Optional
+
+import pika
+from pika.adapters.blocking_connection import BlockingChannel, BlockingConnection
+from pika.exceptions import ChannelWrongStateError
+
+# [IMPORTANT] pika blocking connections are not thread safe and must not be
+# shared with forked processes, so connections are shared only between the
+# middlewares created by the same thread of the same process
+_PoolKey = tuple[int, int, str, int]
+
+
+class _PooledConnection:
+
+    def __init__(self, connection: BlockingConnection) -> None:
+        self.connection = connection
+        # [IMPORTANT] the acquired channels are tracked one by one, so
+        # releasing the same channel twice can not close a connection
+        # whose other channels are still in use
+        self.channels: list[BlockingChannel] = []
+
+
+_pooled_connections: dict[_PoolKey, _PooledConnection] = {}
+_pooled_connections_lock = threading.Lock()
+
+# ============================== PRIVATE ============================== #
+
+
+def _pool_key(host: str, port: int) -> _PoolKey:
+    return (os.getpid(), threading.get_ident(), host, port)
+
+
+def _new_connection(
+    host: str, port: int, user: str, password: str, heartbeat: int
+) -> BlockingConnection:
+    return pika.BlockingConnection(
+        pika.ConnectionParameters(
+            host=host,
+            port=port,
+            credentials=pika.PlainCredentials(user, password),
+            heartbeat=heartbeat,
+        )
+    )
+
+
+def _find_open_pooled_connection(key: _PoolKey) -> Optional[_PooledConnection]:
+    pooled_connection = _pooled_connections.get(key)
+    if pooled_connection is None:
+        return None
+
+    if not pooled_connection.connection.is_open:
+        del _pooled_connections[key]
+        return None
+
+    return pooled_connection
+
+
+def _find_pooled_connection_key_of(
+    connection: BlockingConnection, channel: BlockingChannel
+) -> Optional[_PoolKey]:
+    for key, pooled_connection in _pooled_connections.items():
+        if pooled_connection.connection is not connection:
+            continue
+        if any(
+            pooled_channel is channel for pooled_channel in pooled_connection.channels
+        ):
+            return key
+    return None
+
+
+# ============================== PUBLIC ============================== #
+
+
+def acquire_channel(
+    host: str, port: int, user: str, password: str, heartbeat: int
+) -> tuple[BlockingConnection, BlockingChannel]:
+    key = _pool_key(host, port)
+    with _pooled_connections_lock:
+        pooled_connection = _find_open_pooled_connection(key)
+        if pooled_connection is None:
+            pooled_connection = _PooledConnection(
+                _new_connection(host, port, user, password, heartbeat)
+            )
+            _pooled_connections[key] = pooled_connection
+
+        channel = pooled_connection.connection.channel()
+        pooled_connection.channels.append(channel)
+        return pooled_connection.connection, channel
+
+
+def release_channel(connection: BlockingConnection, channel: BlockingChannel) -> None:
+    with _pooled_connections_lock:
+        key = _find_pooled_connection_key_of(connection, channel)
+        if key is None:
+            raise ChannelWrongStateError("Channel is closed.")
+
+        pooled_connection = _pooled_connections[key]
+        pooled_connection.channels = [
+            pooled_channel
+            for pooled_channel in pooled_connection.channels
+            if pooled_channel is not channel
+        ]
+        last_channel_released = len(pooled_connection.channels) == 0
+        if last_channel_released:
+            del _pooled_connections[key]
+
+    if channel.is_open:
+        channel.close()
+
+    if last_channel_released and connection.is_open:
+        connection.close()
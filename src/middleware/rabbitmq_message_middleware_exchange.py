@@ -1,9 +1,10 @@
 import logging
-from typing import Callable, List
+from typing import Callable, List, Union
 
 import pika
 from pika.exceptions import AMQPConnectionError
 
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import (
     MessageMiddlewareCloseError,
     MessageMiddlewareDeleteError,
@@ -36,22 +37,27 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
         self._routing_keys = route_keys
 
         try:
-            self._connection = pika.BlockingConnection(
-                pika.ConnectionParameters(
-                    host=host,
-                    port=self._rabbitmq_port(),
-                    credentials=pika.PlainCredentials(
-                        self._rabbitmq_user(), self._rabbitmq_password()
-                    ),
-                    heartbeat=3600,
-                )
+            self._connection, self._channel = rabbitmq_connection_pool.acquire_channel(
+                host=host,
+                port=self._rabbitmq_port(),
+                user=self._rabbitmq_user(),
+                password=self._rabbitmq_password(),
+                heartbeat=3600,
             )
-            self._channel = self._connection.channel()
+        except Exception as e:
+            raise MessageMiddlewareDisconnectedError(
+                f"Error connecting to RabbitMQ server: {e}"
+            )
+
+        # [IMPORTANT] the channel is released if it can not be set up,
+        # otherwise the pooled connection would be kept open forever
+        try:
             self._channel.exchange_declare(
                 exchange=self._exchange_name,
                 exchange_type="topic",  # type: ignore
             )
         except Exception as e:
+            rabbitmq_connection_pool.release_channel(self._connection, self._channel)
             raise MessageMiddlewareDisconnectedError(
                 f"Error connecting to RabbitMQ server: {e}"
             )
@@ -124,7 +130,7 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
     def _stop_consuming(self) -> None:
         self._channel.stop_consuming()
 
-    def _send(self, message: str) -> None:
+    def _send(self, message: Union[str, bytes]) -> None:
         for routing_key in self._routing_keys:
             self._channel.basic_publish(
                 exchange=self._exchange_name,
@@ -150,7 +156,7 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
             exc_prefix="Error stopping consuming messages:",
         )
 
-    def send(self, message: str) -> None:
+    def send(self, message: Union[str, bytes]) -> None:
         self._assert_connection_is_open()
         self._handle_amqp_errors_during(
             self._send,
@@ -160,8 +166,7 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
 
     def close(self) -> None:
         try:
-            self._channel.close()
-            self._connection.close()
+            rabbitmq_connection_pool.release_channel(self._connection, self._channel)
         except Exception as e:
             raise MessageMiddlewareCloseError(f"Error closing connection: {e}")
 
@@ -180,3 +185,11 @@ class RabbitMQMessageMiddlewareExchange(MessageMiddlewareExchange):
             args=(self.stop_consuming,),
             exc_prefix="Error scheduling stop consuming:",
         )
+
+    def schedule_callback(self, callback: Callable) -> None:
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._connection.add_callback_threadsafe,
+            args=(callback,),
+            exc_prefix="Error scheduling callback:",
+        )
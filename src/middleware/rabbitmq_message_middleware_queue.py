@@ -1,9 +1,10 @@
 import logging
-from typing import Callable
+from typing import Callable, Union
 
 import pika
 from pika.exceptions import AMQPConnectionError
 
+from middleware import rabbitmq_connection_pool
 from middleware.middleware import (
     MessageMiddlewareCloseError,
     MessageMiddlewareDeleteError,
@@ -33,22 +34,28 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
 
         self._queue_name = queue_name
         self._exchange_name = ""
+        self._consumer_tag = None
 
         try:
-            self._connection = pika.BlockingConnection(
-                pika.ConnectionParameters(
-                    host=host,
-                    port=self._rabbitmq_port(),
-                    credentials=pika.PlainCredentials(
-                        self._rabbitmq_user(), self._rabbitmq_password()
-                    ),
-                    heartbeat=3600,
-                )
+            self._connection, self._channel = rabbitmq_connection_pool.acquire_channel(
+                host=host,
+                port=self._rabbitmq_port(),
+                user=self._rabbitmq_user(),
+                password=self._rabbitmq_password(),
+                heartbeat=3600,
             )
-            self._channel = self._connection.channel()
+        except Exception as e:
+            raise MessageMiddlewareDisconnectedError(
+                f"Error connecting to RabbitMQ server: {e}"
+            )
+
+        # [IMPORTANT] the channel is released if it can not be set up,
+        # otherwise the pooled connection would be kept open forever
+        try:
             self._channel.basic_qos(prefetch_count=1)
             self._channel.queue_declare(queue=queue_name)
         except Exception as e:
+            rabbitmq_connection_pool.release_channel(self._connection, self._channel)
             raise MessageMiddlewareDisconnectedError(
                 f"Error connecting to RabbitMQ server: {e}"
             )
@@ -107,7 +114,20 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
     def _stop_consuming(self) -> None:
         self._channel.stop_consuming()
 
-    def _send(self, message: str) -> None:
+    def _register_consumer(self, on_message_callback: Callable) -> None:
+        self._consumer_tag = self._channel.basic_consume(
+            self._queue_name,
+            self._pika_on_message_callback_wrapping(on_message_callback),
+            auto_ack=False,
+        )
+
+    def _cancel_consumer(self) -> None:
+        if self._consumer_tag is None:
+            return
+        self._channel.basic_cancel(self._consumer_tag)
+        self._consumer_tag = None
+
+    def _send(self, message: Union[str, bytes]) -> None:
         self._channel.basic_publish(
             exchange=self._exchange_name,
             routing_key=self._queue_name,
@@ -132,7 +152,7 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
             exc_prefix="Error stopping consuming:",
         )
 
-    def send(self, message: str) -> None:
+    def send(self, message: Union[str, bytes]) -> None:
         self._assert_connection_is_open()
         self._handle_amqp_errors_during(
             self._send,
@@ -142,8 +162,7 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
 
     def close(self) -> None:
         try:
-            self._channel.close()
-            self._connection.close()
+            rabbitmq_connection_pool.release_channel(self._connection, self._channel)
         except Exception as e:
             raise MessageMiddlewareCloseError(f"Error closing connection: {e}")
 
@@ -164,3 +183,37 @@ class RabbitMQMessageMiddlewareQueue(MessageMiddlewareQueue):
             args=(self.stop_consuming,),
             exc_prefix="Error scheduling stop consuming:",
         )
+
+    def schedule_callback(self, callback: Callable) -> None:
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._connection.add_callback_threadsafe,
+            args=(callback,),
+            exc_prefix="Error scheduling callback:",
+        )
+
+    # [IMPORTANT] the following methods never block, the callbacks are only
+    # dispatched while processing data events of the pooled connection
+
+    def register_consumer(self, on_message_callback: Callable) -> None:
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._register_consumer,
+            args=(on_message_callback,),
+            exc_prefix="Error registering consumer:",
+        )
+
+    def cancel_consumer(self) -> None:
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._cancel_consumer,
+            exc_prefix="Error cancelling consumer:",
+        )
+
+    def process_data_events(self, time_limit: float) -> None:
+        self._assert_connection_is_open()
+        self._handle_amqp_errors_during(
+            self._connection.process_data_events,
+            kwargs={"time_limit": time_limit},
+            exc_prefix="Error processing data events:",
+        )
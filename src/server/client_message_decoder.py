@@ -0,0 +1,60 @@
+import socket
+import struct
+from typing import Optional
+
+from shared import communication_protocol, framed_socket, socket_io
+
+MSG_END_DELIMITER_AS_BYTES = communication_protocol.MSG_END_DELIMITER.encode("utf-8")
+
+
+class ClientMessageDecoder:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        buffer_size: int = socket_io.DEFAULT_SOCKET_BUFFER_SIZE,
+        stats: Optional[socket_io.SocketIOStats] = None,
+    ) -> None:
+        # [IMPORTANT] the client socket is received straight into the
+        # reader buffer, which is reused and only grows for big messages
+        self._socket_reader = socket_io.SocketReader(buffer_size, stats)
+
+        self._framed_transport = False
+
+    # ============================== PRIVATE - DECODE ============================== #
+
+    def _next_framed_message(self) -> Optional[memoryview]:
+        header = self._socket_reader.peek_available(framed_socket.FRAME_HEADER_LENGTH)
+        if header is None:
+            return None
+
+        (payload_length,) = struct.unpack_from(
+            framed_socket.FRAME_HEADER_FORMAT, header
+        )
+        frame = self._socket_reader.read_available(
+            framed_socket.FRAME_HEADER_LENGTH + payload_length
+        )
+        if frame is None:
+            return None
+        return frame[framed_socket.FRAME_HEADER_LENGTH :]
+
+    def _next_delimited_message(self) -> Optional[memoryview]:
+        return self._socket_reader.read_available_until_delimiter(
+            MSG_END_DELIMITER_AS_BYTES
+        )
+
+    # ============================== PUBLIC ============================== #
+
+    def use_framed_transport(self) -> None:
+        self._framed_transport = True
+
+    def receive_from(self, sock: socket.socket) -> None:
+        # [IMPORTANT] the messages returned before are only valid until this
+        # is called again, because the buffer may be compacted
+        self._socket_reader.receive_available(sock)
+
+    def next_message(self) -> Optional[memoryview]:
+        if self._framed_transport:
+            return self._next_framed_message()
+        return self._next_delimited_message()
@@ -3,10 +3,10 @@ import os
 import signal
 import socket
 import uuid
-from typing import Any, Callable
+from typing import Any, Callable, Union
 
 from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
-from shared import communication_protocol, constants
+from shared import communication_protocol, constants, framed_socket, socket_io
 
 
 class ClientSessionHandler:
@@ -68,6 +68,7 @@ class ClientSessionHandler:
         rabbitmq_host: str,
         cleaners_data: dict,
         output_builders_data: dict,
+        socket_buffer_size: int,
     ) -> None:
         self._client_socket = client_socket
         self._session_id = uuid.uuid4().hex
@@ -86,7 +87,12 @@ class ClientSessionHandler:
         self._init_mom_producers(rabbitmq_host)
         self._init_mom_consumers(rabbitmq_host)
 
-        self._temp_buffer = b""
+        self._socket_reader = socket_io.SocketReader(socket_buffer_size)
+
+        self._framed_transport = False
+        self._frame_receiver = framed_socket.FramedMessageReceiver(
+            socket_reader=self._socket_reader
+        )
 
     # ============================== PRIVATE - LOGGING ============================== #
 
@@ -130,53 +136,36 @@ class ClientSessionHandler:
     def _socket_send_message(self, socket: socket.socket, message: str) -> None:
         self._log_debug(f"action: send_message | result: in_progress | msg: {message}")
 
-        socket.sendall(message.encode("utf-8"))
+        encoded_message = message.encode("utf-8")
+        if self._framed_transport:
+            encoded_message = framed_socket.encode_framed_message(encoded_message)
+        socket.sendall(encoded_message)
+        self._socket_reader.stats().record_send(len(encoded_message))
 
         self._log_debug(f"action: send_message | result: success |  msg: {message}")
 
-    def _socket_receive_message(self, socket: socket.socket) -> str:
+    def _socket_receive_raw_message(
+        self, socket: socket.socket
+    ) -> Union[bytes, memoryview]:
         self._log_debug(f"action: receive_message | result: in_progress")
 
-        buffsize = constants.KiB
-        bytes_received = self._temp_buffer
-        self._temp_buffer = b""
+        if self._framed_transport:
+            return self._frame_receiver.receive_message(socket)
 
-        all_data_received = False
-        while not all_data_received:
-            chunk = socket.recv(buffsize)
-            if len(chunk) == 0:
-                self._log_error(
-                    f"action: receive_message | result: fail | error: unexpected disconnection",
-                )
-                raise OSError(f"Unexpected disconnection of the client")
-
-            self._log_debug(
-                f"action: receive_chunk | result: success | chunk size: {len(chunk)}"
-            )
-            if chunk.endswith(communication_protocol.MSG_END_DELIMITER.encode("utf-8")):
-                all_data_received = True
+        return self._socket_reader.read_until_last_delimiter(
+            socket, communication_protocol.MSG_END_DELIMITER.encode("utf-8")
+        )
 
-            if communication_protocol.MSG_END_DELIMITER.encode("utf-8") in chunk:
-                index = chunk.rindex(
-                    communication_protocol.MSG_END_DELIMITER.encode("utf-8")
-                )
-                bytes_received += chunk[
-                    : index + len(communication_protocol.MSG_END_DELIMITER)
-                ]
-                self._temp_buffer = chunk[
-                    index + len(communication_protocol.MSG_END_DELIMITER) :
-                ]
-                all_data_received = True
-            else:
-                bytes_received += chunk
-
-        message = bytes_received.decode("utf-8")
+    def _socket_receive_message(self, socket: socket.socket) -> str:
+        message = str(self._socket_receive_raw_message(socket), "utf-8")
         self._log_debug(f"action: receive_message | result: success | msg: {message}")
         return message
 
     # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
 
-    def _mom_send_message_to_next(self, data_type: str, message: str) -> None:
+    def _mom_send_message_to_next(
+        self, data_type: str, message: Union[str, bytes]
+    ) -> None:
         current_worker_id = self._cleaners_data[data_type]["current_worker_id"]
 
         mom_producers = self._mom_cleaners_connections[data_type]
@@ -192,11 +181,45 @@ class ClientSessionHandler:
 
     # ============================== PRIVATE - RECEIVE CLIENT HANDSHAKE ============================== #
 
+    def _supported_features(self) -> list[str]:
+        return [
+            communication_protocol.COLUMNAR_BATCH_FEATURE,
+            communication_protocol.FRAMED_TRANSPORT_FEATURE,
+            communication_protocol.COLUMN_PUSHDOWN_FEATURE,
+        ]
+
+    def _with_feature_values(self, accepted_features: list[str]) -> list[str]:
+        # [IMPORTANT] the column pushdown is answered with the columns that
+        # the client must send of each data type
+        return [
+            (
+                communication_protocol.encode_column_pushdown_feature(
+                    constants.CLEANED_COLUMNS_BY_DATA_TYPE
+                )
+                if feature == communication_protocol.COLUMN_PUSHDOWN_FEATURE
+                else feature
+            )
+            for feature in accepted_features
+        ]
+
+    def _accept_features(self, requested_features: list[str]) -> list[str]:
+        supported_features = self._supported_features()
+        return self._with_feature_values(
+            [
+                feature
+                for feature in requested_features
+                if feature in supported_features
+            ]
+        )
+
     def _send_client_handshake_message(
-        self, client_socket: socket.socket, client_id: str
+        self, client_socket: socket.socket, client_id: str, accepted_features: list[str]
     ) -> None:
+        handshake_response_payload = communication_protocol.encode_handshake_payload(
+            client_id, accepted_features
+        )
         handshake_response_message = communication_protocol.encode_handshake_message(
-            self._session_id, client_id
+            self._session_id, handshake_response_payload
         )
         self._socket_send_message(client_socket, handshake_response_message)
         self._log_info(
@@ -208,7 +231,10 @@ class ClientSessionHandler:
         (client_id, payload) = communication_protocol.decode_handshake_message(
             received_message
         )
-        if payload != communication_protocol.ALL_QUERIES:
+        (queries, requested_features) = communication_protocol.decode_handshake_payload(
+            payload
+        )
+        if queries != communication_protocol.ALL_QUERIES:
             raise ValueError(
                 f"Invalid handshake payload received from client: {payload}"
             )
@@ -216,13 +242,21 @@ class ClientSessionHandler:
             f"action: handshake_received | result: success | client_id: {client_id}"
         )
 
-        self._send_client_handshake_message(client_socket, client_id)
+        accepted_features = self._accept_features(requested_features)
+        self._send_client_handshake_message(
+            client_socket, client_id, accepted_features
+        )
+
+        # [IMPORTANT] the handshake itself always travels delimited, the
+        # framed transport is only used from the next message onwards
+        self._framed_transport = (
+            communication_protocol.FRAMED_TRANSPORT_FEATURE in accepted_features
+        )
 
     # ============================== PRIVATE - RECEIVE CLIENT DATA ============================== #
 
-    def _handle_data_batch_message(self, message: str) -> None:
-        data_type = communication_protocol.get_message_type(message)
-        self._mom_send_message_to_next(data_type, message)
+    def _handle_data_batch_message(self, data_type: str, raw_message: bytes) -> None:
+        self._mom_send_message_to_next(data_type, raw_message)
 
     def _handle_data_batch_eof_message(self, message: str) -> None:
         data_type = communication_protocol.decode_eof_message(message)
@@ -236,8 +270,10 @@ class ClientSessionHandler:
         for mom_producer in self._mom_cleaners_connections[data_type]:
             mom_producer.send(message)
 
-    def _handle_client_message(self, message: str) -> None:
-        message_type = communication_protocol.get_message_type(message)
+    def _handle_client_message(self, raw_message: Union[bytes, memoryview]) -> None:
+        # [IMPORTANT] only the message type is peeked from the raw bytes,
+        # data batches are forwarded to the cleaners without being decoded
+        message_type = communication_protocol.get_raw_message_type(raw_message)
         match message_type:
             case (
                 communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE
@@ -246,37 +282,47 @@ class ClientSessionHandler:
                 | communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
                 | communication_protocol.USERS_BATCH_MSG_TYPE
             ):
-                self._handle_data_batch_message(message)
+                self._handle_data_batch_message(message_type, bytes(raw_message))
             case communication_protocol.EOF:
-                self._handle_data_batch_eof_message(message)
+                self._handle_data_batch_eof_message(str(raw_message, "utf-8"))
             case _:
                 raise ValueError(
                     f'Invalid message type received from client "{message_type}"'
                 )
 
-    def _with_each_message_do(
+    def _with_each_delimited_message_do(
         self,
-        received_message: str,
+        received_message: bytes,
         callback: Callable,
         *args: Any,
         **kwargs: Any,
     ) -> None:
-        messages = received_message.split(communication_protocol.MSG_END_DELIMITER)
-        for message in messages:
-            if not self._is_running():
+        delimiter = communication_protocol.MSG_END_DELIMITER.encode("utf-8")
+        received_view = memoryview(received_message)
+        message_start = 0
+        while self._is_running():
+            delimiter_index = received_message.find(delimiter, message_start)
+            if delimiter_index == -1:
                 break
-            if message == "":
-                continue
-            message += communication_protocol.MSG_END_DELIMITER
-            callback(message, *args, **kwargs)
+            message_end = delimiter_index + len(delimiter)
+            callback(received_view[message_start:message_end], *args, **kwargs)
+            message_start = message_end
 
     def _receive_all_data_from_client(self, client_socket: socket.socket) -> None:
         while not all(self._client_eof_received.values()):
             if not self._is_running():
                 return
 
-            received_message = self._socket_receive_message(client_socket)
-            self._with_each_message_do(
+            if self._framed_transport:
+                self._handle_client_message(
+                    self._frame_receiver.receive_message(client_socket)
+                )
+                continue
+
+            received_message = self._socket_reader.read_until_last_delimiter(
+                client_socket, communication_protocol.MSG_END_DELIMITER.encode("utf-8")
+            )
+            self._with_each_delimited_message_do(
                 received_message,
                 self._handle_client_message,
             )
@@ -390,6 +436,9 @@ class ClientSessionHandler:
         finally:
             self._client_socket.close()
             self._log_debug(f"action: client_socket_close | result: success")
+            self._log_info(
+                f"action: socket_io_stats | result: success | {self._socket_reader.stats().as_log_fields()}"
+            )
 
             self._close_all()
             self._log_info(f"action: all_mom_connections_close | result: success")
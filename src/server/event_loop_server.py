@@ -0,0 +1,263 @@
+import logging
+import selectors
+import signal
+import socket
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+from server.multiplexed_client_session import MultiplexedClientSession
+from shared import constants, socket_io
+
+# max seconds the selector waits before processing the broker data events
+EVENT_LOOP_TICK_SECONDS = 0.05
+
+
+class EventLoopServer:
+
+    # ============================== INITIALIZE ============================== #
+
+    def _init_mom_producers(self, rabbitmq_host: str) -> None:
+        # [IMPORTANT] all the middlewares of this thread share one pooled
+        # connection, so every session publishes through the same producers
+        self._mom_cleaners_connections: dict[
+            str, list[RabbitMQMessageMiddlewareQueue]
+        ] = {}
+        for data_type, cleaner_data in self._cleaners_data.items():
+            self._mom_cleaners_connections[data_type] = [
+                RabbitMQMessageMiddlewareQueue(
+                    rabbitmq_host, f"{cleaner_data[constants.QUEUE_PREFIX]}-{id}"
+                )
+                for id in range(cleaner_data[constants.WORKERS_AMOUNT])
+            ]
+
+    def __init__(
+        self,
+        port: int,
+        listen_backlog: int,
+        rabbitmq_host: str,
+        cleaners_data: dict,
+        output_builders_data: dict,
+        socket_buffer_size: int,
+    ) -> None:
+        self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # [IMPORTANT] accepted sockets inherit the buffer sizes of the
+        # listening socket, which must be set before listening
+        socket_io.tune_socket_buffers(self._server_socket, socket_buffer_size)
+        self._server_socket.bind(("", port))
+        self._server_socket.listen(listen_backlog)
+        self._server_socket.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server_socket, selectors.EVENT_READ, data=None)
+
+        self._set_server_as_stopped()
+        signal.signal(signal.SIGTERM, self._sigterm_signal_handler)
+
+        self._rabbitmq_host = rabbitmq_host
+        self._cleaners_data = cleaners_data
+        self._output_builders_data = output_builders_data
+        self._socket_buffer_size = socket_buffer_size
+
+        self._init_mom_producers(rabbitmq_host)
+
+        self._sessions: dict[str, MultiplexedClientSession] = {}
+        self._events_by_session_id: dict[str, int] = {}
+
+    # ============================== PRIVATE - LOGGING ============================== #
+
+    def _log_debug(self, text: str) -> None:
+        logging.debug(f"{text} | pid: main_process")
+
+    def _log_info(self, text: str) -> None:
+        logging.info(f"{text} | pid: main_process")
+
+    def _log_error(self, text: str) -> None:
+        logging.error(f"{text} | pid: main_process")
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _is_running(self) -> bool:
+        return self._server_running
+
+    def _set_server_as_stopped(self) -> None:
+        self._server_running = False
+
+    def _set_server_as_running(self) -> None:
+        self._server_running = True
+
+    def _build_mom_results_consumer(
+        self, queue_name: str
+    ) -> RabbitMQMessageMiddlewareQueue:
+        return RabbitMQMessageMiddlewareQueue(self._rabbitmq_host, queue_name)
+
+    # ============================== PRIVATE - SIGNAL HANDLER ============================== #
+
+    def _sigterm_signal_handler(self, signum: Any, frame: Any) -> None:
+        self._log_info("action: sigterm_signal_handler | result: in_progress")
+
+        # [IMPORTANT] the event loop notices it on its next tick, so the
+        # sockets are only closed by the thread that uses them
+        self._set_server_as_stopped()
+
+        self._log_info("action: sigterm_signal_handler | result: success")
+
+    # ============================== PRIVATE - ACCEPT CONNECTION ============================== #
+
+    def _accept_new_connections(self) -> None:
+        while True:
+            try:
+                client_socket, addr = self._server_socket.accept()
+            except BlockingIOError:
+                return
+            except OSError as e:
+                self._log_error(
+                    f"action: accept_connections | result: fail | error: {e}"
+                )
+                return
+
+            client_socket.setblocking(False)
+            session = MultiplexedClientSession(
+                client_socket,
+                uuid.uuid4().hex,
+                self._cleaners_data,
+                self._output_builders_data,
+                self._mom_cleaners_connections,
+                self._build_mom_results_consumer,
+                self._sessions.get,
+                self._socket_buffer_size,
+            )
+            self._sessions[session.session_id()] = session
+            self._events_by_session_id[session.session_id()] = selectors.EVENT_READ
+            self._selector.register(client_socket, selectors.EVENT_READ, data=session)
+            self._log_info(
+                f"action: accept_connections | result: success | ip: {addr[0]} | session_id: {session.session_id()} | sessions: {len(self._sessions)}"
+            )
+
+    # ============================== PRIVATE - HANDLE SESSIONS ============================== #
+
+    def _session_events_of(self, session: MultiplexedClientSession) -> int:
+        events = 0
+        if session.wants_to_read():
+            events |= selectors.EVENT_READ
+        if session.wants_to_write():
+            events |= selectors.EVENT_WRITE
+        return events
+
+    def _update_session_events(self, session: MultiplexedClientSession) -> None:
+        session_id = session.session_id()
+        events = self._session_events_of(session)
+        if events == self._events_by_session_id[session_id]:
+            return
+
+        if self._events_by_session_id[session_id] == 0:
+            self._selector.register(session.client_socket(), events, data=session)
+        elif events == 0:
+            self._selector.unregister(session.client_socket())
+        else:
+            self._selector.modify(session.client_socket(), events, data=session)
+        self._events_by_session_id[session_id] = events
+
+    def _close_session(self, session: MultiplexedClientSession) -> None:
+        session_id = session.session_id()
+        if self._events_by_session_id.pop(session_id) != 0:
+            self._selector.unregister(session.client_socket())
+        del self._sessions[session_id]
+
+        try:
+            session.close()
+            self._log_info(
+                f"action: close_session | result: success | session_id: {session_id} | sessions: {len(self._sessions)}"
+            )
+        except Exception as e:
+            self._log_error(
+                f"action: close_session | result: fail | session_id: {session_id} | error: {e}"
+            )
+
+    def _handle_session_events(
+        self, session: MultiplexedClientSession, events: int
+    ) -> None:
+        try:
+            if events & selectors.EVENT_READ:
+                session.handle_readable()
+            if events & selectors.EVENT_WRITE:
+                session.handle_writable()
+        except (BlockingIOError, InterruptedError):
+            pass
+        except Exception as e:
+            self._log_error(
+                f"action: handle_session | result: fail | session_id: {session.session_id()} | error: {e}"
+            )
+            self._close_session(session)
+            return
+
+        self._update_session_events(session)
+
+    def _mom_process_data_events(self) -> None:
+        # [IMPORTANT] deliveries of every session consumer are dispatched
+        # through the pooled connection shared with the cleaners producers
+        mom_producers = next(iter(self._mom_cleaners_connections.values()))
+        mom_producers[0].process_data_events(time_limit=0)
+
+    def _handle_sessions_after_data_events(self) -> None:
+        for session in list(self._sessions.values()):
+            uncaught_exception = session.uncaught_exception()
+            if uncaught_exception is not None:
+                self._log_error(
+                    f"action: handle_session_results | result: fail | session_id: {session.session_id()} | error: {uncaught_exception}"
+                )
+                self._close_session(session)
+            elif session.is_finished():
+                self._close_session(session)
+            else:
+                self._update_session_events(session)
+
+    # ============================== PRIVATE - RUN ============================== #
+
+    def _run(self) -> None:
+        self._set_server_as_running()
+
+        while self._is_running():
+            for key, events in self._selector.select(timeout=EVENT_LOOP_TICK_SECONDS):
+                if key.data is None:
+                    self._accept_new_connections()
+                elif key.data.session_id() in self._sessions:
+                    self._handle_session_events(key.data, events)
+
+            self._mom_process_data_events()
+            self._handle_sessions_after_data_events()
+
+    def _close_all(self) -> None:
+        for session in list(self._sessions.values()):
+            self._close_session(session)
+
+        self._selector.close()
+        self._server_socket.close()
+        self._log_debug("action: server_socket_close | result: success")
+
+        for mom_cleaner_connections in self._mom_cleaners_connections.values():
+            for mom_cleaner_connection in mom_cleaner_connections:
+                mom_cleaner_connection.close()
+                self._log_debug(
+                    f"action: mom_cleaner_connection_close | result: success"
+                )
+
+    def _ensure_connections_close_after_doing(self, callback: Callable) -> None:
+        try:
+            callback()
+        except Exception as e:
+            self._log_error(f"action: server_run | result: fail | error: {e}")
+            raise e
+        finally:
+            self._close_all()
+            self._log_info("action: close_all | result: success")
+
+    # ============================== PUBLIC ============================== #
+
+    def run(self) -> None:
+        self._log_info("action: server_startup | result: success")
+
+        self._ensure_connections_close_after_doing(self._run)
+
+        self._log_info("action: server_shutdown | result: success")
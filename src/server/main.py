@@ -1,8 +1,12 @@
 import logging
 
+from server.event_loop_server import EventLoopServer
 from server.server import Server
 from shared import constants, initializer
 
+PROCESS_PER_CLIENT_SERVER_MODE = "process_per_client"
+EVENT_LOOP_SERVER_MODE = "event_loop"
+
 
 def _build_cleaners_data(config_params: dict) -> dict:
     menu_items_workers_amount = int(config_params["MENU_ITEMS_CLN_AMOUNT"])
@@ -66,12 +70,14 @@ def _build_output_builders_data(config_params: dict) -> dict:
     }
 
 
-def main():
+def main() -> None:
     config_params = initializer.init_config(
         [
             "LOGGING_LEVEL",
             "SERVER_PORT",
             "SERVER_LISTEN_BACKLOG",
+            "SERVER_MODE",
+            "SOCKET_BUFFER_SIZE",
             "RABBITMQ_HOST",
             "MENU_ITEMS_CLN_AMOUNT",
             "STORES_CLN_AMOUNT",
@@ -88,12 +94,21 @@ def main():
     initializer.init_log(config_params["LOGGING_LEVEL"])
     logging.info(f"action: init_config | result: success | params: {config_params}")
 
-    server = Server(
+    server_modes: dict[str, type[Server] | type[EventLoopServer]] = {
+        PROCESS_PER_CLIENT_SERVER_MODE: Server,
+        EVENT_LOOP_SERVER_MODE: EventLoopServer,
+    }
+    server_mode = config_params["SERVER_MODE"]
+    if server_mode not in server_modes:
+        raise ValueError(f"Invalid server mode: {server_mode}")
+
+    server = server_modes[server_mode](
         port=int(config_params["SERVER_PORT"]),
         listen_backlog=int(config_params["SERVER_LISTEN_BACKLOG"]),
         rabbitmq_host=config_params["RABBITMQ_HOST"],
         cleaners_data=_build_cleaners_data(config_params),
         output_builders_data=_build_output_builders_data(config_params),
+        socket_buffer_size=int(config_params["SOCKET_BUFFER_SIZE"]),
     )
     server.run()
 
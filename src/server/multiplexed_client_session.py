@@ -0,0 +1,421 @@
+import logging
+import socket
+from typing import Callable, Mapping, Optional, Protocol, Sequence
+
+from middleware.middleware import MessageMiddleware
+from server.client_message_decoder import ClientMessageDecoder
+from shared import communication_protocol, constants, framed_socket, socket_io
+
+
+class ResultsConsumer(Protocol):
+
+    def register_consumer(self, on_message_callback: Callable) -> None: ...
+
+    def cancel_consumer(self) -> None: ...
+
+    def delete(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class MultiplexedClientSession:
+
+    # ============================== INITIALIZE ============================== #
+
+    def _init_client_data_batch_stats(self) -> None:
+        self._client_eof_received = {
+            communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE: False,
+            communication_protocol.STORES_BATCH_MSG_TYPE: False,
+            communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE: False,
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE: False,
+            communication_protocol.USERS_BATCH_MSG_TYPE: False,
+        }
+
+    def _init_output_builders_data_stats(self) -> None:
+        self._output_builders_eof_received = {
+            constants.QUERY_RESULT_1X: 0,
+            constants.QUERY_RESULT_21: 0,
+            constants.QUERY_RESULT_22: 0,
+            constants.QUERY_RESULT_3X: 0,
+            constants.QUERY_RESULT_4X: 0,
+        }
+
+    def _build_mom_output_builders_connection(self) -> ResultsConsumer:
+        (_, output_builder_data) = next(iter(self._output_builders_data.items()))
+        queue_name = f"{output_builder_data[constants.QUEUE_PREFIX]}-{self._session_id}"
+        return self._build_mom_results_consumer(queue_name)
+
+    def __init__(
+        self,
+        client_socket: socket.socket,
+        session_id: str,
+        cleaners_data: dict,
+        output_builders_data: dict,
+        mom_cleaners_connections: Mapping[str, Sequence[MessageMiddleware]],
+        build_mom_results_consumer: Callable[[str], ResultsConsumer],
+        find_session: Callable[[str], Optional["MultiplexedClientSession"]],
+        socket_buffer_size: int,
+    ) -> None:
+        self._client_socket = client_socket
+        self._socket_io_stats = socket_io.SocketIOStats()
+        self._session_id = session_id
+
+        self._cleaners_data = cleaners_data
+        self._output_builders_data = output_builders_data
+
+        # [IMPORTANT] the producers are shared by all the sessions of the
+        # server, only the round robin position is kept per session
+        self._mom_cleaners_connections = mom_cleaners_connections
+        self._current_worker_id_by_data_type = {
+            data_type: 0 for data_type in self._cleaners_data
+        }
+
+        self._init_client_data_batch_stats()
+        self._init_output_builders_data_stats()
+
+        # [IMPORTANT] the results consumer is only built on the handshake,
+        # upload streams joining another session never consume results
+        self._build_mom_results_consumer = build_mom_results_consumer
+        self._mom_output_builders_connection: Optional[ResultsConsumer] = None
+        self._consuming_results = False
+
+        self._find_session = find_session
+        self._owner_session: Optional["MultiplexedClientSession"] = None
+        self._upload_stream_finished = False
+
+        self._handshake_received = False
+        self._multi_stream_upload = False
+        self._framed_transport = False
+        self._message_decoder = ClientMessageDecoder(
+            socket_buffer_size, self._socket_io_stats
+        )
+
+        self._outgoing_buffer = bytearray()
+        self._all_results_received = False
+        self._uncaught_exception: Optional[Exception] = None
+
+    # ============================== PRIVATE - LOGGING ============================== #
+
+    def _log_debug(self, text: str) -> None:
+        logging.debug(f"{text} | session_id: {self._session_id}")
+
+    def _log_info(self, text: str) -> None:
+        logging.info(f"{text} | session_id: {self._session_id}")
+
+    def _log_error(self, text: str) -> None:
+        logging.error(f"{text} | session_id: {self._session_id}")
+
+    # ============================== PRIVATE - SOCKET SEND MESSAGES ============================== #
+
+    def _use_framed_transport(self) -> None:
+        self._framed_transport = True
+        self._message_decoder.use_framed_transport()
+
+    def _enqueue_message_to_client(self, message: str) -> None:
+        encoded_message = message.encode("utf-8")
+        if self._framed_transport:
+            encoded_message = framed_socket.encode_framed_message(encoded_message)
+        self._outgoing_buffer += encoded_message
+
+    # ============================== PRIVATE - MOM SEND/RECEIVE MESSAGES ============================== #
+
+    def _results_consumer(self) -> ResultsConsumer:
+        if self._mom_output_builders_connection is None:
+            raise ValueError("Results consumer used before the handshake")
+        return self._mom_output_builders_connection
+
+    def _mom_send_message_to_next(self, data_type: str, message: bytes) -> None:
+        current_worker_id = self._current_worker_id_by_data_type[data_type]
+
+        mom_producers = self._mom_cleaners_connections[data_type]
+        mom_producers[current_worker_id].send(message)
+
+        current_worker_id += 1
+        if current_worker_id == len(mom_producers):
+            current_worker_id = 0
+        self._current_worker_id_by_data_type[data_type] = current_worker_id
+
+    # ============================== PRIVATE - RECEIVE CLIENT HANDSHAKE ============================== #
+
+    def _supported_features(self) -> list[str]:
+        return [
+            communication_protocol.COLUMNAR_BATCH_FEATURE,
+            communication_protocol.FRAMED_TRANSPORT_FEATURE,
+            communication_protocol.MULTI_STREAM_UPLOAD_FEATURE,
+            communication_protocol.COLUMN_PUSHDOWN_FEATURE,
+        ]
+
+    def _with_feature_values(self, accepted_features: list[str]) -> list[str]:
+        # [IMPORTANT] the column pushdown is answered with the columns that
+        # the client must send of each data type
+        return [
+            (
+                communication_protocol.encode_column_pushdown_feature(
+                    constants.CLEANED_COLUMNS_BY_DATA_TYPE
+                )
+                if feature == communication_protocol.COLUMN_PUSHDOWN_FEATURE
+                else feature
+            )
+            for feature in accepted_features
+        ]
+
+    def _accept_features(self, requested_features: list[str]) -> list[str]:
+        supported_features = self._supported_features()
+        return self._with_feature_values(
+            [
+                feature
+                for feature in requested_features
+                if feature in supported_features
+            ]
+        )
+
+    def _handle_client_handshake_message(self, raw_message: memoryview) -> None:
+        message = str(raw_message, "utf-8")
+        (client_id, payload) = communication_protocol.decode_handshake_message(message)
+        (queries, requested_features) = communication_protocol.decode_handshake_payload(
+            payload
+        )
+        if queries != communication_protocol.ALL_QUERIES:
+            raise ValueError(
+                f"Invalid handshake payload received from client: {payload}"
+            )
+        self._log_info(
+            f"action: handshake_received | result: success | client_id: {client_id}"
+        )
+
+        accepted_features = self._accept_features(requested_features)
+        handshake_response_payload = communication_protocol.encode_handshake_payload(
+            client_id, accepted_features
+        )
+        self._enqueue_message_to_client(
+            communication_protocol.encode_handshake_message(
+                self._session_id, handshake_response_payload
+            )
+        )
+        self._handshake_received = True
+        self._mom_output_builders_connection = (
+            self._build_mom_output_builders_connection()
+        )
+
+        self._multi_stream_upload = (
+            communication_protocol.MULTI_STREAM_UPLOAD_FEATURE in accepted_features
+        )
+
+        # [IMPORTANT] the handshake itself always travels delimited, the
+        # framed transport is only used from the next message onwards
+        if communication_protocol.FRAMED_TRANSPORT_FEATURE in accepted_features:
+            self._use_framed_transport()
+
+    # ============================== PRIVATE - RECEIVE CLIENT JOIN ============================== #
+
+    def _handle_client_join_message(self, raw_message: memoryview) -> None:
+        message = str(raw_message, "utf-8")
+        (session_id, client_id) = communication_protocol.decode_join_message(message)
+        owner_session = self._find_session(session_id)
+        if owner_session is None or not owner_session.accepts_upload_streams():
+            raise ValueError(
+                f"Invalid session to join received from client: {session_id}"
+            )
+        self._log_info(
+            f"action: join_received | result: success | client_id: {client_id} | owner_session_id: {session_id}"
+        )
+
+        self._enqueue_message_to_client(
+            communication_protocol.encode_join_message(session_id, client_id)
+        )
+        self._owner_session = owner_session
+
+        # [IMPORTANT] upload streams use the transport negotiated by the
+        # session they join, from the message after the join onwards
+        if owner_session.uses_framed_transport():
+            self._use_framed_transport()
+
+    def _handle_client_first_message(self, raw_message: memoryview) -> None:
+        message_type = communication_protocol.get_raw_message_type(raw_message)
+        match message_type:
+            case communication_protocol.HANDSHAKE_MSG_TYPE:
+                self._handle_client_handshake_message(raw_message)
+            case communication_protocol.JOIN_MSG_TYPE:
+                self._handle_client_join_message(raw_message)
+            case _:
+                raise ValueError(
+                    f'Invalid first message type received from client "{message_type}"'
+                )
+
+    # ============================== PRIVATE - RECEIVE CLIENT DATA ============================== #
+
+    def _handle_data_batch_eof_message(self, message: str) -> None:
+        data_type = communication_protocol.decode_eof_message(message)
+        if data_type not in self._client_eof_received:
+            raise ValueError(
+                f'Invalid EOF message type received from client "{data_type}"'
+            )
+        self._client_eof_received[data_type] = True
+        self._log_info(f"action: {data_type}_eof_received | result: success")
+
+        for mom_producer in self._mom_cleaners_connections[data_type]:
+            mom_producer.send(message)
+
+        if all(self._client_eof_received.values()):
+            self._log_info(f"action: all_data_received | result: success")
+            self._results_consumer().register_consumer(
+                self._handle_output_builder_message
+            )
+            self._consuming_results = True
+
+    def _handle_client_data_message(self, raw_message: memoryview) -> None:
+        # [IMPORTANT] only the message type is peeked from the raw bytes,
+        # data batches are forwarded to the cleaners without being decoded
+        message_type = communication_protocol.get_raw_message_type(raw_message)
+        match message_type:
+            case (
+                communication_protocol.MENU_ITEMS_BATCH_MSG_TYPE
+                | communication_protocol.STORES_BATCH_MSG_TYPE
+                | communication_protocol.TRANSACTION_ITEMS_BATCH_MSG_TYPE
+                | communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+                | communication_protocol.USERS_BATCH_MSG_TYPE
+            ):
+                self._mom_send_message_to_next(message_type, bytes(raw_message))
+            case communication_protocol.EOF:
+                self._handle_data_batch_eof_message(str(raw_message, "utf-8"))
+            case _:
+                raise ValueError(
+                    f'Invalid message type received from client "{message_type}"'
+                )
+
+    def _handle_client_message(self, raw_message: memoryview) -> None:
+        if not self._handshake_received and self._owner_session is None:
+            self._handle_client_first_message(raw_message)
+            return
+
+        if self._owner_session is None:
+            self._handle_client_data_message(raw_message)
+            return
+
+        # [IMPORTANT] each upload stream carries the batches of one data type
+        # followed by its EOF, which is accounted by the session it joined
+        self._owner_session.handle_upload_stream_message(raw_message)
+        if (
+            communication_protocol.get_raw_message_type(raw_message)
+            == communication_protocol.EOF
+        ):
+            self._upload_stream_finished = True
+
+    # ============================== PRIVATE - RECEIVE RESULTS ============================== #
+
+    def _all_eof_received_from_output_builders(self) -> bool:
+        for data_type, eof_received in self._output_builders_eof_received.items():
+            workers_amount = self._output_builders_data[data_type][
+                constants.WORKERS_AMOUNT
+            ]
+            if eof_received < workers_amount:
+                return False
+        return True
+
+    def _handle_query_result_eof_message(self, message: str) -> None:
+        data_type = communication_protocol.decode_eof_message(message)
+        if data_type not in self._output_builders_eof_received:
+            raise ValueError(
+                f'Invalid EOF message type received from output builder "{data_type}"'
+            )
+        self._output_builders_eof_received[data_type] += 1
+        self._log_info(f"action: eof_{data_type}_result_received | result: success")
+
+        workers_amount = self._output_builders_data[data_type][constants.WORKERS_AMOUNT]
+        if self._output_builders_eof_received[data_type] == workers_amount:
+            self._enqueue_message_to_client(message)
+            self._log_info(
+                f"action: eof_{data_type}_results_to_client_sent | result: success"
+            )
+
+    def _handle_output_builder_message(self, message_as_bytes: bytes) -> None:
+        # [IMPORTANT] an error of this session must not stop the data events
+        # processing of the shared connection, so it is kept until closing
+        try:
+            message = message_as_bytes.decode("utf-8")
+            message_type = communication_protocol.get_message_type(message)
+            match message_type:
+                case (
+                    communication_protocol.QUERY_RESULT_1X_MSG_TYPE
+                    | communication_protocol.QUERY_RESULT_21_MSG_TYPE
+                    | communication_protocol.QUERY_RESULT_22_MSG_TYPE
+                    | communication_protocol.QUERY_RESULT_3X_MSG_TYPE
+                    | communication_protocol.QUERY_RESULT_4X_MSG_TYPE
+                ):
+                    self._enqueue_message_to_client(message)
+                case communication_protocol.EOF:
+                    self._handle_query_result_eof_message(message)
+                case _:
+                    raise ValueError(
+                        f'Invalid message type received from output builder "{message_type}"'
+                    )
+
+            if self._all_eof_received_from_output_builders():
+                self._results_consumer().cancel_consumer()
+                self._consuming_results = False
+                self._all_results_received = True
+                self._log_info(f"action: all_results_received | result: success")
+        except Exception as e:
+            self._uncaught_exception = e
+
+    # ============================== PUBLIC ============================== #
+
+    def session_id(self) -> str:
+        return self._session_id
+
+    def client_socket(self) -> socket.socket:
+        return self._client_socket
+
+    def accepts_upload_streams(self) -> bool:
+        return self._multi_stream_upload and self.wants_to_read()
+
+    def uses_framed_transport(self) -> bool:
+        return self._framed_transport
+
+    def handle_upload_stream_message(self, raw_message: memoryview) -> None:
+        self._handle_client_data_message(raw_message)
+
+    def wants_to_read(self) -> bool:
+        if self._owner_session is not None:
+            return not self._upload_stream_finished
+        return not all(self._client_eof_received.values())
+
+    def wants_to_write(self) -> bool:
+        return len(self._outgoing_buffer) > 0
+
+    def is_finished(self) -> bool:
+        if self._owner_session is not None:
+            return self._upload_stream_finished and not self.wants_to_write()
+        return self._all_results_received and not self.wants_to_write()
+
+    def uncaught_exception(self) -> Optional[Exception]:
+        return self._uncaught_exception
+
+    def handle_readable(self) -> None:
+        self._message_decoder.receive_from(self._client_socket)
+        message = self._message_decoder.next_message()
+        while message is not None:
+            self._handle_client_message(message)
+            message = self._message_decoder.next_message()
+
+    def handle_writable(self) -> None:
+        bytes_sent = self._client_socket.send(self._outgoing_buffer)
+        self._socket_io_stats.record_send(bytes_sent)
+        del self._outgoing_buffer[:bytes_sent]
+
+    def close(self) -> None:
+        try:
+            if self._mom_output_builders_connection is not None:
+                if self._consuming_results:
+                    self._mom_output_builders_connection.cancel_consumer()
+                self._mom_output_builders_connection.delete()
+                self._mom_output_builders_connection.close()
+                self._log_debug(
+                    f"action: mom_output_builder_connection_close | result: success"
+                )
+        finally:
+            self._client_socket.close()
+            self._log_debug(f"action: client_socket_close | result: success")
+            self._log_info(
+                f"action: socket_io_stats | result: success | {self._socket_io_stats.as_log_fields()}"
+            )
@@ -6,6 +6,7 @@ from collections.abc import Callable
 from typing import Any, Optional
 
 from server.client_session_handler import ClientSessionHandler
+from shared import socket_io
 
 
 class Server:
@@ -19,8 +20,12 @@ class Server:
         rabbitmq_host: str,
         cleaners_data: dict,
         output_builders_data: dict,
+        socket_buffer_size: int,
     ) -> None:
         self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # [IMPORTANT] accepted sockets inherit the buffer sizes of the
+        # listening socket, which must be set before listening
+        socket_io.tune_socket_buffers(self._server_socket, socket_buffer_size)
         self._server_socket.bind(("", port))
         self._server_socket.listen(listen_backlog)
 
@@ -31,6 +36,7 @@ class Server:
         self._rabbitmq_host = rabbitmq_host
         self._cleaners_data = cleaners_data
         self._output_builders_data = output_builders_data
+        self._socket_buffer_size = socket_buffer_size
 
         self._spawned_processes: list[multiprocessing.Process] = []
 
@@ -158,6 +164,7 @@ class Server:
             self._rabbitmq_host,
             self._cleaners_data,
             self._output_builders_data,
+            self._socket_buffer_size,
         ).run()
 
     def _handle_client_connection_spawning_process(
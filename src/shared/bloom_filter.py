@@ -0,0 +1,80 @@
+import hashlib
+import math
+
+# bytes of the blake2b digest, split in two halves for double hashing
+BLOOM_FILTER_DIGEST_SIZE = 16
+
+MIN_BITS_AMOUNT = 8
+
+
+def optimal_bits_amount(expected_items_amount: int, false_positive_rate: float) -> int:
+    if expected_items_amount <= 0:
+        return MIN_BITS_AMOUNT
+    bits_amount = -expected_items_amount * math.log(false_positive_rate)
+    bits_amount /= math.log(2) ** 2
+    return max(MIN_BITS_AMOUNT, math.ceil(bits_amount))
+
+
+def optimal_hashes_amount(expected_items_amount: int, bits_amount: int) -> int:
+    if expected_items_amount <= 0:
+        return 1
+    hashes_amount = bits_amount / expected_items_amount * math.log(2)
+    return max(1, round(hashes_amount))
+
+
+class BloomFilter:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self, bits_amount: int, hashes_amount: int, bits: bytes = b"") -> None:
+        self._bits_amount = bits_amount
+        self._hashes_amount = hashes_amount
+
+        self._bits = bytearray((bits_amount + 7) // 8)
+        self._bits[: len(bits)] = bits
+
+    @classmethod
+    def for_expected_items(
+        cls, expected_items_amount: int, false_positive_rate: float
+    ) -> "BloomFilter":
+        bits_amount = optimal_bits_amount(expected_items_amount, false_positive_rate)
+        hashes_amount = optimal_hashes_amount(expected_items_amount, bits_amount)
+        return cls(bits_amount, hashes_amount)
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _bit_positions_of(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(
+            item.encode("utf-8"), digest_size=BLOOM_FILTER_DIGEST_SIZE
+        ).digest()
+        half = BLOOM_FILTER_DIGEST_SIZE // 2
+        first_hash = int.from_bytes(digest[:half], byteorder="big")
+        second_hash = int.from_bytes(digest[half:], byteorder="big")
+
+        # [IMPORTANT] double hashing: the k positions are derived from two
+        # independent hashes instead of computing k different digests
+        return [
+            (first_hash + i * second_hash) % self._bits_amount
+            for i in range(self._hashes_amount)
+        ]
+
+    # ============================== PUBLIC ============================== #
+
+    def add(self, item: str) -> None:
+        for position in self._bit_positions_of(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._bit_positions_of(item)
+        )
+
+    def bits_amount(self) -> int:
+        return self._bits_amount
+
+    def hashes_amount(self) -> int:
+        return self._hashes_amount
+
+    def bits(self) -> bytes:
+        return bytes(self._bits)
@@ -1,8 +1,12 @@
+import base64
+from typing import Union
+
 # the fixed length of the message type prefix in the protocol
 MESSAGE_TYPE_LENGTH = 3
 
 # messages types
 HANDSHAKE_MSG_TYPE = "HSK"
+JOIN_MSG_TYPE = "JON"
 
 MENU_ITEMS_BATCH_MSG_TYPE = "MIT"
 STORES_BATCH_MSG_TYPE = "STR"
@@ -10,6 +14,8 @@ TRANSACTION_ITEMS_BATCH_MSG_TYPE = "TIT"
 TRANSACTIONS_BATCH_MSG_TYPE = "TRN"
 USERS_BATCH_MSG_TYPE = "USR"
 
+BLOOM_FILTER_MSG_TYPE = "BLM"
+
 QUERY_RESULT_1X_MSG_TYPE = "Q1X"
 QUERY_RESULT_21_MSG_TYPE = "Q21"
 QUERY_RESULT_22_MSG_TYPE = "Q22"
@@ -27,10 +33,24 @@ BATCH_END_DELIMITER = "}"
 BATCH_ROW_SEPARATOR = ";"
 ROW_FIELD_SEPARATOR = ","
 
+SCHEMA_START_DELIMITER = "<"
+SCHEMA_END_DELIMITER = ">"
+
+HANDSHAKE_FEATURES_SEPARATOR = "&"
+HANDSHAKE_FEATURE_VALUE_SEPARATOR = ":"
+COLUMN_SETS_SEPARATOR = ";"
+DATA_TYPE_COLUMNS_SEPARATOR = "="
+
 # payload
 ALL_QUERIES = "Q1X;Q21;Q22;Q3X;Q4X"
 EOF = "EOF"
 
+# handshake features
+COLUMNAR_BATCH_FEATURE = "CLB"
+FRAMED_TRANSPORT_FEATURE = "LPF"
+MULTI_STREAM_UPLOAD_FEATURE = "MSU"
+COLUMN_PUSHDOWN_FEATURE = "CPD"
+
 # ============================= PRIVATE - DECODE ============================== #
 
 
@@ -63,6 +83,24 @@ def _decode_row(encoded_row: str) -> dict[str, str]:
     return row
 
 
+def _decode_columnar_payload(payload: str) -> list[dict[str, str]]:
+    schema_end = payload.index(SCHEMA_END_DELIMITER)
+    column_names = payload[len(SCHEMA_START_DELIMITER) : schema_end].split(
+        ROW_FIELD_SEPARATOR
+    )
+
+    encoded_rows = payload[schema_end + len(SCHEMA_END_DELIMITER) :]
+    decoded_rows = []
+    for encoded_row in encoded_rows.split(BATCH_ROW_SEPARATOR):
+        fields = encoded_row.split(ROW_FIELD_SEPARATOR)
+        if len(fields) != len(column_names):
+            raise ValueError(
+                f"Unexpected row fields amount. Expected: {len(column_names)}, Received: {len(fields)}"
+            )
+        decoded_rows.append(dict(zip(column_names, fields)))
+    return decoded_rows
+
+
 def _decode_batch_message_with_type(
     message_type: str, message: str
 ) -> list[dict[str, str]]:
@@ -83,8 +121,10 @@ def get_message_session_id(message: str) -> str:
 
 
 def get_message_payload(message: str) -> str:
+    # [IMPORTANT] the message is already split from the stream, so the
+    # payload ends at its last delimiter and values may contain it
     payload_start = message.index(MSG_START_DELIMITER)
-    payload_end = message.index(MSG_END_DELIMITER, payload_start)
+    payload_end = message.rindex(MSG_END_DELIMITER, payload_start)
 
     payload = message[payload_start + 1 : payload_end]
 
@@ -104,13 +144,48 @@ def get_message_type(message: str) -> str:
     return message[:MESSAGE_TYPE_LENGTH]
 
 
+def get_raw_message_type(raw_message: Union[bytes, memoryview]) -> str:
+    if len(raw_message) < MESSAGE_TYPE_LENGTH:
+        raise ValueError(
+            f"Message too short to contain a valid message type: {bytes(raw_message)!r}"
+        )
+    return str(raw_message[:MESSAGE_TYPE_LENGTH], "utf-8")
+
+
 def decode_handshake_message(message: str) -> tuple[str, str]:
     _assert_message_format(HANDSHAKE_MSG_TYPE, message)
     return get_message_session_id(message), get_message_payload(message)
 
 
+def decode_handshake_payload(payload: str) -> tuple[str, list[str]]:
+    value, *features = payload.split(HANDSHAKE_FEATURES_SEPARATOR)
+    return value, features
+
+
+def decode_column_pushdown_feature(features: list[str]) -> dict[str, list[str]]:
+    feature_prefix = COLUMN_PUSHDOWN_FEATURE + HANDSHAKE_FEATURE_VALUE_SEPARATOR
+    for feature in features:
+        if not feature.startswith(feature_prefix):
+            continue
+
+        columns_by_data_type = {}
+        for column_set in feature[len(feature_prefix) :].split(COLUMN_SETS_SEPARATOR):
+            data_type, columns = column_set.split(DATA_TYPE_COLUMNS_SEPARATOR)
+            columns_by_data_type[data_type] = columns.split(ROW_FIELD_SEPARATOR)
+        return columns_by_data_type
+    return {}
+
+
+def decode_join_message(message: str) -> tuple[str, str]:
+    _assert_message_format(JOIN_MSG_TYPE, message)
+    return get_message_session_id(message), get_message_payload(message)
+
+
 def decode_batch_message(message: str) -> list[dict[str, str]]:
     payload = get_message_payload(message)
+    if payload.startswith(SCHEMA_START_DELIMITER):
+        return _decode_columnar_payload(payload)
+
     encoded_rows = payload.split(BATCH_ROW_SEPARATOR)
     decoded_rows = []
 
@@ -146,6 +221,13 @@ def decode_eof_message(message: str) -> str:
     return get_message_payload(message)
 
 
+def decode_bloom_filter_message(message: str) -> tuple[int, int, bytes]:
+    _assert_message_format(BLOOM_FILTER_MSG_TYPE, message)
+    payload = get_message_payload(message)
+    bits_amount, hashes_amount, encoded_bits = payload.split(ROW_FIELD_SEPARATOR)
+    return int(bits_amount), int(hashes_amount), base64.b64decode(encoded_bits)
+
+
 # ============================= PRIVATE - ENCODE ============================== #
 
 
@@ -169,6 +251,28 @@ def _encode_row(row: dict[str, str]) -> str:
     return BATCH_START_DELIMITER + ecoded_row + BATCH_END_DELIMITER
 
 
+def _encode_columnar_payload(batch: list[dict[str, str]]) -> str:
+    if len(batch) == 0:
+        return ""
+
+    column_names = list(batch[0].keys())
+    encoded_rows = []
+    for row in batch:
+        if row.keys() != batch[0].keys():
+            raise ValueError(
+                f"Unexpected row columns. Expected: {column_names}, Received: {list(row.keys())}"
+            )
+        encoded_rows.append(
+            ROW_FIELD_SEPARATOR.join([row[column_name] for column_name in column_names])
+        )
+
+    encoded_payload = SCHEMA_START_DELIMITER
+    encoded_payload += ROW_FIELD_SEPARATOR.join(column_names)
+    encoded_payload += SCHEMA_END_DELIMITER
+    encoded_payload += BATCH_ROW_SEPARATOR.join(encoded_rows)
+    return encoded_payload
+
+
 # ============================= ENCODE ============================== #
 
 
@@ -176,11 +280,36 @@ def encode_handshake_message(id: str, payload: str) -> str:
     return _encode_message(HANDSHAKE_MSG_TYPE, id, payload)
 
 
+def encode_handshake_payload(value: str, features: list[str]) -> str:
+    return HANDSHAKE_FEATURES_SEPARATOR.join([value, *features])
+
+
+def encode_column_pushdown_feature(columns_by_data_type: dict[str, list[str]]) -> str:
+    column_sets = [
+        data_type + DATA_TYPE_COLUMNS_SEPARATOR + ROW_FIELD_SEPARATOR.join(columns)
+        for data_type, columns in columns_by_data_type.items()
+    ]
+    return (
+        COLUMN_PUSHDOWN_FEATURE
+        + HANDSHAKE_FEATURE_VALUE_SEPARATOR
+        + COLUMN_SETS_SEPARATOR.join(column_sets)
+    )
+
+
+def encode_join_message(session_id: str, client_id: str) -> str:
+    return _encode_message(JOIN_MSG_TYPE, session_id, client_id)
+
+
 def encode_batch_message(
     batch_msg_type: str,
     session_id: str,
     batch: list[dict[str, str]],
+    columnar: bool = True,
 ) -> str:
+    if columnar:
+        encoded_payload = _encode_columnar_payload(batch)
+        return _encode_message(batch_msg_type, session_id, encoded_payload)
+
     encoded_rows = []
 
     for item_batch in batch:
@@ -194,57 +323,77 @@ def encode_batch_message(
 def encode_menu_items_batch_message(
     session_id: str,
     menu_items_batch: list[dict[str, str]],
+    columnar: bool = True,
 ) -> str:
     return encode_batch_message(
         MENU_ITEMS_BATCH_MSG_TYPE,
         session_id,
         menu_items_batch,
+        columnar,
     )
 
 
 def encode_stores_batch_message(
     session_id: str,
     stores_batch: list[dict[str, str]],
+    columnar: bool = True,
 ) -> str:
     return encode_batch_message(
         STORES_BATCH_MSG_TYPE,
         session_id,
         stores_batch,
+        columnar,
     )
 
 
 def encode_transaction_items_batch_message(
     session_id: str,
     transaction_items_batch: list[dict[str, str]],
+    columnar: bool = True,
 ) -> str:
     return encode_batch_message(
         TRANSACTION_ITEMS_BATCH_MSG_TYPE,
         session_id,
         transaction_items_batch,
+        columnar,
     )
 
 
 def encode_transactions_batch_message(
     session_id: str,
     transactions_batch: list[dict[str, str]],
+    columnar: bool = True,
 ) -> str:
     return encode_batch_message(
         TRANSACTIONS_BATCH_MSG_TYPE,
         session_id,
         transactions_batch,
+        columnar,
     )
 
 
 def encode_users_batch_message(
     session_id: str,
     users_batch: list[dict[str, str]],
+    columnar: bool = True,
 ) -> str:
     return encode_batch_message(
         USERS_BATCH_MSG_TYPE,
         session_id,
         users_batch,
+        columnar,
     )
 
 
 def encode_eof_message(session_id: str, message_type: str) -> str:
     return _encode_message(EOF, session_id, message_type)
+
+
+def encode_bloom_filter_message(
+    session_id: str, bits_amount: int, hashes_amount: int, bits: bytes
+) -> str:
+    encoded_bits = base64.b64encode(bits).decode("ascii")
+    payload = ROW_FIELD_SEPARATOR.join(
+        [str(bits_amount), str(hashes_amount), encoded_bits]
+    )
+    return _encode_message(BLOOM_FILTER_MSG_TYPE, session_id, payload)
@@ -3,6 +3,7 @@ from shared import communication_protocol
 # ============================== COMMON CONSTANTS ============================== #
 
 KiB = 1024
+MiB = 1024 * KiB
 
 # ============================== COMMON TAGS ============================== #
 
@@ -30,6 +31,31 @@ TRN_FOLDER_NAME = "transactions"
 USR_FOLDER_NAME = "users"
 QRS_FOLDER_NAME = "query_results"
 
+# ============================== CLEANED COLUMNS ============================== #
+
+# [IMPORTANT] the only columns used by the queries, the rest are dropped
+# by the cleaners or never sent by the clients that support it
+
+MIT_CLEANED_COLUMNS = ["item_id", "item_name"]
+STR_CLEANED_COLUMNS = ["store_id", "store_name"]
+TIT_CLEANED_COLUMNS = ["created_at", "item_id", "subtotal", "quantity"]
+TRN_CLEANED_COLUMNS = [
+    "created_at",
+    "store_id",
+    "final_amount",
+    "transaction_id",
+    "user_id",
+]
+USR_CLEANED_COLUMNS = ["user_id", "birthdate"]
+
+CLEANED_COLUMNS_BY_DATA_TYPE = {
+    MENU_ITEMS: MIT_CLEANED_COLUMNS,
+    STORES: STR_CLEANED_COLUMNS,
+    TRANSACTION_ITEMS: TIT_CLEANED_COLUMNS,
+    TRANSACTIONS: TRN_CLEANED_COLUMNS,
+    USERS: USR_CLEANED_COLUMNS,
+}
+
 # ============================== MOM ============================== #
 
 # dirty data
@@ -113,6 +139,10 @@ TPV_BY_HALF_YEAR_CREATED_AT__STORE_NAME_QUEUE_PREFIX = (
 
 # query 4
 
+# [IMPORTANT] published on the filtered transactions by year exchange,
+# only the purchases reducers bind this routing key
+USR_BLOOM_FILTER_ROUTING_KEY_PREFIX = "Q4X__usr-bloom-filter-routing-key"
+
 PURCHASES_QTY_BY_USR_ID__STORE_ID_QUEUE_PREFIX = (
     "Q4X__trn-purchases-qty-by-user-id-&-store-id"
 )
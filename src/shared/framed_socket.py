@@ -0,0 +1,46 @@
+import socket
+import struct
+from typing import Optional
+
+from shared import constants
+from shared.socket_io import SocketReader
+
+# the fixed length header carries the payload length as an unsigned
+# 32 bits big endian integer
+FRAME_HEADER_FORMAT = "!I"
+FRAME_HEADER_LENGTH = struct.calcsize(FRAME_HEADER_FORMAT)
+
+# ============================== PUBLIC ============================== #
+
+
+def encode_framed_message(payload: bytes) -> bytes:
+    return struct.pack(FRAME_HEADER_FORMAT, len(payload)) + payload
+
+
+def send_framed_message(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(encode_framed_message(payload))
+
+
+class FramedMessageReceiver:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        initial_buffer_size: int = 64 * constants.KiB,
+        socket_reader: Optional[SocketReader] = None,
+    ) -> None:
+        # [IMPORTANT] the reader may be shared with the delimited transport
+        # of the same socket, so the bytes read ahead are never lost
+        if socket_reader is None:
+            socket_reader = SocketReader(initial_buffer_size)
+        self._socket_reader = socket_reader
+
+    # ============================== PUBLIC ============================== #
+
+    def receive_message(self, sock: socket.socket) -> memoryview:
+        # [IMPORTANT] the returned view is only valid until the next call,
+        # because the same buffer is reused for every message
+        header_view = self._socket_reader.read_exactly(sock, FRAME_HEADER_LENGTH)
+        (payload_length,) = struct.unpack(FRAME_HEADER_FORMAT, header_view)
+        return self._socket_reader.read_exactly(sock, payload_length)
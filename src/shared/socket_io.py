@@ -0,0 +1,172 @@
+import socket
+from typing import Optional
+
+from shared import constants
+
+DEFAULT_SOCKET_BUFFER_SIZE = 64 * constants.KiB
+
+
+def tune_socket_buffers(sock: socket.socket, buffer_size: int) -> None:
+    # [IMPORTANT] the kernel may round or cap the requested sizes
+    # (e.g. net.core.rmem_max), so this is only a hint
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+
+
+class SocketIOStats:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(self) -> None:
+        self._recv_calls = 0
+        self._bytes_received = 0
+        self._send_calls = 0
+        self._bytes_sent = 0
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _calls_per_mib(self, calls: int, total_bytes: int) -> float:
+        if total_bytes == 0:
+            return 0.0
+        return round(calls / (total_bytes / constants.MiB), 2)
+
+    # ============================== PUBLIC ============================== #
+
+    def record_recv(self, bytes_received: int) -> None:
+        self._recv_calls += 1
+        self._bytes_received += bytes_received
+
+    def record_send(self, bytes_sent: int) -> None:
+        self._send_calls += 1
+        self._bytes_sent += bytes_sent
+
+    def recv_calls_per_mib(self) -> float:
+        return self._calls_per_mib(self._recv_calls, self._bytes_received)
+
+    def send_calls_per_mib(self) -> float:
+        return self._calls_per_mib(self._send_calls, self._bytes_sent)
+
+    def as_log_fields(self) -> str:
+        return (
+            f"recv_calls: {self._recv_calls} | bytes_received: {self._bytes_received}"
+            f" | recv_calls_per_mib: {self.recv_calls_per_mib()}"
+            f" | send_calls: {self._send_calls} | bytes_sent: {self._bytes_sent}"
+            f" | send_calls_per_mib: {self.send_calls_per_mib()}"
+        )
+
+
+class SocketReader:
+
+    # ============================== INITIALIZE ============================== #
+
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_SOCKET_BUFFER_SIZE,
+        stats: Optional[SocketIOStats] = None,
+    ) -> None:
+        self._buffer_size = buffer_size
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+
+        # [IMPORTANT] the bytes between both offsets were received but not
+        # read yet, they are moved to the front only when the tail is full
+        self._read_offset = 0
+        self._write_offset = 0
+
+        self._stats = stats if stats is not None else SocketIOStats()
+
+    # ============================== PRIVATE - SUPPORT ============================== #
+
+    def _unread_bytes_amount(self) -> int:
+        return self._write_offset - self._read_offset
+
+    def _make_room_for(self, bytes_amount: int) -> None:
+        unread_bytes_amount = self._unread_bytes_amount()
+        if len(self._buffer) - self._write_offset >= bytes_amount - unread_bytes_amount:
+            return
+
+        new_buffer_size = len(self._buffer)
+        while new_buffer_size < bytes_amount:
+            new_buffer_size *= 2
+
+        unread_bytes = bytes(self._view[self._read_offset : self._write_offset])
+        if new_buffer_size == len(self._buffer):
+            self._buffer[:unread_bytes_amount] = unread_bytes
+        else:
+            # [IMPORTANT] views returned before may still reference the old
+            # buffer, so it is replaced instead of resized
+            new_buffer = bytearray(new_buffer_size)
+            new_buffer[:unread_bytes_amount] = unread_bytes
+            self._buffer = new_buffer
+            self._view = memoryview(self._buffer)
+
+        self._read_offset = 0
+        self._write_offset = unread_bytes_amount
+
+    def _receive_once(self, sock: socket.socket) -> None:
+        bytes_received = sock.recv_into(self._view[self._write_offset :])
+        if bytes_received == 0:
+            raise OSError("Unexpected disconnection of the peer")
+        self._stats.record_recv(bytes_received)
+        self._write_offset += bytes_received
+
+    def _receive_at_least(self, sock: socket.socket, bytes_amount: int) -> None:
+        self._make_room_for(bytes_amount)
+        while self._unread_bytes_amount() < bytes_amount:
+            self._receive_once(sock)
+
+    # ============================== PUBLIC ============================== #
+
+    def stats(self) -> SocketIOStats:
+        return self._stats
+
+    def read_exactly(self, sock: socket.socket, bytes_amount: int) -> memoryview:
+        # [IMPORTANT] the returned view is only valid until the next read,
+        # because the same buffer is reused for every message
+        self._receive_at_least(sock, bytes_amount)
+        view = self._view[self._read_offset : self._read_offset + bytes_amount]
+        self._read_offset += bytes_amount
+        return view
+
+    def read_until_last_delimiter(self, sock: socket.socket, delimiter: bytes) -> bytes:
+        while True:
+            delimiter_index = self._buffer.rfind(
+                delimiter, self._read_offset, self._write_offset
+            )
+            if delimiter_index != -1:
+                data_end = delimiter_index + len(delimiter)
+                data = bytes(self._view[self._read_offset : data_end])
+                self._read_offset = data_end
+                return data
+
+            self._receive_at_least(sock, self._unread_bytes_amount() + 1)
+
+    # ============================== PUBLIC - NON BLOCKING ============================== #
+
+    def receive_available(self, sock: socket.socket) -> None:
+        # [IMPORTANT] a single recv call, meant for sockets already reported
+        # as readable, half of the buffer size is kept free to receive into
+        free_bytes_amount = max(self._buffer_size // 2, 1)
+        self._make_room_for(self._unread_bytes_amount() + free_bytes_amount)
+        self._receive_once(sock)
+
+    def peek_available(self, bytes_amount: int) -> Optional[memoryview]:
+        if self._unread_bytes_amount() < bytes_amount:
+            return None
+        return self._view[self._read_offset : self._read_offset + bytes_amount]
+
+    def read_available(self, bytes_amount: int) -> Optional[memoryview]:
+        view = self.peek_available(bytes_amount)
+        if view is not None:
+            self._read_offset += bytes_amount
+        return view
+
+    def read_available_until_delimiter(self, delimiter: bytes) -> Optional[memoryview]:
+        delimiter_index = self._buffer.find(
+            delimiter, self._read_offset, self._write_offset
+        )
+        if delimiter_index == -1:
+            return None
+        return self.read_available(
+            delimiter_index + len(delimiter) - self._read_offset
+        )
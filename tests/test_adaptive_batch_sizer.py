@@ -0,0 +1,77 @@
+import pytest
+
+from client.adaptive_batch_sizer import (
+    ADDITIVE_INCREASE_BYTES,
+    AdaptiveBatchSizer,
+)
+from shared import constants
+
+
+class TestAdaptiveBatchSizer:
+
+    # ============================== TESTS - ADAPT ============================== #
+
+    def test_target_grows_up_to_the_max_while_latency_is_stable(self) -> None:
+        batch_sizer = AdaptiveBatchSizer(64 * constants.KiB, 256 * constants.KiB)
+        assert batch_sizer.target_batch_bytes() == 64 * constants.KiB
+
+        batch_sizer.record_sent_batch(64 * constants.KiB, 100, 0.001)
+        assert (
+            batch_sizer.target_batch_bytes()
+            == 64 * constants.KiB + ADDITIVE_INCREASE_BYTES
+        )
+
+        for _ in range(20):
+            target_batch_bytes = batch_sizer.target_batch_bytes()
+            batch_sizer.record_sent_batch(
+                target_batch_bytes, 100, target_batch_bytes / (64 * constants.MiB)
+            )
+        assert batch_sizer.target_batch_bytes() == 256 * constants.KiB
+
+    def test_target_halves_down_to_the_min_when_latency_spikes(self) -> None:
+        batch_sizer = AdaptiveBatchSizer(64 * constants.KiB, 256 * constants.KiB)
+        for _ in range(20):
+            batch_sizer.record_sent_batch(batch_sizer.target_batch_bytes(), 100, 0.001)
+        assert batch_sizer.target_batch_bytes() == 256 * constants.KiB
+
+        batch_sizer.record_sent_batch(256 * constants.KiB, 100, 1.0)
+        assert batch_sizer.target_batch_bytes() == 128 * constants.KiB
+
+        batch_sizer.record_sent_batch(128 * constants.KiB, 100, 10.0)
+        batch_sizer.record_sent_batch(64 * constants.KiB, 100, 100.0)
+        assert batch_sizer.target_batch_bytes() == 64 * constants.KiB
+        assert "congested_batches: 3" in batch_sizer.as_log_fields()
+
+    def test_noise_level_latency_variations_do_not_cut_the_target(self) -> None:
+        batch_sizer = AdaptiveBatchSizer(64 * constants.KiB, 256 * constants.KiB)
+        for _ in range(20):
+            batch_sizer.record_sent_batch(
+                batch_sizer.target_batch_bytes(), 100, 0.00002
+            )
+        assert batch_sizer.target_batch_bytes() == 256 * constants.KiB
+
+        for _ in range(5):
+            batch_sizer.record_sent_batch(256 * constants.KiB, 100, 0.0002)
+        assert batch_sizer.target_batch_bytes() == 256 * constants.KiB
+        assert "congested_batches: 0" in batch_sizer.as_log_fields()
+
+    def test_invalid_range_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            AdaptiveBatchSizer(256 * constants.KiB, 64 * constants.KiB)
+
+    # ============================== TESTS - STATS ============================== #
+
+    def test_batch_sizes_distribution_is_reported(self) -> None:
+        batch_sizer = AdaptiveBatchSizer(64 * constants.KiB, 80 * constants.KiB)
+        assert batch_sizer.as_log_fields() == "batches: 0"
+
+        batch_sizer.record_sent_batch(60_000, 10, 0.001)
+        batch_sizer.record_sent_batch(80_000, 30, 0.001)
+
+        log_fields = batch_sizer.as_log_fields()
+        assert "batches: 2" in log_fields
+        assert "avg_batch_bytes: 70000" in log_fields
+        assert "min_batch_bytes: 60000" in log_fields
+        assert "max_batch_bytes: 80000" in log_fields
+        assert "avg_batch_rows: 20" in log_fields
+        assert "batches_by_target: {64KiB: 1, 80KiB: 1}" in log_fields
@@ -0,0 +1,100 @@
+import threading
+from typing import Any, Callable, Optional
+
+from controllers.joiners.shared.base_data_handler import BaseDataHandler
+from middleware.middleware import MessageMiddleware
+from shared import communication_protocol
+from shared.bloom_filter import BloomFilter
+
+
+class _RecordingMiddleware(MessageMiddleware):
+
+    def __init__(self) -> None:
+        self.sent_messages: list[str | bytes] = []
+        self.on_message_callback: Optional[Callable] = None
+
+    def start_consuming(self, on_message_callback: Callable) -> None:
+        self.on_message_callback = on_message_callback
+
+    def stop_consuming(self) -> None:
+        self.on_message_callback = None
+
+    def send(self, message: str | bytes) -> None:
+        self.sent_messages.append(message)
+
+    def close(self) -> None:
+        pass
+
+    def delete(self) -> None:
+        pass
+
+
+class TestBaseDataHandler:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _session_id(self) -> str:
+        return "a1b2c3"
+
+    def _users_handler(
+        self,
+        base_data_by_session_id: dict[str, dict[Any, tuple[str, ...]]],
+        mom_bloom_filter_producer: _RecordingMiddleware,
+        on_all_base_data_received: Callable[[str], None],
+    ) -> BaseDataHandler:
+        return BaseDataHandler(
+            controller_id=0,
+            rabbitmq_host="localhost",
+            consumers_config={"base_data_prev_controllers_amount": 1},
+            producers_config={"bloom_filter_false_positive_rate": 0.0001},
+            build_mom_consumer=lambda *args: _RecordingMiddleware(),
+            build_mom_bloom_filter_producers=lambda *args: [mom_bloom_filter_producer],
+            base_data_by_session_id=base_data_by_session_id,
+            base_data_by_session_id_lock=threading.Lock(),
+            all_base_data_received={},
+            all_base_data_received_lock=threading.Lock(),
+            join_key="user_id",
+            base_data_columns=["birthdate"],
+            transform_function=lambda value: int(float(value)),
+            on_all_base_data_received=on_all_base_data_received,
+            dimension_cache=None,
+            is_stopped=threading.Event(),
+        )
+
+    # ============================== TESTS - BLOOM FILTERS ============================== #
+
+    def test_bloom_filter_is_sent_before_releasing_the_stream_side(self) -> None:
+        base_data_by_session_id: dict[str, dict[Any, tuple[str, ...]]] = {}
+        mom_bloom_filter_producer = _RecordingMiddleware()
+
+        # the stream side cleans the base data of the session once released
+        def on_all_base_data_received(session_id: str) -> None:
+            del base_data_by_session_id[session_id]
+
+        handler = self._users_handler(
+            base_data_by_session_id,
+            mom_bloom_filter_producer,
+            on_all_base_data_received,
+        )
+        batch_message = communication_protocol.encode_users_batch_message(
+            self._session_id(),
+            [
+                {"user_id": "5.0", "birthdate": "1990-01-01"},
+                {"user_id": "7.0", "birthdate": "1991-01-01"},
+            ],
+        )
+        eof_message = communication_protocol.encode_eof_message(
+            self._session_id(), communication_protocol.USERS_BATCH_MSG_TYPE
+        )
+
+        handler._handle_base_data(batch_message.encode("utf-8"))
+        handler._handle_base_data(eof_message.encode("utf-8"))
+
+        assert len(mom_bloom_filter_producer.sent_messages) == 1
+        bloom_filter = BloomFilter(
+            *communication_protocol.decode_bloom_filter_message(
+                str(mom_bloom_filter_producer.sent_messages[0])
+            )
+        )
+        assert bloom_filter.might_contain("5")
+        assert bloom_filter.might_contain("7")
@@ -0,0 +1,51 @@
+from shared import communication_protocol
+from shared.bloom_filter import BloomFilter
+
+
+class TestBloomFilter:
+
+    # ============================== TESTS - MEMBERSHIP ============================== #
+
+    def test_added_items_are_always_contained(self) -> None:
+        bloom_filter = BloomFilter.for_expected_items(1000, 0.01)
+        for user_id in range(1000):
+            bloom_filter.add(str(user_id))
+
+        assert all(bloom_filter.might_contain(str(user_id)) for user_id in range(1000))
+
+    def test_false_positive_rate_is_close_to_the_configured_one(self) -> None:
+        bloom_filter = BloomFilter.for_expected_items(1000, 0.01)
+        for user_id in range(1000):
+            bloom_filter.add(str(user_id))
+
+        false_positives = sum(
+            bloom_filter.might_contain(str(user_id)) for user_id in range(1000, 11000)
+        )
+        assert false_positives < 300
+
+    def test_empty_filter_contains_nothing(self) -> None:
+        bloom_filter = BloomFilter.for_expected_items(0, 0.01)
+
+        assert not bloom_filter.might_contain("1")
+
+    # ============================== TESTS - ENCODING ============================== #
+
+    def test_bloom_filter_message_round_trip(self) -> None:
+        bloom_filter = BloomFilter.for_expected_items(10, 0.01)
+        for user_id in ["1", "2", "3"]:
+            bloom_filter.add(user_id)
+
+        message = communication_protocol.encode_bloom_filter_message(
+            "session-1",
+            bloom_filter.bits_amount(),
+            bloom_filter.hashes_amount(),
+            bloom_filter.bits(),
+        )
+        bits_amount, hashes_amount, bits = (
+            communication_protocol.decode_bloom_filter_message(message)
+        )
+        decoded_bloom_filter = BloomFilter(bits_amount, hashes_amount, bits)
+
+        assert communication_protocol.get_message_session_id(message) == "session-1"
+        assert decoded_bloom_filter.bits() == bloom_filter.bits()
+        assert all(decoded_bloom_filter.might_contain(u) for u in ["1", "2", "3"])
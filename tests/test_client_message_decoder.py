@@ -0,0 +1,115 @@
+import socket
+
+import pytest
+
+from server.client_message_decoder import ClientMessageDecoder
+from shared import constants, framed_socket
+
+
+class TestClientMessageDecoder:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _receive(
+        self,
+        decoder: ClientMessageDecoder,
+        sender: socket.socket,
+        receiver: socket.socket,
+        data: bytes,
+    ) -> None:
+        sender.sendall(data)
+        decoder.receive_from(receiver)
+
+    # ============================== TESTS - DELIMITED ============================== #
+
+    def test_delimited_messages_split_across_reads(self) -> None:
+        sender, receiver = socket.socketpair()
+        decoder = ClientMessageDecoder(constants.KiB)
+
+        self._receive(decoder, sender, receiver, b"TRN|abc[fir")
+        assert decoder.next_message() is None
+
+        self._receive(decoder, sender, receiver, b"st]TRN|abc[second]TRN")
+        assert bytes(decoder.next_message()) == b"TRN|abc[first]"  # type: ignore
+        assert bytes(decoder.next_message()) == b"TRN|abc[second]"  # type: ignore
+        assert decoder.next_message() is None
+
+        self._receive(decoder, sender, receiver, b"|abc[third]")
+        assert bytes(decoder.next_message()) == b"TRN|abc[third]"  # type: ignore
+
+        sender.close()
+        receiver.close()
+
+    # ============================== TESTS - FRAMED ============================== #
+
+    def test_framed_messages_split_across_reads(self) -> None:
+        sender, receiver = socket.socketpair()
+        decoder = ClientMessageDecoder(constants.KiB)
+        decoder.use_framed_transport()
+        encoded_messages = framed_socket.encode_framed_message(
+            b"TRN|abc[a]b]"
+        ) + framed_socket.encode_framed_message(b"TRN|abc[second]")
+
+        self._receive(decoder, sender, receiver, encoded_messages[:2])
+        assert decoder.next_message() is None
+
+        self._receive(decoder, sender, receiver, encoded_messages[2:10])
+        assert decoder.next_message() is None
+
+        self._receive(decoder, sender, receiver, encoded_messages[10:])
+        assert bytes(decoder.next_message()) == b"TRN|abc[a]b]"  # type: ignore
+        assert bytes(decoder.next_message()) == b"TRN|abc[second]"  # type: ignore
+        assert decoder.next_message() is None
+
+        sender.close()
+        receiver.close()
+
+    def test_framed_message_bigger_than_the_buffer(self) -> None:
+        sender, receiver = socket.socketpair()
+        decoder = ClientMessageDecoder(buffer_size=16)
+        decoder.use_framed_transport()
+        payload = b"TRN|abc[" + b"x" * 1000 + b"]"
+        encoded_message = framed_socket.encode_framed_message(payload)
+
+        sender.sendall(encoded_message)
+        message = decoder.next_message()
+        while message is None:
+            decoder.receive_from(receiver)
+            message = decoder.next_message()
+        assert bytes(message) == payload
+
+        sender.close()
+        receiver.close()
+
+    def test_handshake_is_delimited_before_switching_to_framed(self) -> None:
+        sender, receiver = socket.socketpair()
+        decoder = ClientMessageDecoder(constants.KiB)
+
+        self._receive(
+            decoder, sender, receiver, b"HSK|client[Q1X;Q21;Q22;Q3X;Q4X&LPF]"
+        )
+        assert bytes(decoder.next_message()) == b"HSK|client[Q1X;Q21;Q22;Q3X;Q4X&LPF]"  # type: ignore
+
+        decoder.use_framed_transport()
+        self._receive(
+            decoder,
+            sender,
+            receiver,
+            framed_socket.encode_framed_message(b"EOF|abc[TRN]"),
+        )
+        assert bytes(decoder.next_message()) == b"EOF|abc[TRN]"  # type: ignore
+
+        sender.close()
+        receiver.close()
+
+    # ============================== TESTS - DISCONNECTION ============================== #
+
+    def test_disconnection_of_the_client_fails(self) -> None:
+        sender, receiver = socket.socketpair()
+        decoder = ClientMessageDecoder(constants.KiB)
+
+        sender.close()
+        with pytest.raises(OSError, match="Unexpected disconnection of the peer"):
+            decoder.receive_from(receiver)
+
+        receiver.close()
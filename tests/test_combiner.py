@@ -0,0 +1,91 @@
+from controllers.shared.combiner import Combiner
+
+
+class TestCombiner:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _combiner(self, max_keys: int = 100, clock=lambda: 0.0) -> Combiner:
+        return Combiner(
+            keys=["item_id", "year_month_created_at"],
+            accumulated_columns=["quantity", "subtotal"],
+            max_keys=max_keys,
+            max_age_seconds=10.0,
+            clock=clock,
+        )
+
+    def _item(self, item_id: str, year_month: str, quantity: str) -> dict:
+        return {
+            "created_at": f"{year_month}-01 10:00:00",
+            "item_id": item_id,
+            "year_month_created_at": year_month,
+            "quantity": quantity,
+            "subtotal": "2.5",
+        }
+
+    # ============================== TESTS - COMBINING ============================== #
+
+    def test_items_are_summed_by_keys(self) -> None:
+        combiner = self._combiner()
+
+        combiner.combine(
+            "session-1",
+            [
+                self._item("1", "2024-01", "2"),
+                self._item("1", "2024-01", "3"),
+                self._item("2", "2024-01", "1"),
+            ],
+        )
+
+        assert combiner.take_combined_batch("session-1") == [
+            {
+                "item_id": "1",
+                "year_month_created_at": "2024-01",
+                "quantity": "5.0",
+                "subtotal": "5.0",
+            },
+            {
+                "item_id": "2",
+                "year_month_created_at": "2024-01",
+                "quantity": "1.0",
+                "subtotal": "2.5",
+            },
+        ]
+        assert combiner.take_combined_batch("session-1") == []
+
+    def test_items_with_empty_keys_are_skipped(self) -> None:
+        combiner = self._combiner()
+
+        combiner.combine("session-1", [self._item("", "2024-01", "2")])
+
+        assert combiner.take_combined_batch("session-1") == []
+
+    def test_sessions_are_combined_separately(self) -> None:
+        combiner = self._combiner()
+
+        combiner.combine("session-1", [self._item("1", "2024-01", "2")])
+        combiner.combine("session-2", [self._item("1", "2024-01", "3")])
+
+        assert combiner.take_combined_batch("session-2")[0]["quantity"] == "3.0"
+
+    # ============================== TESTS - FLUSHING ============================== #
+
+    def test_session_is_flushed_when_max_keys_is_reached(self) -> None:
+        combiner = self._combiner(max_keys=2)
+
+        combiner.combine("session-1", [self._item("1", "2024-01", "2")])
+        assert combiner.sessions_to_flush() == []
+
+        combiner.combine("session-1", [self._item("2", "2024-01", "2")])
+        assert combiner.sessions_to_flush() == ["session-1"]
+
+    def test_session_is_flushed_when_max_age_is_reached(self) -> None:
+        now = 0.0
+        combiner = self._combiner(clock=lambda: now)
+
+        combiner.combine("session-1", [self._item("1", "2024-01", "2")])
+        now = 5.0
+        assert combiner.sessions_to_flush() == []
+
+        now = 10.0
+        assert combiner.sessions_to_flush() == ["session-1"]
@@ -0,0 +1,172 @@
+import pytest
+
+from shared import communication_protocol
+
+
+class TestCommunicationProtocol:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _session_id(self) -> str:
+        return "a1b2c3"
+
+    def _batch(self) -> list[dict[str, str]]:
+        return [
+            {"transaction_id": "t-1", "store_id": "3", "final_amount": "75.5"},
+            {"transaction_id": "t-2", "store_id": "", "final_amount": "10.0"},
+        ]
+
+    # ============================== TESTS - BATCH MESSAGES ============================== #
+
+    def test_columnar_batch_message_round_trip(self) -> None:
+        message = communication_protocol.encode_transactions_batch_message(
+            self._session_id(), self._batch()
+        )
+
+        assert message == (
+            "TRN|a1b2c3[<transaction_id,store_id,final_amount>"
+            "t-1,3,75.5;t-2,,10.0]"
+        )
+        assert communication_protocol.decode_transactions_batch_message(
+            message
+        ) == self._batch()
+
+    def test_row_batch_message_round_trip(self) -> None:
+        message = communication_protocol.encode_transactions_batch_message(
+            self._session_id(), self._batch(), columnar=False
+        )
+
+        assert message.startswith('TRN|a1b2c3[{"transaction_id":"t-1"')
+        assert communication_protocol.decode_batch_message(message) == self._batch()
+
+    def test_columnar_batch_message_is_smaller_than_row_batch_message(self) -> None:
+        batch = self._batch() * 100
+        columnar_message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            batch,
+        )
+        row_message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            batch,
+            columnar=False,
+        )
+
+        assert len(columnar_message) * 2 < len(row_message)
+
+    def test_empty_columnar_batch_message_has_no_payload(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            [],
+        )
+
+        assert communication_protocol.message_without_payload(message)
+
+    def test_single_empty_value_row_round_trip(self) -> None:
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            [{"store_id": ""}],
+        )
+
+        assert message == "TRN|a1b2c3[<store_id>]"
+        assert communication_protocol.decode_batch_message(message) == [
+            {"store_id": ""}
+        ]
+
+    def test_batch_message_with_end_delimiter_in_values_round_trip(self) -> None:
+        batch = [{"transaction_id": "t-1]", "store_id": "]3]"}]
+        message = communication_protocol.encode_batch_message(
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE,
+            self._session_id(),
+            batch,
+        )
+
+        assert not communication_protocol.message_without_payload(message)
+        assert communication_protocol.decode_batch_message(message) == batch
+
+    def test_columnar_batch_with_mismatched_row_columns_is_rejected(self) -> None:
+        batch = self._batch()
+        batch[1] = {"transaction_id": "t-2", "store_id": ""}
+
+        with pytest.raises(ValueError, match="Unexpected row columns"):
+            communication_protocol.encode_transactions_batch_message(
+                self._session_id(), batch
+            )
+
+    def test_columnar_batch_with_mismatched_row_fields_is_rejected(self) -> None:
+        message = (
+            "TRN|a1b2c3[<transaction_id,store_id,final_amount>"
+            "t-1,3,75.5;t-2,10.0]"
+        )
+
+        with pytest.raises(ValueError, match="Unexpected row fields amount"):
+            communication_protocol.decode_transactions_batch_message(message)
+
+    # ============================== TESTS - HANDSHAKE ============================== #
+
+    def test_handshake_payload_round_trip(self) -> None:
+        payload = communication_protocol.encode_handshake_payload(
+            communication_protocol.ALL_QUERIES,
+            [communication_protocol.COLUMNAR_BATCH_FEATURE],
+        )
+
+        assert communication_protocol.decode_handshake_payload(payload) == (
+            communication_protocol.ALL_QUERIES,
+            [communication_protocol.COLUMNAR_BATCH_FEATURE],
+        )
+
+    def test_handshake_payload_without_features(self) -> None:
+        assert communication_protocol.decode_handshake_payload(
+            communication_protocol.ALL_QUERIES
+        ) == (communication_protocol.ALL_QUERIES, [])
+
+    def test_column_pushdown_feature_round_trip(self) -> None:
+        columns_by_data_type = {
+            communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE: [
+                "created_at",
+                "user_id",
+            ],
+            communication_protocol.USERS_BATCH_MSG_TYPE: ["user_id"],
+        }
+        payload = communication_protocol.encode_handshake_payload(
+            "7",
+            [
+                communication_protocol.COLUMNAR_BATCH_FEATURE,
+                communication_protocol.encode_column_pushdown_feature(
+                    columns_by_data_type
+                ),
+            ],
+        )
+
+        (_, features) = communication_protocol.decode_handshake_payload(payload)
+        assert (
+            communication_protocol.decode_column_pushdown_feature(features)
+            == columns_by_data_type
+        )
+
+    def test_column_pushdown_feature_not_accepted(self) -> None:
+        assert (
+            communication_protocol.decode_column_pushdown_feature(
+                [communication_protocol.COLUMNAR_BATCH_FEATURE]
+            )
+            == {}
+        )
+
+    def test_join_message_round_trip(self) -> None:
+        message = communication_protocol.encode_join_message("abc", "7")
+
+        assert message == "JON|abc[7]"
+        assert communication_protocol.decode_join_message(message) == ("abc", "7")
+
+    # ============================== TESTS - RAW MESSAGES ============================== #
+
+    def test_raw_message_type_is_peeked_without_decoding_the_payload(self) -> None:
+        raw_message = memoryview(b"TRN|abc[<id>1;2]")
+
+        assert (
+            communication_protocol.get_raw_message_type(raw_message)
+            == communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+        )
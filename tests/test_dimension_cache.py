@@ -0,0 +1,50 @@
+from controllers.joiners.shared import dimension_cache
+from controllers.joiners.shared.dimension_cache import DimensionCache
+
+
+class TestDimensionCache:
+
+    # ============================== TESTS - DIGESTS ============================== #
+
+    def test_digest_does_not_depend_on_batches_order(self) -> None:
+        first_digest = dimension_cache.batch_payload_digest("<store_id>1;2")
+        second_digest = dimension_cache.batch_payload_digest("<store_id>3")
+
+        assert dimension_cache.combined_digest(
+            dimension_cache.combined_digest(0, first_digest), second_digest
+        ) == dimension_cache.combined_digest(
+            dimension_cache.combined_digest(0, second_digest), first_digest
+        )
+
+    # ============================== TESTS - CACHING ============================== #
+
+    def test_published_index_is_reused_by_another_session(self) -> None:
+        cache = DimensionCache()
+        base_data_index = {1: ("store 1",)}
+
+        assert cache.acquire("session-1", 10) is None
+        cache.publish("session-1", 10, base_data_index)
+
+        assert cache.acquire("session-2", 10) is base_data_index
+
+    def test_index_is_kept_while_referenced(self) -> None:
+        cache = DimensionCache(max_unused_entries=0)
+        cache.publish("session-1", 10, {1: ("store 1",)})
+        cache.acquire("session-2", 10)
+
+        cache.release("session-1")
+        assert cache.entries_amount() == 1
+
+        cache.release("session-2")
+        assert cache.entries_amount() == 0
+
+    def test_least_recently_used_unused_index_is_evicted(self) -> None:
+        cache = DimensionCache(max_unused_entries=1)
+        cache.publish("session-1", 10, {1: ("store 1",)})
+        cache.publish("session-2", 20, {2: ("store 2",)})
+
+        cache.release("session-1")
+        cache.release("session-2")
+
+        assert cache.acquire("session-3", 10) is None
+        assert cache.acquire("session-3", 20) == {2: ("store 2",)}
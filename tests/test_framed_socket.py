@@ -0,0 +1,66 @@
+import socket
+import threading
+
+import pytest
+
+from shared import framed_socket
+
+
+class TestFramedSocket:
+
+    # ============================== TESTS - FRAMING ============================== #
+
+    def test_messages_are_received_one_by_one(self) -> None:
+        sender, receiver = socket.socketpair()
+        frame_receiver = framed_socket.FramedMessageReceiver()
+
+        framed_socket.send_framed_message(sender, b"TRN|abc[first]")
+        framed_socket.send_framed_message(sender, b"TRN|abc[second]")
+
+        assert bytes(frame_receiver.receive_message(receiver)) == b"TRN|abc[first]"
+        assert bytes(frame_receiver.receive_message(receiver)) == b"TRN|abc[second]"
+
+        sender.close()
+        receiver.close()
+
+    def test_payload_may_contain_message_delimiters(self) -> None:
+        sender, receiver = socket.socketpair()
+        frame_receiver = framed_socket.FramedMessageReceiver()
+
+        framed_socket.send_framed_message(sender, b"TRN|abc[a]b]c]")
+
+        assert bytes(frame_receiver.receive_message(receiver)) == b"TRN|abc[a]b]c]"
+
+        sender.close()
+        receiver.close()
+
+    def test_payload_bigger_than_initial_buffer(self) -> None:
+        sender, receiver = socket.socketpair()
+        frame_receiver = framed_socket.FramedMessageReceiver(initial_buffer_size=16)
+        payload = b"x" * 1_000_000
+
+        sending_thread = threading.Thread(
+            target=framed_socket.send_framed_message, args=(sender, payload)
+        )
+        sending_thread.start()
+        received_payload = bytes(frame_receiver.receive_message(receiver))
+        sending_thread.join()
+
+        assert received_payload == payload
+
+        sender.close()
+        receiver.close()
+
+    # ============================== TESTS - EXCEPTIONS ============================== #
+
+    def test_peer_disconnection_raises_exception(self) -> None:
+        sender, receiver = socket.socketpair()
+        frame_receiver = framed_socket.FramedMessageReceiver()
+        sender.close()
+
+        with pytest.raises(OSError) as exc_info:
+            frame_receiver.receive_message(receiver)
+
+        assert str(exc_info.value) == "Unexpected disconnection of the peer"
+
+        receiver.close()
@@ -0,0 +1,38 @@
+import threading
+import time
+
+from controllers.joiners.shared.instrumented_lock import InstrumentedLock
+
+
+class TestInstrumentedLock:
+
+    # ============================== TESTS - COUNTERS ============================== #
+
+    def test_uncontended_acquisitions_are_counted(self) -> None:
+        lock = InstrumentedLock("lock")
+
+        for _ in range(3):
+            with lock:
+                pass
+
+        assert lock.contention_counters() == {
+            "acquisitions": 3,
+            "contended_acquisitions": 0,
+            "waiting_seconds": 0.0,
+        }
+
+    def test_contended_acquisitions_are_counted(self) -> None:
+        lock = InstrumentedLock("lock")
+        lock.acquire()
+        waiting_thread = threading.Thread(target=lock.acquire)
+        waiting_thread.start()
+
+        time.sleep(0.05)
+        lock.release()
+        waiting_thread.join()
+        lock.release()
+
+        counters = lock.contention_counters()
+        assert counters["acquisitions"] == 2
+        assert counters["contended_acquisitions"] == 1
+        assert counters["waiting_seconds"] > 0
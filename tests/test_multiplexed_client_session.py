@@ -0,0 +1,253 @@
+import socket
+from typing import Callable, Optional
+
+import pytest
+
+from server.multiplexed_client_session import MultiplexedClientSession
+from shared import communication_protocol, constants
+
+
+class _RecordingMiddleware:
+
+    def __init__(self) -> None:
+        self.sent_messages: list[str | bytes] = []
+        self.on_message_callback: Optional[Callable] = None
+        self.deleted = False
+        self.closed = False
+
+    def send(self, message: str | bytes) -> None:
+        self.sent_messages.append(message)
+
+    def register_consumer(self, on_message_callback: Callable) -> None:
+        self.on_message_callback = on_message_callback
+
+    def cancel_consumer(self) -> None:
+        self.on_message_callback = None
+
+    def delete(self) -> None:
+        self.deleted = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestMultiplexedClientSession:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _session(
+        self,
+        server_socket: socket.socket,
+        session_id: str,
+        sessions: dict[str, MultiplexedClientSession],
+        mom_cleaners_connections: dict[str, list[_RecordingMiddleware]],
+        mom_results_consumer: _RecordingMiddleware,
+    ) -> MultiplexedClientSession:
+        cleaners_data = {
+            data_type: {
+                constants.QUEUE_PREFIX: "dirty",
+                constants.WORKERS_AMOUNT: len(mom_producers),
+            }
+            for data_type, mom_producers in mom_cleaners_connections.items()
+        }
+        output_builders_data = {
+            data_type: {
+                constants.QUEUE_PREFIX: constants.QRS_QUEUE_PREFIX,
+                constants.WORKERS_AMOUNT: 1,
+            }
+            for data_type in [
+                constants.QUERY_RESULT_1X,
+                constants.QUERY_RESULT_21,
+                constants.QUERY_RESULT_22,
+                constants.QUERY_RESULT_3X,
+                constants.QUERY_RESULT_4X,
+            ]
+        }
+        session = MultiplexedClientSession(
+            server_socket,
+            session_id,
+            cleaners_data,
+            output_builders_data,
+            mom_cleaners_connections,  # type: ignore
+            lambda queue_name: mom_results_consumer,
+            sessions.get,
+            constants.KiB,
+        )
+        sessions[session_id] = session
+        return session
+
+    def _mom_cleaners_connections(self) -> dict[str, list[_RecordingMiddleware]]:
+        return {
+            data_type: [_RecordingMiddleware(), _RecordingMiddleware()]
+            for data_type in [
+                constants.MENU_ITEMS,
+                constants.STORES,
+                constants.TRANSACTION_ITEMS,
+                constants.TRANSACTIONS,
+                constants.USERS,
+            ]
+        }
+
+    # ============================== TESTS - SESSION ============================== #
+
+    def test_session_forwards_data_and_sends_back_results(self) -> None:
+        client_socket, server_socket = socket.socketpair()
+        mom_cleaners_connections = self._mom_cleaners_connections()
+        mom_results_consumer = _RecordingMiddleware()
+        session = self._session(
+            server_socket, "session", {}, mom_cleaners_connections, mom_results_consumer
+        )
+
+        client_socket.sendall(b"HSK|client[Q1X;Q21;Q22;Q3X;Q4X]TRN|session[1]TRN|se")
+        session.handle_readable()
+        client_socket.sendall(b"ssion[2]")
+        session.handle_readable()
+        session.handle_writable()
+
+        assert client_socket.recv(1024) == b"HSK|session[client]"
+        assert [
+            mom_producer.sent_messages
+            for mom_producer in mom_cleaners_connections[constants.TRANSACTIONS]
+        ] == [[b"TRN|session[1]"], [b"TRN|session[2]"]]
+
+        for data_type in mom_cleaners_connections:
+            client_socket.sendall(
+                communication_protocol.encode_eof_message("session", data_type).encode(
+                    "utf-8"
+                )
+            )
+            session.handle_readable()
+        assert not session.wants_to_read()
+        assert mom_results_consumer.on_message_callback is not None
+
+        on_message_callback = mom_results_consumer.on_message_callback
+        on_message_callback(b"Q1X|session[result]")
+        for data_type in [
+            constants.QUERY_RESULT_1X,
+            constants.QUERY_RESULT_21,
+            constants.QUERY_RESULT_22,
+            constants.QUERY_RESULT_3X,
+            constants.QUERY_RESULT_4X,
+        ]:
+            on_message_callback(
+                communication_protocol.encode_eof_message("session", data_type).encode(
+                    "utf-8"
+                )
+            )
+        assert not session.is_finished()
+
+        session.handle_writable()
+        assert session.is_finished()
+        assert session.uncaught_exception() is None
+        assert client_socket.recv(1024).startswith(b"Q1X|session[result]EOF|session[Q1X]")
+
+        session.close()
+        assert mom_results_consumer.deleted and mom_results_consumer.closed
+        client_socket.close()
+
+    def test_handshake_answers_the_columns_to_send(self) -> None:
+        client_socket, server_socket = socket.socketpair()
+        session = self._session(
+            server_socket,
+            "session",
+            {},
+            self._mom_cleaners_connections(),
+            _RecordingMiddleware(),
+        )
+
+        client_socket.sendall(b"HSK|client[Q1X;Q21;Q22;Q3X;Q4X&CLB&CPD]")
+        session.handle_readable()
+        session.handle_writable()
+
+        (_, payload) = communication_protocol.decode_handshake_message(
+            client_socket.recv(1024).decode("utf-8")
+        )
+        (_, accepted_features) = communication_protocol.decode_handshake_payload(
+            payload
+        )
+        assert communication_protocol.COLUMNAR_BATCH_FEATURE in accepted_features
+        assert (
+            communication_protocol.decode_column_pushdown_feature(accepted_features)
+            == constants.CLEANED_COLUMNS_BY_DATA_TYPE
+        )
+
+        session.close()
+        client_socket.close()
+
+    # ============================== TESTS - UPLOAD STREAMS ============================== #
+
+    def test_upload_stream_joins_the_session_and_accounts_its_eof(self) -> None:
+        client_socket, server_socket = socket.socketpair()
+        stream_client_socket, stream_server_socket = socket.socketpair()
+        sessions: dict[str, MultiplexedClientSession] = {}
+        mom_cleaners_connections = self._mom_cleaners_connections()
+        mom_results_consumer = _RecordingMiddleware()
+        session = self._session(
+            server_socket,
+            "session",
+            sessions,
+            mom_cleaners_connections,
+            mom_results_consumer,
+        )
+        upload_stream = self._session(
+            stream_server_socket,
+            "stream",
+            sessions,
+            mom_cleaners_connections,
+            _RecordingMiddleware(),
+        )
+
+        client_socket.sendall(b"HSK|client[Q1X;Q21;Q22;Q3X;Q4X&MSU]")
+        session.handle_readable()
+        session.handle_writable()
+        assert client_socket.recv(1024) == b"HSK|session[client&MSU]"
+
+        stream_client_socket.sendall(b"JON|session[client]TRN|session[1]")
+        upload_stream.handle_readable()
+        upload_stream.handle_writable()
+        assert stream_client_socket.recv(1024) == b"JON|session[client]"
+        assert not upload_stream.uses_framed_transport()
+
+        for data_type in mom_cleaners_connections:
+            if data_type == constants.TRANSACTIONS:
+                continue
+            client_socket.sendall(
+                communication_protocol.encode_eof_message("session", data_type).encode(
+                    "utf-8"
+                )
+            )
+            session.handle_readable()
+        assert session.wants_to_read()
+
+        stream_client_socket.sendall(b"EOF|session[TRN]")
+        upload_stream.handle_readable()
+
+        assert upload_stream.is_finished()
+        assert not session.wants_to_read()
+        assert mom_results_consumer.on_message_callback is not None
+        assert [
+            mom_producer.sent_messages
+            for mom_producer in mom_cleaners_connections[constants.TRANSACTIONS]
+        ] == [[b"TRN|session[1]", "EOF|session[TRN]"], ["EOF|session[TRN]"]]
+
+        upload_stream.close()
+        session.close()
+        client_socket.close()
+        stream_client_socket.close()
+
+    def test_upload_stream_can_not_join_an_unknown_session(self) -> None:
+        stream_client_socket, stream_server_socket = socket.socketpair()
+        upload_stream = self._session(
+            stream_server_socket,
+            "stream",
+            {},
+            self._mom_cleaners_connections(),
+            _RecordingMiddleware(),
+        )
+
+        stream_client_socket.sendall(b"JON|unknown[client]")
+        with pytest.raises(ValueError, match="Invalid session to join"):
+            upload_stream.handle_readable()
+
+        upload_stream.close()
+        stream_client_socket.close()
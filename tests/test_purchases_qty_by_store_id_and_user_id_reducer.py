@@ -0,0 +1,153 @@
+from typing import Any, Callable, Optional
+
+from controllers.reducers.purchases_qty_by_store_id_and_user_id_reducer.purchases_qty_by_store_id_and_user_id_reducer import (
+    PurchasesQtyByStoreIdAndUserIdReducer,
+)
+from middleware.middleware import MessageMiddleware
+from shared import communication_protocol
+from shared.bloom_filter import BloomFilter
+
+
+class _RecordingMiddleware(MessageMiddleware):
+
+    def __init__(self) -> None:
+        self.sent_messages: list[str | bytes] = []
+        self.on_message_callback: Optional[Callable] = None
+
+    def start_consuming(self, on_message_callback: Callable) -> None:
+        self.on_message_callback = on_message_callback
+
+    def stop_consuming(self) -> None:
+        self.on_message_callback = None
+
+    def send(self, message: str | bytes) -> None:
+        self.sent_messages.append(message)
+
+    def close(self) -> None:
+        pass
+
+    def delete(self) -> None:
+        pass
+
+
+class _RecordingPurchasesQtyReducer(PurchasesQtyByStoreIdAndUserIdReducer):
+
+    # ============================== INITIALIZE ============================== #
+
+    def _build_mom_consumer_using(
+        self,
+        rabbitmq_host: str,
+        consumers_config: dict[str, Any],
+    ) -> MessageMiddleware:
+        return _RecordingMiddleware()
+
+    def _build_mom_producer_using(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+        producer_id: int,
+    ) -> MessageMiddleware:
+        return _RecordingMiddleware()
+
+
+class TestPurchasesQtyByStoreIdAndUserIdReducer:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _session_id(self) -> str:
+        return "a1b2c3"
+
+    def _reducer(self) -> _RecordingPurchasesQtyReducer:
+        reducer = _RecordingPurchasesQtyReducer(
+            controller_id=0,
+            rabbitmq_host="localhost",
+            consumers_config={
+                "prev_controllers_amount": 1,
+                "bloom_filter_prev_controllers_amount": 2,
+            },
+            producers_config={"next_controllers_amount": 1},
+            batch_max_size=10,
+            state_spill_threshold=100,
+        )
+        reducer._set_controller_as_running()
+        return reducer
+
+    def _receive(
+        self, reducer: PurchasesQtyByStoreIdAndUserIdReducer, message: str
+    ) -> None:
+        reducer._handle_received_data(message.encode("utf-8"))
+
+    def _transactions_message(self) -> str:
+        return communication_protocol.encode_transactions_batch_message(
+            self._session_id(),
+            [
+                {"store_id": "1", "user_id": "5.0"},
+                {"store_id": "1", "user_id": "5.0"},
+                {"store_id": "2", "user_id": "7.0"},
+                {"store_id": "2", "user_id": "9.0"},
+            ],
+        )
+
+    def _eof_message(self) -> str:
+        return communication_protocol.encode_eof_message(
+            self._session_id(), communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+        )
+
+    def _bloom_filter_message_of(self, user_ids: list[str]) -> str:
+        bloom_filter = BloomFilter.for_expected_items(len(user_ids), 0.0001)
+        for user_id in user_ids:
+            bloom_filter.add(user_id)
+        return communication_protocol.encode_bloom_filter_message(
+            self._session_id(),
+            bloom_filter.bits_amount(),
+            bloom_filter.hashes_amount(),
+            bloom_filter.bits(),
+        )
+
+    def _sent_messages_of(
+        self, reducer: PurchasesQtyByStoreIdAndUserIdReducer
+    ) -> list[str | bytes]:
+        mom_producer = reducer._mom_producers[0]
+        assert isinstance(mom_producer, _RecordingMiddleware)
+        return mom_producer.sent_messages
+
+    def _assert_only_joinable_users_were_flushed(
+        self, reducer: PurchasesQtyByStoreIdAndUserIdReducer
+    ) -> None:
+        sent_messages = self._sent_messages_of(reducer)
+        assert len(sent_messages) == 2
+
+        sent_batch = communication_protocol.decode_batch_message(str(sent_messages[0]))
+        assert sorted(sent_batch, key=lambda batch_item: batch_item["user_id"]) == [
+            {"store_id": "1", "user_id": "5.0", "purchases_qty": "2"},
+            {"store_id": "2", "user_id": "7.0", "purchases_qty": "1"},
+        ]
+        assert sent_messages[1] == self._eof_message()
+        assert self._session_id() not in reducer._bloom_filters_by_session_id
+
+    # ============================== TESTS - BLOOM FILTERS ============================== #
+
+    def test_eof_is_deferred_until_all_bloom_filters_arrive(self) -> None:
+        reducer = self._reducer()
+
+        self._receive(reducer, self._transactions_message())
+        self._receive(reducer, self._bloom_filter_message_of(["5"]))
+        self._receive(reducer, self._eof_message())
+        assert self._sent_messages_of(reducer) == []
+
+        self._receive(reducer, self._bloom_filter_message_of(["7"]))
+
+        self._assert_only_joinable_users_were_flushed(reducer)
+        assert self._session_id() not in reducer._pending_eof_by_session_id
+
+    def test_eof_flushes_when_all_bloom_filters_arrived_before(self) -> None:
+        reducer = self._reducer()
+
+        self._receive(reducer, self._bloom_filter_message_of(["5"]))
+        self._receive(reducer, self._bloom_filter_message_of(["7"]))
+        self._receive(reducer, self._transactions_message())
+        assert self._sent_messages_of(reducer) == []
+
+        self._receive(reducer, self._eof_message())
+
+        self._assert_only_joinable_users_were_flushed(reducer)
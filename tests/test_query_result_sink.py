@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from client.query_result_sink import QueryResultSink
+
+
+class TestQueryResultSink:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _sink(self, output_path: Path, with_writer_thread: bool) -> QueryResultSink:
+        return QueryResultSink(
+            output_path=output_path,
+            file_name_prefix="client_0__a1b2c3__",
+            buffer_size=1024,
+            with_writer_thread=with_writer_thread,
+        )
+
+    def _result_file(self, output_path: Path, query: str) -> Path:
+        return output_path / f"client_0__a1b2c3__{query}_result.txt"
+
+    # ============================== TESTS - WRITING ============================== #
+
+    @pytest.mark.parametrize("with_writer_thread", [False, True])
+    def test_rows_are_written_one_per_line(
+        self, tmp_path: Path, with_writer_thread: bool
+    ) -> None:
+        sink = self._sink(tmp_path, with_writer_thread)
+
+        sink.write_rows("Q1X", [{"transaction_id": "t-1", "final_amount": "75.5"}])
+        sink.write_rows("Q1X", [{"transaction_id": "t-2", "final_amount": "80.0"}])
+        sink.close_query("Q1X")
+        sink.close()
+
+        assert self._result_file(tmp_path, "Q1X").read_text() == (
+            "t-1,75.5\nt-2,80.0\n"
+        )
+
+    def test_each_query_is_written_to_its_own_file(self, tmp_path: Path) -> None:
+        sink = self._sink(tmp_path, with_writer_thread=True)
+
+        sink.write_rows("Q21", [{"year_month": "2024-01", "item_name": "Latte"}])
+        sink.write_rows("Q3X", [{"year_half": "2024-H1", "store_name": "G"}])
+        sink.close()
+
+        assert self._result_file(tmp_path, "Q21").read_text() == "2024-01,Latte\n"
+        assert self._result_file(tmp_path, "Q3X").read_text() == "2024-H1,G\n"
+
+    def test_no_file_is_created_without_rows(self, tmp_path: Path) -> None:
+        sink = self._sink(tmp_path, with_writer_thread=False)
+
+        sink.write_rows("Q4X", [])
+        sink.close_query("Q4X")
+        sink.close()
+
+        assert not self._result_file(tmp_path, "Q4X").exists()
+
+    # ============================== TESTS - EXCEPTIONS ============================== #
+
+    def test_writer_thread_errors_are_raised_on_close(self, tmp_path: Path) -> None:
+        sink = self._sink(tmp_path / "missing_folder", with_writer_thread=True)
+
+        sink.write_rows("Q1X", [{"transaction_id": "t-1"}])
+
+        with pytest.raises(FileNotFoundError):
+            sink.close()
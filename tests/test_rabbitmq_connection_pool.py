@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+from pika.exceptions import ChannelWrongStateError
+
+from middleware import rabbitmq_connection_pool
+from middleware.middleware import MessageMiddlewareDisconnectedError
+from middleware.rabbitmq_message_middleware_queue import RabbitMQMessageMiddlewareQueue
+
+
+class _FakeChannel:
+
+    def __init__(self) -> None:
+        self.is_open = True
+
+    def close(self) -> None:
+        if not self.is_open:
+            raise ChannelWrongStateError("Channel is closed.")
+        self.is_open = False
+
+    def basic_qos(self, prefetch_count: int) -> None:
+        pass
+
+    def queue_declare(self, queue: str) -> None:
+        raise ValueError("Simulated declare error")
+
+
+class _FakeConnection:
+
+    def __init__(self) -> None:
+        self.is_open = True
+        self.channels: list[_FakeChannel] = []
+
+    def channel(self) -> _FakeChannel:
+        channel = _FakeChannel()
+        self.channels.append(channel)
+        return channel
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+class TestRabbitMQConnectionPool:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    @pytest.fixture(autouse=True)
+    def _fake_connections(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(rabbitmq_connection_pool, "_pooled_connections", {})
+        monkeypatch.setattr(
+            rabbitmq_connection_pool,
+            "_new_connection",
+            lambda host, port, user, password, heartbeat: _FakeConnection(),
+        )
+
+    def _acquire_channel(self) -> tuple:
+        return rabbitmq_connection_pool.acquire_channel(
+            host="rabbitmq-dev", port=5672, user="guest", password="guest", heartbeat=1
+        )
+
+    # ============================== TESTS - SHARING ============================== #
+
+    def test_middlewares_of_the_same_thread_share_the_connection(self) -> None:
+        connection, channel = self._acquire_channel()
+        another_connection, another_channel = self._acquire_channel()
+
+        assert connection is another_connection
+        assert channel is not another_channel
+
+        rabbitmq_connection_pool.release_channel(connection, channel)
+        assert not channel.is_open
+        assert connection.is_open
+
+        rabbitmq_connection_pool.release_channel(another_connection, another_channel)
+        assert not connection.is_open
+
+    def test_middlewares_of_other_threads_use_another_connection(self) -> None:
+        connection, channel = self._acquire_channel()
+        acquired_by_thread: list[tuple] = []
+
+        thread = threading.Thread(
+            target=lambda: acquired_by_thread.append(self._acquire_channel())
+        )
+        thread.start()
+        thread.join()
+
+        assert acquired_by_thread[0][0] is not connection
+
+        rabbitmq_connection_pool.release_channel(connection, channel)
+        rabbitmq_connection_pool.release_channel(*acquired_by_thread[0])
+
+    def test_closed_connection_is_replaced(self) -> None:
+        connection, channel = self._acquire_channel()
+        connection.close()
+
+        another_connection, another_channel = self._acquire_channel()
+        assert another_connection is not connection
+        assert another_connection.is_open
+
+        rabbitmq_connection_pool.release_channel(another_connection, another_channel)
+
+    # ============================== TESTS - RELEASE ============================== #
+
+    def test_releasing_a_channel_twice_fails_without_closing_the_connection(
+        self,
+    ) -> None:
+        connection, channel = self._acquire_channel()
+        _, another_channel = self._acquire_channel()
+
+        rabbitmq_connection_pool.release_channel(connection, channel)
+        with pytest.raises(ChannelWrongStateError, match="Channel is closed."):
+            rabbitmq_connection_pool.release_channel(connection, channel)
+
+        assert connection.is_open
+        assert another_channel.is_open
+
+        rabbitmq_connection_pool.release_channel(connection, another_channel)
+        assert not connection.is_open
+
+    def test_channel_is_released_when_the_middleware_can_not_be_set_up(
+        self,
+    ) -> None:
+        connection, channel = self._acquire_channel()
+
+        with pytest.raises(MessageMiddlewareDisconnectedError):
+            RabbitMQMessageMiddlewareQueue("rabbitmq-dev", "testing-queue")
+        assert connection.channels[-1].is_open is False
+
+        rabbitmq_connection_pool.release_channel(connection, channel)
+        assert not connection.is_open
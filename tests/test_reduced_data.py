@@ -0,0 +1,154 @@
+from controllers.reducers.shared.accumulators import (
+    AvgAccumulator,
+    CountAccumulator,
+    MaxAccumulator,
+    MinAccumulator,
+    SumAccumulator,
+)
+from controllers.reducers.shared.reduced_data import ReducedData
+
+
+class TestReducedData:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _item(self, item_id: str, year_month: str, quantity: str) -> dict[str, str]:
+        return {
+            "item_id": item_id,
+            "year_month_created_at": year_month,
+            "quantity": quantity,
+        }
+
+    def _reduced_data(self) -> ReducedData:
+        return ReducedData(
+            ["item_id", "year_month_created_at"],
+            [SumAccumulator("sellings_qty", "quantity")],
+        )
+
+    # ============================== TESTS - REDUCING ============================== #
+
+    def test_items_are_reduced_by_keys(self) -> None:
+        reduced_data = self._reduced_data()
+
+        for batch_item in [
+            self._item("1", "2024-01", "2"),
+            self._item("1", "2024-01", "3"),
+            self._item("1", "2024-02", "1"),
+            self._item("2", "2024-01", "4"),
+        ]:
+            reduced_data.reduce(batch_item)
+
+        assert reduced_data.take_next_batch(10) == [
+            {"item_id": "1", "year_month_created_at": "2024-01", "sellings_qty": "5.0"},
+            {"item_id": "1", "year_month_created_at": "2024-02", "sellings_qty": "1.0"},
+            {"item_id": "2", "year_month_created_at": "2024-01", "sellings_qty": "4.0"},
+        ]
+        assert reduced_data.is_empty()
+
+    def test_all_accumulators_are_reduced_in_one_pass(self) -> None:
+        reduced_data = ReducedData(
+            ["item_id"],
+            [
+                CountAccumulator("count"),
+                SumAccumulator("sum", "quantity"),
+                MinAccumulator("min", "quantity"),
+                MaxAccumulator("max", "quantity"),
+                AvgAccumulator("avg", "quantity"),
+            ],
+        )
+
+        for quantity in ["2", "3", "7"]:
+            reduced_data.reduce(self._item("1", "2024-01", quantity))
+
+        assert reduced_data.take_next_batch(10) == [
+            {
+                "item_id": "1",
+                "count": "3",
+                "sum": "12.0",
+                "min": "2.0",
+                "max": "7.0",
+                "avg": "4.0",
+            },
+        ]
+
+    def test_items_with_empty_keys_are_skipped(self) -> None:
+        reduced_data = self._reduced_data()
+
+        reduced_data.reduce(self._item("", "2024-01", "2"))
+
+        assert reduced_data.is_empty()
+
+    # ============================== TESTS - TAKING BATCHS ============================== #
+
+    def test_batchs_are_taken_up_to_max_size(self) -> None:
+        reduced_data = self._reduced_data()
+        for item_id in range(5):
+            reduced_data.reduce(self._item(str(item_id), "2024-01", "1"))
+
+        first_batch = reduced_data.take_next_batch(2)
+        second_batch = reduced_data.take_next_batch(2)
+        third_batch = reduced_data.take_next_batch(2)
+
+        assert [len(first_batch), len(second_batch), len(third_batch)] == [2, 2, 1]
+        assert reduced_data.is_empty()
+        assert reduced_data.take_next_batch(2) == []
+
+    def test_reduced_data_can_be_reused_after_being_taken(self) -> None:
+        reduced_data = self._reduced_data()
+        reduced_data.reduce(self._item("1", "2024-01", "2"))
+        reduced_data.take_next_batch(10)
+
+        reduced_data.reduce(self._item("2", "2024-01", "3"))
+
+        assert reduced_data.take_next_batch(10) == [
+            {"item_id": "2", "year_month_created_at": "2024-01", "sellings_qty": "3.0"},
+        ]
+
+    # ============================== TESTS - SPILLING ============================== #
+
+    def test_spilled_groups_are_merged_when_taken(self) -> None:
+        reduced_data = ReducedData(
+            ["item_id", "year_month_created_at"],
+            [
+                SumAccumulator("sellings_qty", "quantity"),
+                AvgAccumulator("avg_qty", "quantity"),
+            ],
+            spill_threshold=2,
+        )
+
+        for batch_item in [
+            self._item("2", "2024-01", "1"),
+            self._item("1", "2024-01", "2"),
+            self._item("1", "2024-01", "4"),
+            self._item("3", "2024-01", "5"),
+            self._item("2", "2024-01", "3"),
+            self._item("1", "2024-01", "6"),
+        ]:
+            reduced_data.reduce(batch_item)
+
+        batch = reduced_data.take_next_batch(2)
+        assert not reduced_data.is_empty()
+        batch += reduced_data.take_next_batch(2)
+
+        assert batch == [
+            {
+                "item_id": "1",
+                "year_month_created_at": "2024-01",
+                "sellings_qty": "12.0",
+                "avg_qty": "4.0",
+            },
+            {
+                "item_id": "2",
+                "year_month_created_at": "2024-01",
+                "sellings_qty": "4.0",
+                "avg_qty": "2.0",
+            },
+            {
+                "item_id": "3",
+                "year_month_created_at": "2024-01",
+                "sellings_qty": "5.0",
+                "avg_qty": "5.0",
+            },
+        ]
+        assert reduced_data.is_empty()
+        assert reduced_data.take_next_batch(2) == []
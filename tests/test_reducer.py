@@ -0,0 +1,132 @@
+from typing import Any, Callable, Optional
+
+from controllers.reducers.shared.accumulators import Accumulator, SumAccumulator
+from controllers.reducers.shared.reducer import Reducer
+from middleware.middleware import MessageMiddleware
+from shared import communication_protocol
+
+
+class _RecordingMiddleware(MessageMiddleware):
+
+    def __init__(self) -> None:
+        self.sent_messages: list[str | bytes] = []
+        self.on_message_callback: Optional[Callable] = None
+
+    def start_consuming(self, on_message_callback: Callable) -> None:
+        self.on_message_callback = on_message_callback
+
+    def stop_consuming(self) -> None:
+        self.on_message_callback = None
+
+    def send(self, message: str | bytes) -> None:
+        self.sent_messages.append(message)
+
+    def close(self) -> None:
+        pass
+
+    def delete(self) -> None:
+        pass
+
+
+class _TpvByStoreIdReducer(Reducer):
+
+    # ============================== INITIALIZE ============================== #
+
+    def _build_mom_consumer_using(
+        self,
+        rabbitmq_host: str,
+        consumers_config: dict[str, Any],
+    ) -> MessageMiddleware:
+        return _RecordingMiddleware()
+
+    def _build_mom_producer_using(
+        self,
+        rabbitmq_host: str,
+        producers_config: dict[str, Any],
+        producer_id: int,
+    ) -> MessageMiddleware:
+        return _RecordingMiddleware()
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _keys(self) -> list[str]:
+        return ["store_id"]
+
+    def _accumulators(self) -> list[Accumulator]:
+        return [SumAccumulator("tpv", "final_amount")]
+
+    def _message_type(self) -> str:
+        return communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+
+
+class TestReducer:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _session_id(self) -> str:
+        return "a1b2c3"
+
+    def _reducer(
+        self, prev_controllers_amount: int, next_controllers_amount: int
+    ) -> _TpvByStoreIdReducer:
+        reducer = _TpvByStoreIdReducer(
+            controller_id=0,
+            rabbitmq_host="localhost",
+            consumers_config={"prev_controllers_amount": prev_controllers_amount},
+            producers_config={"next_controllers_amount": next_controllers_amount},
+            batch_max_size=1,
+            state_spill_threshold=100,
+        )
+        reducer._set_controller_as_running()
+        return reducer
+
+    def _receive(self, reducer: Reducer, message: str) -> None:
+        reducer._handle_received_data(message.encode("utf-8"))
+
+    def _sent_messages_of(self, reducer: Reducer) -> list[list[str | bytes]]:
+        return [
+            mom_producer.sent_messages
+            for mom_producer in reducer._mom_producers
+            if isinstance(mom_producer, _RecordingMiddleware)
+        ]
+
+    # ============================== TESTS - FLUSH ============================== #
+
+    def test_reduced_batches_are_encoded_and_sent_after_all_eofs(self) -> None:
+        reducer = self._reducer(prev_controllers_amount=2, next_controllers_amount=2)
+        eof_message = communication_protocol.encode_eof_message(
+            self._session_id(), communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+        )
+
+        self._receive(
+            reducer,
+            communication_protocol.encode_transactions_batch_message(
+                self._session_id(),
+                [
+                    {"store_id": "1", "final_amount": "10.0"},
+                    {"store_id": "2", "final_amount": "5.0"},
+                    {"store_id": "1", "final_amount": "2.5"},
+                ],
+            ),
+        )
+        self._receive(reducer, eof_message)
+        assert self._sent_messages_of(reducer) == [[], []]
+
+        self._receive(reducer, eof_message)
+
+        sent_messages = self._sent_messages_of(reducer)
+        assert [len(messages) for messages in sent_messages] == [2, 2]
+        sent_batches = [
+            communication_protocol.decode_batch_message(str(messages[0]))
+            for messages in sent_messages
+        ]
+        assert sorted(sent_batches, key=lambda batch: batch[0]["store_id"]) == [
+            [{"store_id": "1", "tpv": "12.5"}],
+            [{"store_id": "2", "tpv": "5.0"}],
+        ]
+        for messages in sent_messages:
+            assert (
+                communication_protocol.get_message_type(str(messages[0]))
+                == communication_protocol.TRANSACTIONS_BATCH_MSG_TYPE
+            )
+            assert messages[1] == eof_message
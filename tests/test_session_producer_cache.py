@@ -0,0 +1,83 @@
+from typing import Callable
+
+from controllers.output_builders.shared.session_producer_cache import (
+    SessionProducerCache,
+)
+
+
+class _RecordingProducer:
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestSessionProducerCache:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _cache(
+        self, built_producers: list[_RecordingProducer], clock: Callable[[], float]
+    ) -> SessionProducerCache:
+        def build_producer(session_id: str) -> _RecordingProducer:
+            producer = _RecordingProducer(session_id)
+            built_producers.append(producer)
+            return producer
+
+        return SessionProducerCache(
+            build_producer=build_producer,  # type: ignore
+            idle_timeout_seconds=10.0,
+            clock=clock,
+        )
+
+    # ============================== TESTS - CACHING ============================== #
+
+    def test_producer_is_built_once_per_session(self) -> None:
+        built_producers: list[_RecordingProducer] = []
+        cache = self._cache(built_producers, lambda: 0.0)
+
+        first_producer = cache.producer_for("session-1")
+        second_producer = cache.producer_for("session-1")
+        cache.producer_for("session-2")
+
+        assert first_producer is second_producer
+        assert [p.session_id for p in built_producers] == ["session-1", "session-2"]
+
+    def test_evicted_producer_is_closed_and_rebuilt_on_demand(self) -> None:
+        built_producers: list[_RecordingProducer] = []
+        cache = self._cache(built_producers, lambda: 0.0)
+
+        evicted_producer = cache.producer_for("session-1")
+        cache.evict("session-1")
+        new_producer = cache.producer_for("session-1")
+
+        assert evicted_producer.closed  # type: ignore
+        assert new_producer is not evicted_producer
+
+    def test_idle_producers_are_evicted_on_access(self) -> None:
+        built_producers: list[_RecordingProducer] = []
+        now = 0.0
+        cache = self._cache(built_producers, lambda: now)
+
+        idle_producer = cache.producer_for("session-1")
+        active_producer = cache.producer_for("session-2")
+        now = 8.0
+        cache.producer_for("session-2")
+        now = 12.0
+        cache.producer_for("session-2")
+
+        assert idle_producer.closed  # type: ignore
+        assert not active_producer.closed  # type: ignore
+
+    def test_close_all_closes_every_producer(self) -> None:
+        built_producers: list[_RecordingProducer] = []
+        cache = self._cache(built_producers, lambda: 0.0)
+
+        cache.producer_for("session-1")
+        cache.producer_for("session-2")
+        cache.close_all()
+
+        assert all(producer.closed for producer in built_producers)
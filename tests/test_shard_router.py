@@ -0,0 +1,71 @@
+import pytest
+
+from controllers.shared import shard_router
+from controllers.shared.shard_router import ShardRouter
+
+
+class TestShardRouter:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _router(self, shard_hash, empty_key_policy: str) -> ShardRouter:
+        return ShardRouter(
+            sharding_key="user_id",
+            shards_amount=3,
+            shard_hash=shard_hash,
+            empty_key_policy=empty_key_policy,
+        )
+
+    # ============================== TESTS - ROUTING ============================== #
+
+    def test_numeric_keys_are_routed_by_modulo_and_normalized(self) -> None:
+        router = self._router(
+            shard_router.numeric_shard_hash, shard_router.EMPTY_KEY_SKIPPED
+        )
+
+        batchs_by_shard = router.bucket_batch(
+            [{"user_id": "4.0"}, {"user_id": "5"}, {"user_id": "7.0"}]
+        )
+
+        assert batchs_by_shard == {
+            1: [{"user_id": "4"}, {"user_id": "7"}],
+            2: [{"user_id": "5"}],
+        }
+        assert router.items_by_shard() == [0, 2, 1]
+
+    def test_string_keys_are_routed_deterministically(self) -> None:
+        router = self._router(
+            shard_router.string_shard_hash, shard_router.EMPTY_KEY_SKIPPED
+        )
+        another_router = self._router(
+            shard_router.string_shard_hash, shard_router.EMPTY_KEY_SKIPPED
+        )
+        batch = [{"user_id": f"2024-{month:02}"} for month in range(1, 13)]
+
+        assert router.bucket_batch(batch) == another_router.bucket_batch(batch)
+        assert sum(router.items_by_shard()) == 12
+
+    def test_empty_keys_are_routed_to_first_shard(self) -> None:
+        router = self._router(
+            shard_router.numeric_shard_hash, shard_router.EMPTY_KEY_TO_FIRST_SHARD
+        )
+
+        assert router.bucket_batch([{"user_id": ""}, {"user_id": "3"}]) == {
+            0: [{"user_id": ""}, {"user_id": "3"}],
+        }
+
+    def test_empty_keys_are_skipped(self) -> None:
+        router = self._router(
+            shard_router.numeric_shard_hash, shard_router.EMPTY_KEY_SKIPPED
+        )
+
+        assert router.bucket_batch([{"user_id": ""}, {"user_id": "3"}]) == {
+            0: [{"user_id": "3"}],
+        }
+        assert router.skipped_items() == 1
+
+    # ============================== TESTS - EXCEPTIONS ============================== #
+
+    def test_unknown_empty_key_policy_raises_exception(self) -> None:
+        with pytest.raises(ValueError):
+            self._router(shard_router.numeric_shard_hash, "unknown")
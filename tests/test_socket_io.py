@@ -0,0 +1,77 @@
+import socket
+
+import pytest
+
+from shared import constants, socket_io
+
+
+class TestSocketIO:
+
+    # ============================== TESTS - READ EXACTLY ============================== #
+
+    def test_read_exactly_grows_the_buffer_for_big_messages(self) -> None:
+        sender, receiver = socket.socketpair()
+        socket_reader = socket_io.SocketReader(buffer_size=16)
+        payload = b"x" * 100_000
+
+        sender.sendall(b"head" + payload)
+        assert bytes(socket_reader.read_exactly(receiver, 4)) == b"head"
+        assert bytes(socket_reader.read_exactly(receiver, len(payload))) == payload
+
+        sender.close()
+        receiver.close()
+
+    def test_read_exactly_fails_when_the_peer_disconnects(self) -> None:
+        sender, receiver = socket.socketpair()
+        socket_reader = socket_io.SocketReader(buffer_size=16)
+
+        sender.sendall(b"abc")
+        sender.close()
+        with pytest.raises(OSError, match="Unexpected disconnection of the peer"):
+            socket_reader.read_exactly(receiver, 4)
+
+        receiver.close()
+
+    # ============================== TESTS - READ UNTIL LAST DELIMITER ============================== #
+
+    def test_read_until_last_delimiter_keeps_the_incomplete_message(self) -> None:
+        sender, receiver = socket.socketpair()
+        socket_reader = socket_io.SocketReader(buffer_size=constants.KiB)
+
+        sender.sendall(b"TRN|abc[1]TRN|abc[2]TRN|a")
+        assert (
+            socket_reader.read_until_last_delimiter(receiver, b"]")
+            == b"TRN|abc[1]TRN|abc[2]"
+        )
+
+        sender.sendall(b"bc[3]")
+        assert socket_reader.read_until_last_delimiter(receiver, b"]") == b"TRN|abc[3]"
+
+        sender.close()
+        receiver.close()
+
+    # ============================== TESTS - STATS ============================== #
+
+    def test_stats_report_calls_per_mib(self) -> None:
+        stats = socket_io.SocketIOStats()
+        assert stats.recv_calls_per_mib() == 0.0
+
+        for _ in range(4):
+            stats.record_recv(256 * constants.KiB)
+        stats.record_send(constants.MiB)
+
+        assert stats.recv_calls_per_mib() == 4.0
+        assert stats.send_calls_per_mib() == 1.0
+        assert "recv_calls: 4" in stats.as_log_fields()
+
+    def test_reader_records_every_recv_call(self) -> None:
+        sender, receiver = socket.socketpair()
+        socket_reader = socket_io.SocketReader(buffer_size=constants.KiB)
+
+        sender.sendall(b"0123456789")
+        socket_reader.read_exactly(receiver, 10)
+
+        assert "bytes_received: 10" in socket_reader.stats().as_log_fields()
+
+        sender.close()
+        receiver.close()
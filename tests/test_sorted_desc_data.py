@@ -0,0 +1,80 @@
+from controllers.sorters.shared.sorted_desc_data import SortedDescData
+
+
+class TestSortedDescData:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _sorted_desc_data(self, amount_per_group: int) -> SortedDescData:
+        return SortedDescData(
+            grouping_key="store_id",
+            primary_sort_key="store_id",
+            secondary_sort_key="purchases_qty",
+            amount_per_group=amount_per_group,
+        )
+
+    def _item(self, store_id: str, user_id: str, purchases_qty: str) -> dict:
+        return {
+            "store_id": store_id,
+            "user_id": user_id,
+            "purchases_qty": purchases_qty,
+        }
+
+    def _drain(self, sorted_desc_data: SortedDescData) -> list[dict[str, str]]:
+        batch_items = []
+        while not sorted_desc_data.is_empty():
+            batch_items.append(sorted_desc_data.pop_next_batch_item())
+        return batch_items
+
+    # ============================== TESTS - SORTING ============================== #
+
+    def test_items_are_drained_in_desc_order_per_group(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(amount_per_group=3)
+
+        for user_id, purchases_qty in [("u1", "2"), ("u2", "7"), ("u3", "4")]:
+            sorted_desc_data.add_batch_item_keeping_sort_desc(
+                self._item("1", user_id, purchases_qty)
+            )
+        sorted_desc_data.add_batch_item_keeping_sort_desc(self._item("2", "u4", "1"))
+
+        assert [item["user_id"] for item in self._drain(sorted_desc_data)] == [
+            "u2",
+            "u3",
+            "u1",
+            "u4",
+        ]
+
+    def test_sort_values_are_compared_as_numbers(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(amount_per_group=1)
+
+        sorted_desc_data.add_batch_item_keeping_sort_desc(self._item("1", "u1", "9"))
+        sorted_desc_data.add_batch_item_keeping_sort_desc(self._item("1", "u2", "10"))
+
+        assert [item["user_id"] for item in self._drain(sorted_desc_data)] == ["u2"]
+
+    def test_only_top_items_are_kept_per_group(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(amount_per_group=3)
+
+        for purchases_qty in range(100):
+            sorted_desc_data.add_batch_item_keeping_sort_desc(
+                self._item("1", f"u{purchases_qty}", str(purchases_qty))
+            )
+
+        assert [item["purchases_qty"] for item in self._drain(sorted_desc_data)] == [
+            "99",
+            "98",
+            "97",
+        ]
+
+    def test_ties_keep_the_earliest_items(self) -> None:
+        sorted_desc_data = self._sorted_desc_data(amount_per_group=2)
+
+        for user_id in ["u1", "u2", "u3"]:
+            sorted_desc_data.add_batch_item_keeping_sort_desc(
+                self._item("1", user_id, "5")
+            )
+
+        assert [item["user_id"] for item in self._drain(sorted_desc_data)] == [
+            "u1",
+            "u2",
+        ]
@@ -0,0 +1,58 @@
+from controllers.joiners.shared.stream_data_buffer import StreamDataBuffer
+
+
+class TestStreamDataBuffer:
+
+    # ============================== PRIVATE - ACCESSING ============================== #
+
+    def _message(self, session_id: str, value: str) -> str:
+        return f"TRN|{session_id}[<user_id>{value}]"
+
+    # ============================== TESTS - BUFFERING ============================== #
+
+    def test_messages_are_taken_in_order(self) -> None:
+        buffer = StreamDataBuffer(max_bytes_in_memory=1024)
+        messages = [self._message("session-1", str(i)) for i in range(3)]
+
+        for message in messages:
+            buffer.append("session-1", message)
+
+        assert list(buffer.take_all("session-1")) == messages
+        assert list(buffer.take_all("session-1")) == []
+
+    def test_overflowed_messages_are_replayed_in_order(self) -> None:
+        first_message = self._message("session-1", "1")
+        buffer = StreamDataBuffer(max_bytes_in_memory=len(first_message))
+        messages = [first_message] + [
+            self._message("session-1", f"{i}-ñandú") for i in range(2, 5)
+        ]
+
+        for message in messages:
+            buffer.append("session-1", message)
+
+        assert list(buffer.take_all("session-1")) == messages
+
+    def test_sessions_are_buffered_separately(self) -> None:
+        buffer = StreamDataBuffer(max_bytes_in_memory=0)
+
+        buffer.append("session-1", self._message("session-1", "1"))
+        buffer.append("session-2", self._message("session-2", "2"))
+
+        assert list(buffer.take_all("session-2")) == [
+            self._message("session-2", "2")
+        ]
+        assert list(buffer.take_all("session-1")) == [
+            self._message("session-1", "1")
+        ]
+
+    def test_discarded_session_frees_its_memory(self) -> None:
+        message = self._message("session-1", "1")
+        buffer = StreamDataBuffer(max_bytes_in_memory=len(message))
+
+        buffer.append("session-1", message)
+        buffer.discard("session-1")
+        buffer.append("session-2", message)
+        buffer.close()
+
+        assert list(buffer.take_all("session-1")) == []
+        assert list(buffer.take_all("session-2")) == [message]